@@ -0,0 +1,244 @@
+"""
+Hot Path Benchmarks
+Times the parse, render, filter and batch paths on a synthetic mission
+(see benchmarks.synthetic_mission), writes the results as JSON and compares
+them against a stored baseline: a case fails if its best time is more than
+its threshold (default 25%) slower than the baseline's.
+
+Run: python -m benchmarks.hot_paths [--files 4] [--items 2500] [--repeat 5]
+         [--only types.] [--output results.json] [--baseline benchmarks/baseline.json]
+         [--threshold 0.25] [--update-baseline]
+"""
+import argparse
+import dataclasses
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.synthetic_mission import MissionSpec, generate_mission, types_file_paths
+from core.batch_engine import BatchPlan, MULTIPLY, SET
+from core.filter_engine import FilterEngine, FilterQuery
+from core.limits_parser import LimitsParser
+from core.random_presets_parser import RandomPresetsParser
+from core.random_presets_writer import RandomPresetsWriter
+from core.spawnabletypes_parser import SpawnableTypesParser
+from core.spawnabletypes_writer import SpawnableTypesWriter
+from core.types_writer import TypesWriter
+from core.xml_parser import TypesParser
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+DEFAULT_THRESHOLD = 0.25
+
+# Minimum time per measured run - fast cases are looped until they take this long
+MIN_RUN_SECONDS = 0.05
+
+
+class Case(NamedTuple):
+    """A timed operation (setup is done before timing)"""
+    name: str
+    func: Callable[[], object]
+
+
+class Regression(NamedTuple):
+    """A case slower than its baseline allows"""
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def build_cases(spec: MissionSpec) -> List[Case]:
+    """Cases over a mission generated for spec"""
+    files = generate_mission(spec)
+    limits_parser = LimitsParser()
+    limits_parser.parse(files['cfglimitsdefinition.xml'])
+    limits_parser.parse_user_definitions(files['cfglimitsdefinitionuser.xml'])
+
+    paths = types_file_paths(spec)
+    types_files = [TypesParser.parse(files[path], path, limits_parser) for path in paths]
+    items = [item for types_file in types_files for item in types_file.items]
+    first_path = paths[0]
+    first_content = files[first_path]
+    first_bytes = first_content.encode('utf-8')
+
+    # One in a hundred items edited, for the incremental save
+    edited = TypesParser.parse(first_content, first_path, limits_parser)
+    for item in edited.items[::100]:
+        item.nominal += 1
+        item.modified = True
+    edited_layout = edited.source_layout
+
+    def write_incremental():
+        # A write records the layout of its output - restore the parsed one, as
+        # after a save original_content would be that output
+        edited.source_layout = edited_layout
+        return TypesWriter.write(edited, limits_parser)
+
+    spawnable_content = files['db/cfgspawnabletypes.xml']
+    spawnable_file = SpawnableTypesParser.parse(spawnable_content, 'db/cfgspawnabletypes.xml')
+    presets_content = files['cfgrandompresets.xml']
+    presets_file = RandomPresetsParser.parse(presets_content, 'cfgrandompresets.xml')
+
+    engine = FilterEngine(types_files)
+    queries = {
+        'category': FilterQuery(category='weapons'),
+        'search': FilterQuery(search_text='_12'),
+        'combined': FilterQuery(usage=['Military', 'Police'], value=['Tier3'], nominal_min=5,
+                                flags={'count_in_map': 1}),
+        'or': FilterQuery(tags=['floor'], category='food', use_or_logic=True),
+    }
+    plan = BatchPlan(numeric={'nominal': (MULTIPLY, 1.5), 'lifetime': (SET, 7200)},
+                     add={'usage': ['Coast']}, remove={'tag': ['floor']})
+
+    def apply_and_revert():
+        diff = plan.diff(items)
+        diff.apply()
+        diff.revert()
+
+    cases = [
+        Case('types.parse', lambda: TypesParser.parse(first_content, first_path, limits_parser)),
+        Case('types.parse_stream', lambda: TypesParser.parse_stream(io.BytesIO(first_bytes), first_path,
+                                                                    limits_parser)),
+        Case('types.to_xml', lambda: types_files[0].to_xml(limits_parser)),
+        Case('types.write_incremental', write_incremental),
+        Case('spawnable.parse', lambda: SpawnableTypesParser.parse(spawnable_content, 'db/cfgspawnabletypes.xml')),
+        Case('spawnable.write', lambda: SpawnableTypesWriter.write(spawnable_file)),
+        Case('presets.parse', lambda: RandomPresetsParser.parse(presets_content, 'cfgrandompresets.xml')),
+        Case('presets.write', lambda: RandomPresetsWriter.write(presets_file)),
+        Case('filter.index', lambda: FilterEngine(types_files)),
+    ]
+    for name, query in queries.items():
+        # Fresh search cache each run - measures the query, not the cache
+        cases.append(Case(f'filter.query.{name}',
+                          lambda query=query: (engine._search_cache.clear(), engine.query(query))))
+    cases.append(Case('batch.diff', lambda: plan.diff(items)))
+    cases.append(Case('batch.apply_revert', apply_and_revert))
+    return cases
+
+
+def time_case(case: Case, repeat: int) -> Dict[str, float]:
+    """Best and median seconds per call over repeat runs"""
+    timer = timeit.Timer(case.func)
+    number = 1
+    while True:  # Like Timer.autorange, with a lower target
+        if timer.timeit(number) >= MIN_RUN_SECONDS:
+            break
+        number *= 10
+    times = [total / number for total in timer.repeat(repeat, number)]
+    return {'best': min(times), 'median': statistics.median(times), 'loops': number}
+
+
+def run(spec: MissionSpec, repeat: int = 5, only: Optional[str] = None,
+        on_result: Optional[Callable[[str, Dict[str, float]], None]] = None) -> dict:
+    """Time all cases (or those starting with only); results as a JSON-ready dict"""
+    results = {}
+    for case in build_cases(spec):
+        if only and not case.name.startswith(only):
+            continue
+        results[case.name] = time_case(case, repeat)
+        if on_result:
+            on_result(case.name, results[case.name])
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mission': dataclasses.asdict(spec),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """
+    Cases whose best time exceeds the baseline's by more than their threshold.
+    The baseline may set per-case thresholds: {"thresholds": {"filter.query.search": 0.5}}.
+    Cases missing from either side are not compared.
+    """
+    thresholds = baseline.get('thresholds', {})
+    regressions = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base or not base['best']:
+            continue
+        allowed = thresholds.get(name, threshold)
+        if result['best'] > base['best'] * (1 + allowed):
+            regressions.append(Regression(name, base['best'], result['best'], allowed))
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 0.001:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds * 1000000:.1f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=MissionSpec.types_files, help="Types files")
+    parser.add_argument('--items', type=int, default=MissionSpec.items_per_file, help="Items per types file")
+    parser.add_argument('--seed', type=int, default=MissionSpec.seed)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', metavar='PREFIX', help="Run only cases starting with PREFIX, e.g. filter.")
+    parser.add_argument('--output', help="Write the results as JSON")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Store the results as the new baseline")
+    args = parser.parse_args()
+
+    spec = MissionSpec(types_files=args.files, items_per_file=args.items, seed=args.seed)
+    print(f"Mission: {spec.types_files} types files x {spec.items_per_file} items, "
+          f"{spec.spawnable_types} spawnable types, {spec.presets} presets")
+    current = run(spec, args.repeat, args.only, on_result=lambda name, result: print(
+        f"  {name:28} best {_format_time(result['best']):>10}   median {_format_time(result['median']):>10}"))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        thresholds = {}
+        if baseline_path.exists():  # Keep hand-tuned thresholds
+            with open(baseline_path, encoding='utf-8') as f:
+                thresholds = json.load(f).get('thresholds', {})
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(current, thresholds=thresholds), f, indent=2)
+        print(f"Baseline updated: {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path} - run with --update-baseline to create one")
+        return
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline['meta'].get('mission') != current['meta']['mission']:
+        print("Baseline was recorded for a different mission - not compared")
+        return
+
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression.name} {_format_time(regression.baseline)} -> "
+              f"{_format_time(regression.current)} ({regression.ratio:.2f}x, allowed "
+              f"{1 + regression.threshold:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {baseline_path.name} (recorded {baseline['meta'].get('created')})")
+
+
+if __name__ == '__main__':
+    main()
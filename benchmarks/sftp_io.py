@@ -0,0 +1,158 @@
+"""
+SFTP I/O Benchmark
+Loads and saves a synthetic mission through SFTPManager against a local
+SFTP server with an emulated link (round-trip latency, bandwidth), so the
+transfer layer can be measured and tuned offline. Reports the time and the
+number of SFTP requests of each step; results are JSON like the hot path
+benchmarks and can be compared against a baseline.
+
+Run: python -m benchmarks.sftp_io [--latency 50] [--bandwidth 10] [--channels 4]
+         [--files 4] [--items 2500] [--repeat 3] [--output results.json] [--baseline FILE]
+"""
+import argparse
+import dataclasses
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+from benchmarks.hot_paths import DEFAULT_THRESHOLD, compare
+from benchmarks.sftp_server import LinkProfile, LocalSFTPServer
+from benchmarks.synthetic_mission import MissionSpec, types_file_paths, write_mission
+from config.sftp_channel_pool import DEFAULT_CHANNELS
+from config.sftp_manager import SFTPManager
+from core.economy_session import EconomySession
+from core.parallel_loader import ParallelLoader
+from core.xml_parser import TypesParser
+
+MISSION = '/mission'
+
+
+def run_once(server: LocalSFTPServer, spec: MissionSpec, channels: int) -> Dict[str, dict]:
+    """One connect/stat/load/save pass: {step: {'seconds', 'requests'}}"""
+    steps = {}
+
+    def step(name, func):
+        server.reset_counts()
+        start = time.perf_counter()
+        result = func()
+        steps[name] = {'seconds': time.perf_counter() - start, 'requests': sum(server.requests.values()),
+                       'by_operation': dict(server.requests)}
+        return result
+
+    manager = SFTPManager(transfer_channels=channels)
+    success, message = step('connect', lambda: manager.connect(server.host, server.port, server.username,
+                                                               server.password, MISSION))
+    if not success:
+        raise ConnectionError(message)
+    try:
+        paths = types_file_paths(spec)
+        step('stat_many', lambda: manager.stat_many(paths))
+
+        session = EconomySession(manager)
+        errors = step('load', session.load)
+        if errors:
+            raise IOError(f"Load failed: {errors}")
+
+        # Streaming load: parse while the files are transferred
+        loader = ParallelLoader(manager, lambda content, path: TypesParser.parse(content, path, session.limits_parser),
+                                stream_parse_func=lambda stream, path: TypesParser.parse_stream(
+                                    stream, path, session.limits_parser))
+        results = step('load_stream', lambda: loader.load(paths))
+        failed = [result.path for result in results if not result.success]
+        if failed:
+            raise IOError(f"Streaming load failed: {failed}")
+
+        # One in a hundred items edited in every file
+        for types_file in session.types_files:
+            for item in types_file.items[::100]:
+                item.nominal += 1
+                item.modified = True
+        saved, save_errors = step('save', session.save)
+        if save_errors or len(saved) != len(paths):
+            raise IOError(f"Save failed: {save_errors}")
+    finally:
+        manager.disconnect()
+    return steps
+
+
+def run(spec: MissionSpec, profile: LinkProfile, channels: int = DEFAULT_CHANNELS, repeat: int = 3) -> dict:
+    """Time repeat passes over a fresh mission on a local server; JSON-ready results"""
+    passes: List[Dict[str, dict]] = []
+    with tempfile.TemporaryDirectory() as root:
+        write_mission(f'{root}{MISSION}', spec)
+        with LocalSFTPServer(root, profile) as server:
+            for _ in range(repeat):
+                passes.append(run_once(server, spec, channels))
+
+    results = {}
+    for name in passes[0]:
+        times = [steps[name]['seconds'] for steps in passes]
+        results[f'sftp.{name}'] = {
+            'best': min(times),
+            'median': statistics.median(times),
+            'requests': passes[0][name]['requests'],
+            'by_operation': passes[0][name]['by_operation'],
+        }
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mission': dataclasses.asdict(spec),
+            'link': dataclasses.asdict(profile),
+            'channels': channels,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=50, help="Round-trip latency in ms")
+    parser.add_argument('--bandwidth', type=float, default=10, help="MB/s in each direction (0 = unlimited)")
+    parser.add_argument('--channels', type=int, default=DEFAULT_CHANNELS, help="SFTP transfer channels")
+    parser.add_argument('--files', type=int, default=MissionSpec.types_files, help="Types files")
+    parser.add_argument('--items', type=int, default=MissionSpec.items_per_file, help="Items per types file")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Write the results as JSON")
+    parser.add_argument('--baseline', help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    spec = MissionSpec(types_files=args.files, items_per_file=args.items)
+    profile = LinkProfile(latency=args.latency / 1000,
+                          bandwidth=args.bandwidth * 1024 * 1024 if args.bandwidth else None)
+    print(f"Link: {args.latency:.0f} ms round trip, "
+          f"{f'{args.bandwidth:g} MB/s' if args.bandwidth else 'unlimited bandwidth'}, "
+          f"{args.channels} channel(s); mission: {spec.types_files} x {spec.items_per_file} items")
+    current = run(spec, profile, args.channels, args.repeat)
+    for name, result in current['results'].items():
+        operations = Counter(result['by_operation'])
+        top = ', '.join(f"{op} {count}" for op, count in operations.most_common(4))
+        print(f"  {name:18} best {result['best'] * 1000:9.1f} ms   median {result['median'] * 1000:9.1f} ms   "
+              f"{result['requests']:5} requests ({top})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression.name} {regression.baseline * 1000:.1f} ms -> "
+                  f"{regression.current * 1000:.1f} ms ({regression.ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,403 @@
+"""
+Local SFTP Server
+A paramiko SFTP server over a local folder for tests and I/O benchmarks,
+with an emulated network link: round-trip latency and bandwidth are applied
+to the connection's bytes (so pipelined requests overlap as on a real
+link), and SFTP requests can be made to fail at random or for given paths.
+
+    with LocalSFTPServer(root, LinkProfile(latency=0.05, bandwidth=2_000_000)) as server:
+        manager = SFTPManager()
+        manager.connect(server.host, server.port, server.username, server.password, '/mission')
+"""
+import errno
+import fnmatch
+import os
+import queue
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import paramiko
+
+# Bytes read from a socket per step of the link emulation
+_CHUNK_SIZE = 32 * 1024
+
+
+@dataclass
+class LinkProfile:
+    """Network conditions emulated between client and server"""
+    latency: float = 0.0  # Round-trip seconds (half is added in each direction)
+    bandwidth: Optional[float] = None  # Bytes per second in each direction, None = unlimited
+    failure_rate: float = 0.0  # Probability that an SFTP request fails
+    fail_paths: Sequence[str] = ()  # fnmatch patterns of server paths whose requests always fail
+    deny_operations: Sequence[str] = ()  # Operations (as counted) refused with SFTP_PERMISSION_DENIED
+    posix_rename: bool = True  # Whether the server supports the posix-rename@openssh.com extension
+    seed: int = 0  # For failure_rate
+
+
+class _Auth(paramiko.ServerInterface):
+    """Password authentication with the server's single account"""
+
+    def __init__(self, server: 'LocalSFTPServer'):
+        self.server = server
+
+    def check_auth_password(self, username, password):
+        if username == self.server.username and password == self.server.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+
+class _Handle(paramiko.SFTPHandle):
+    """Open file; counts read/write requests"""
+
+    def __init__(self, server: 'LocalSFTPServer', path: str, file_obj, flags: int):
+        super().__init__(flags)
+        self.server = server
+        self.path = path
+        self.readfile = file_obj
+        self.writefile = file_obj
+
+    def read(self, offset, length):
+        self.server.count('read')
+        return super().read(offset, length)
+
+    def write(self, offset, data):
+        self.server.count('write')
+        return super().write(offset, data)
+
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def chattr(self, attr):
+        return self.server.set_attributes(self.path, attr)
+
+
+class _SFTPInterface(paramiko.SFTPServerInterface):
+    """Maps SFTP requests onto the server's root folder"""
+
+    def __init__(self, auth: _Auth, *args, **kwargs):
+        super().__init__(auth, *args, **kwargs)
+        self.server = auth.server
+
+    def _local(self, path: str) -> str:
+        return self.server.local_path(path)
+
+    def _request(self, op: str, *paths: str) -> Optional[int]:
+        """Count a request; an SFTP error code if it has to fail"""
+        self.server.count(op)
+        if op in self.server.profile.deny_operations:
+            return paramiko.SFTP_PERMISSION_DENIED
+        return paramiko.SFTP_FAILURE if any(self.server.should_fail(path) for path in paths) else None
+
+    def canonicalize(self, path):
+        return self.server.canonical(path)
+
+    def list_folder(self, path):
+        error = self._request('list_folder', path)
+        if error is not None:
+            return error
+        local = self._local(path)
+        try:
+            entries = []
+            for name in os.listdir(local):
+                attr = paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(local, name)))
+                attr.filename = name
+                entries.append(attr)
+            return entries
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        error = self._request('stat', path)
+        if error is not None:
+            return error
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, path):
+        error = self._request('stat', path)
+        if error is not None:
+            return error
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def open(self, path, flags, attr):
+        error = self._request('open', path)
+        if error is not None:
+            return error
+        local = self._local(path)
+        try:
+            fd = os.open(local, flags | getattr(os, 'O_BINARY', 0), 0o644)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        if flags & os.O_CREAT and attr is not None:
+            attr._flags &= ~attr.FLAG_PERMISSIONS  # Keep the umask-based mode
+            paramiko.SFTPServer.set_file_attr(local, attr)
+        if flags & os.O_WRONLY:
+            mode = 'ab' if flags & os.O_APPEND else 'wb'
+        elif flags & os.O_RDWR:
+            mode = 'a+b' if flags & os.O_APPEND else 'r+b'
+        else:
+            mode = 'rb'
+        return _Handle(self.server, path, os.fdopen(fd, mode), flags)
+
+    def remove(self, path):
+        error = self._request('remove', path)
+        if error is not None:
+            return error
+        try:
+            os.remove(self._local(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def rename(self, oldpath, newpath):
+        error = self._request('rename', oldpath, newpath)
+        if error is not None:
+            return error
+        local_new = self._local(newpath)
+        if os.path.exists(local_new):
+            # Plain SFTP rename doesn't replace the target
+            return paramiko.SFTPServer.convert_errno(errno.EEXIST)
+        try:
+            os.rename(self._local(oldpath), local_new)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def posix_rename(self, oldpath, newpath):
+        if not self.server.profile.posix_rename:
+            return paramiko.SFTP_OP_UNSUPPORTED
+        error = self._request('rename', oldpath, newpath)
+        if error is not None:
+            return error
+        try:
+            os.replace(self._local(oldpath), self._local(newpath))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def mkdir(self, path, attr):
+        error = self._request('mkdir', path)
+        if error is not None:
+            return error
+        try:
+            os.mkdir(self._local(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def rmdir(self, path):
+        error = self._request('rmdir', path)
+        if error is not None:
+            return error
+        try:
+            os.rmdir(self._local(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def chattr(self, path, attr):
+        error = self._request('chattr', path)
+        if error is not None:
+            return error
+        return self.server.set_attributes(path, attr)
+
+
+class LocalSFTPServer:
+    """
+    SFTP server on 127.0.0.1 (a free port) serving root as '/'.
+    The link profile can be changed while clients are connected.
+    """
+
+    def __init__(self, root: str, profile: Optional[LinkProfile] = None,
+                 username: str = 'dayz', password: str = 'dayz'):
+        self.root = os.path.realpath(root)
+        self.profile = profile or LinkProfile()
+        self.username = username
+        self.password = password
+        self.host = '127.0.0.1'
+        self.port = None
+        # SFTP operations served, by operation (a directory listing - opendir,
+        # readdir..., close on the wire - counts once)
+        self.requests = Counter()
+        self._host_key = paramiko.ECDSAKey.generate()
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._listener: Optional[socket.socket] = None
+        self._connections: List[socket.socket] = []
+        self._transports: List[paramiko.Transport] = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        """Start accepting connections"""
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((self.host, 0))
+        self._listener.listen(16)
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept_loop, name='sftp-accept', daemon=True).start()
+
+    def stop(self):
+        """Close the listener and all connections"""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        self.drop_connections()
+
+    def drop_connections(self):
+        """Abruptly close every client connection (emulates a network drop)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            connection.close()
+
+    def reset_counts(self):
+        """Start counting requests from zero"""
+        with self._lock:
+            self.requests.clear()
+
+    def count(self, op: str):
+        """Record one served request"""
+        with self._lock:
+            self.requests[op] += 1
+
+    def should_fail(self, path: str) -> bool:
+        """Whether a request for a server path is to fail under the current profile"""
+        profile = self.profile
+        canonical = self.canonical(path)
+        if any(fnmatch.fnmatch(canonical, pattern) for pattern in profile.fail_paths):
+            return True
+        if profile.failure_rate:
+            with self._lock:
+                return self._rng.random() < profile.failure_rate
+        return False
+
+    @staticmethod
+    def canonical(path: str) -> str:
+        """Normalized absolute server path"""
+        parts = []
+        for part in path.replace('\\', '/').split('/'):
+            if part == '..':
+                if parts:
+                    parts.pop()
+            elif part and part != '.':
+                parts.append(part)
+        return '/' + '/'.join(parts)
+
+    def local_path(self, path: str) -> str:
+        """Local file for a server path (never outside root)"""
+        return os.path.join(self.root, *self.canonical(path).split('/')[1:])
+
+    def set_attributes(self, path: str, attr) -> int:
+        """Apply SFTP attributes (mode, times) to the file of a server path"""
+        try:
+            paramiko.SFTPServer.set_file_attr(self.local_path(path), attr)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def _accept_loop(self):
+        listener = self._listener
+        while True:
+            try:
+                client, _ = listener.accept()
+            except OSError:
+                return  # Listener closed
+            threading.Thread(target=self._serve, args=(client,), name='sftp-connection', daemon=True).start()
+
+    def _serve(self, client: socket.socket):
+        """Run an SSH transport for one client behind an emulated link"""
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server_side, link_side = socket.socketpair()
+        with self._lock:
+            self._connections.extend((client, server_side, link_side))
+        self._start_link(client, link_side)
+        self._start_link(link_side, client)
+
+        transport = paramiko.Transport(server_side)
+        transport.add_server_key(self._host_key)
+        transport.set_subsystem_handler('sftp', paramiko.SFTPServer, _SFTPInterface)
+        with self._lock:
+            self._transports.append(transport)
+        try:
+            transport.start_server(server=_Auth(self))
+        except (paramiko.SSHException, EOFError, OSError):
+            transport.close()
+
+    def _start_link(self, source: socket.socket, target: socket.socket):
+        """
+        Forward bytes from source to target, each chunk delayed by half the
+        round-trip latency and paced to the bandwidth. Reading continues while
+        chunks wait, so requests in flight overlap as on a real link.
+        """
+        pending = queue.Queue()
+
+        def receive():
+            while True:
+                try:
+                    data = source.recv(_CHUNK_SIZE)
+                except OSError:
+                    data = b''
+                pending.put((time.monotonic() + self.profile.latency / 2, data))
+                if not data:
+                    return
+
+        def send():
+            link_free = 0.0  # When the previous chunk has been "transmitted"
+            while True:
+                due, data = pending.get()
+                if not data:
+                    break
+                bandwidth = self.profile.bandwidth
+                if bandwidth:
+                    start = max(due, link_free)
+                    link_free = start + len(data) / bandwidth
+                    due = link_free
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    target.sendall(data)
+                except OSError:
+                    break
+            try:
+                target.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+        threading.Thread(target=receive, name='sftp-link-receive', daemon=True).start()
+        threading.Thread(target=send, name='sftp-link-send', daemon=True).start()
@@ -0,0 +1,144 @@
+"""
+Startup Benchmark
+Time from launching the editor to its first shown window, measured in a
+fresh interpreter per run, plus an -X importtime breakdown of the modules
+imported on the way. Modules that should only load on first use (SFTP,
+credential encryption, deferred tabs and dialogs) are flagged if they
+show up before the window does.
+
+Run: python -m benchmarks.startup_time [--runs 5] [--top 15] [--budget SECONDS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must not be imported before the first window
+DEFERRED_MODULES = ('paramiko', 'cryptography', 'ui.batch_ops', 'ui.new_item_dialog',
+                    'ui.random_presets_tab', 'ui.spawnable_types_tab', 'ui.settings_tab',
+                    'ui.sftp_dialog', 'ui.save_dialog')
+
+READY_MARKER = 'FIRST_WINDOW'
+
+# Mirrors main.py up to the first shown window, then quits before the
+# startup dialog (scheduled 100 ms after construction) opens
+_CHILD_SCRIPT = f'''
+import sys
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+from ui.main_window import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+window.show()
+def ready():
+    print({READY_MARKER!r}, flush=True)
+    app.quit()
+QTimer.singleShot(0, ready)
+app.exec_()
+'''
+
+
+class ImportRecord(NamedTuple):
+    """One line of -X importtime output (times in microseconds)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = imported directly by the script
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Records of the 'import time:' lines in an interpreter's stderr"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(parts[0]), int(parts[1]), max(depth, 0)))
+    return records
+
+
+def deferred_imports(records: List[ImportRecord]) -> List[str]:
+    """Modules of DEFERRED_MODULES (or their submodules) that were imported"""
+    found = set()
+    for record in records:
+        for module in DEFERRED_MODULES:
+            if record.module == module or record.module.startswith(module + '.'):
+                found.add(module)
+    return sorted(found)
+
+
+def measure_once(env: Dict[str, str]) -> dict:
+    """Launch the editor once; seconds until its first window and the import records"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', _CHILD_SCRIPT],
+                               cwd=str(ROOT), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True)
+    first_window = None
+    for line in process.stdout:
+        if line.strip() == READY_MARKER:
+            first_window = time.perf_counter() - start
+            break
+    _, stderr = process.communicate(timeout=60)
+    if first_window is None:
+        raise RuntimeError(f"Editor did not start (exit code {process.returncode}):\n{stderr[-2000:]}")
+    return {'first_window': first_window, 'imports': parse_importtime(stderr)}
+
+
+def run(runs: int = 5) -> dict:
+    """Measure startup runs times in a throwaway home directory (no user config is touched)"""
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, USERPROFILE=home)
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')  # Headless machines (CI)
+        # Warm-up: first launch creates the config directory and bytecode
+        measure_once(env)
+        results = [measure_once(env) for _ in range(runs)]
+
+    times = [result['first_window'] for result in results]
+    imports = results[times.index(min(times))]['imports']
+    return {
+        'runs': runs,
+        'best': min(times),
+        'median': statistics.median(times),
+        'import_total_us': sum(record.self_us for record in imports),
+        'imports': imports,
+        'deferred_imported': deferred_imports(imports),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument('--budget', type=float, help="Fail if the median time to first window exceeds this")
+    args = parser.parse_args()
+
+    result = run(args.runs)
+    print(f"Time to first window ({result['runs']} runs): "
+          f"best {result['best'] * 1000:.0f} ms, median {result['median'] * 1000:.0f} ms")
+    print(f"  imports: {result['import_total_us'] / 1000:.0f} ms")
+    top_level = sorted((record for record in result['imports'] if record.depth == 0),
+                       key=lambda record: record.cumulative_us, reverse=True)
+    for record in top_level[:args.top]:
+        print(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+    if result['deferred_imported']:
+        print(f"  imported before the first window: {', '.join(result['deferred_imported'])}")
+
+    if args.budget is not None and result['median'] > args.budget:
+        print(f"Over budget: {result['median']:.2f}s > {args.budget:.2f}s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Synthetic Mission
+Deterministic generator for realistic mission folders: several types files
+whose items reference user groups, cfglimitsdefinition(user).xml,
+cfgspawnabletypes.xml with nested cargo/attachments blocks and
+cfgrandompresets.xml. The same spec and seed always give the same text.
+
+Run: python -m benchmarks.synthetic_mission OUTPUT_DIR [--files 4] [--items 2500]
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+
+from benchmarks.type_item_memory import CATEGORIES, USAGES, VALUES, TAGS
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+FLAGS = ('count_in_cargo', 'count_in_hoarder', 'count_in_map', 'count_in_player', 'crafted', 'deloot')
+
+
+@dataclass
+class MissionSpec:
+    """Size of a synthetic mission"""
+    types_files: int = 4  # db/types.xml plus custom/types_N.xml
+    items_per_file: int = 2500
+    user_groups: int = 12
+    spawnable_types: int = 1500
+    presets: int = 60
+    seed: int = 1
+
+
+def item_name(file_index: int, item_index: int) -> str:
+    """Name of an item in the generated types files"""
+    return f'Item_{file_index}_{item_index}'
+
+
+def _chance(rng: random.Random) -> str:
+    return f'{rng.randint(1, 100) / 100:.2f}'
+
+
+def limits_xml() -> str:
+    """cfglimitsdefinition.xml with the generator's vocabulary"""
+    lines = ['<lists>']
+    for section, element, names in (('categories', 'category', CATEGORIES), ('tags', 'tag', TAGS),
+                                    ('usageflags', 'usage', USAGES), ('valueflags', 'value', VALUES)):
+        lines.append(f'    <{section}>')
+        lines.extend(f'        <{element} name="{name}"/>' for name in names)
+        lines.append(f'    </{section}>')
+    lines.append('</lists>')
+    return '\n'.join(lines)
+
+
+def user_limits_xml(spec: MissionSpec) -> str:
+    """cfglimitsdefinitionuser.xml with spec.user_groups usage and value groups"""
+    rng = random.Random(spec.seed)
+    lines = ['<user_lists>', '    <usageflags>']
+    for index in range(spec.user_groups):
+        lines.append(f'        <user name="UsageGroup{index}">')
+        lines.extend(f'            <usage name="{usage}"/>' for usage in rng.sample(USAGES, rng.randint(2, 4)))
+        lines.append('        </user>')
+    lines.extend(['    </usageflags>', '    <valueflags>'])
+    for index in range(spec.user_groups):
+        lines.append(f'        <user name="ValueGroup{index}">')
+        lines.extend(f'            <value name="{value}"/>' for value in rng.sample(VALUES, rng.randint(2, 3)))
+        lines.append('        </user>')
+    lines.extend(['    </valueflags>', '</user_lists>'])
+    return '\n'.join(lines)
+
+
+def types_xml(spec: MissionSpec, file_index: int) -> str:
+    """One types file; about a third of the items use user groups instead of plain usages"""
+    rng = random.Random(spec.seed * 1000 + file_index)
+    lines = [XML_DECLARATION, f'<!-- Synthetic types file {file_index} -->', '<types>']
+    for index in range(spec.items_per_file):
+        category = rng.choice(CATEGORIES)
+        if index % 50 == 0:
+            lines.append(f'    <!-- {category} -->')
+        lines.append(f'    <type name="{item_name(file_index, index)}">')
+        nominal = rng.randint(0, 50)
+        lines.append(f'        <nominal>{nominal}</nominal>')
+        lines.append(f'        <lifetime>{rng.choice([3600, 7200, 14400, 28800])}</lifetime>')
+        lines.append(f'        <restock>{rng.choice([0, 0, 1800])}</restock>')
+        lines.append(f'        <min>{rng.randint(0, min(nominal, 10))}</min>')
+        lines.append('        <quantmin>-1</quantmin>')
+        lines.append('        <quantmax>-1</quantmax>')
+        lines.append('        <cost>100</cost>')
+        flags = ' '.join(f'{flag}="{1 if flag == "count_in_map" or rng.random() < 0.1 else 0}"' for flag in FLAGS)
+        lines.append(f'        <flags {flags}/>')
+        lines.append(f'        <category name="{category}"/>')
+        if spec.user_groups and rng.random() < 0.33:
+            lines.append(f'        <user name="UsageGroup{rng.randrange(spec.user_groups)}"/>')
+            lines.append(f'        <user name="ValueGroup{rng.randrange(spec.user_groups)}"/>')
+        else:
+            lines.extend(f'        <usage name="{usage}"/>' for usage in rng.sample(USAGES, rng.randint(1, 3)))
+            lines.extend(f'        <value name="{value}"/>' for value in rng.sample(VALUES, rng.randint(0, 2)))
+        lines.extend(f'        <tag name="{tag}"/>' for tag in rng.sample(TAGS, rng.randint(0, 1)))
+        lines.append('    </type>')
+    lines.append('</types>')
+    return '\n'.join(lines) + '\n'
+
+
+def _preset_names(spec: MissionSpec, kind: str) -> List[str]:
+    return [f'{kind}Preset{index}' for index in range(spec.presets // 2)]
+
+
+def random_presets_xml(spec: MissionSpec) -> str:
+    """cfgrandompresets.xml with spec.presets cargo and attachments presets"""
+    rng = random.Random(spec.seed + 1)
+    lines = [XML_DECLARATION, '<randompresets>']
+    for kind, element in (('Cargo', 'cargo'), ('Attachments', 'attachments')):
+        for name in _preset_names(spec, kind):
+            lines.append(f'    <{element} name="{name}" chance="{_chance(rng)}">')
+            for _ in range(rng.randint(2, 8)):
+                lines.append(f'        <item name="{_random_item(spec, rng)}" chance="{_chance(rng)}"/>')
+            lines.append(f'    </{element}>')
+    lines.append('</randompresets>')
+    return '\n'.join(lines) + '\n'
+
+
+def _random_item(spec: MissionSpec, rng: random.Random) -> str:
+    return item_name(rng.randrange(spec.types_files), rng.randrange(max(spec.items_per_file, 1)))
+
+
+def spawnable_types_xml(spec: MissionSpec) -> str:
+    """cfgspawnabletypes.xml mixing preset blocks and nested chance blocks"""
+    rng = random.Random(spec.seed + 2)
+    cargo_presets = _preset_names(spec, 'Cargo')
+    attachments_presets = _preset_names(spec, 'Attachments')
+    lines = [XML_DECLARATION, '<spawnabletypes>']
+    for index in range(spec.spawnable_types):
+        lines.append(f'    <type name="{item_name(index % spec.types_files, index // spec.types_files)}">')
+        if rng.random() < 0.1:
+            lines.append('        <hoarder/>')
+        if rng.random() < 0.3:
+            low = rng.randint(0, 50) / 100
+            lines.append(f'        <damage min="{low:.2f}" max="{low + rng.randint(0, 50) / 100:.2f}"/>')
+        for _ in range(rng.randint(0, 3)):
+            if attachments_presets and rng.random() < 0.4:
+                lines.append(f'        <attachments preset="{rng.choice(attachments_presets)}"/>')
+            else:
+                lines.append(f'        <attachments chance="{_chance(rng)}">')
+                for _ in range(rng.randint(1, 4)):
+                    lines.append(f'            <item name="{_random_item(spec, rng)}" chance="{_chance(rng)}"/>')
+                lines.append('        </attachments>')
+        for _ in range(rng.randint(0, 2)):
+            if cargo_presets and rng.random() < 0.5:
+                lines.append(f'        <cargo preset="{rng.choice(cargo_presets)}"/>')
+            else:
+                lines.append(f'        <cargo chance="{_chance(rng)}">')
+                for _ in range(rng.randint(1, 3)):
+                    lines.append(f'            <item name="{_random_item(spec, rng)}" chance="{_chance(rng)}"/>')
+                lines.append('        </cargo>')
+        lines.append('    </type>')
+    lines.append('</spawnabletypes>')
+    return '\n'.join(lines) + '\n'
+
+
+def types_file_paths(spec: MissionSpec) -> List[str]:
+    """Mission-relative paths of the generated types files"""
+    return ['db/types.xml'] + [f'custom/types_{index}.xml' for index in range(1, spec.types_files)]
+
+
+def economy_core_xml(spec: MissionSpec) -> str:
+    """cfgeconomycore.xml listing the custom types files and the spawnable types"""
+    lines = ['<economycore>', '    <ce folder="custom">']
+    for path in types_file_paths(spec)[1:]:
+        lines.append(f'        <file name="{os.path.basename(path)}" type="types"/>')
+    lines.extend(['    </ce>', '    <ce folder="db">',
+                  '        <file name="cfgspawnabletypes.xml" type="spawnabletypes"/>',
+                  '    </ce>', '</economycore>'])
+    return '\n'.join(lines)
+
+
+def generate_mission(spec: MissionSpec) -> Dict[str, str]:
+    """All files of the mission: {mission-relative path: content}"""
+    files = {
+        'cfgeconomycore.xml': economy_core_xml(spec),
+        'cfglimitsdefinition.xml': limits_xml(),
+        'cfglimitsdefinitionuser.xml': user_limits_xml(spec),
+        'cfgrandompresets.xml': random_presets_xml(spec),
+        'db/cfgspawnabletypes.xml': spawnable_types_xml(spec),
+    }
+    for index, path in enumerate(types_file_paths(spec)):
+        files[path] = types_xml(spec, index)
+    return files
+
+
+def write_mission(root: str, spec: MissionSpec) -> Dict[str, str]:
+    """Write the mission below root; returns the generated files"""
+    files = generate_mission(spec)
+    for path, content in files.items():
+        full_path = os.path.join(root, *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output', help="Mission folder to create")
+    parser.add_argument('--files', type=int, default=MissionSpec.types_files)
+    parser.add_argument('--items', type=int, default=MissionSpec.items_per_file, help="Items per types file")
+    parser.add_argument('--seed', type=int, default=MissionSpec.seed)
+    args = parser.parse_args()
+
+    spec = MissionSpec(types_files=args.files, items_per_file=args.items, seed=args.seed)
+    files = write_mission(args.output, spec)
+    size = sum(len(content.encode('utf-8')) for content in files.values())
+    print(f"Wrote {len(files)} files ({size / 1024 / 1024:.1f} MB, "
+          f"{spec.types_files * spec.items_per_file} items) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
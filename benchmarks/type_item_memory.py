@@ -0,0 +1,125 @@
+"""
+TypeItem Memory Benchmark
+Retained memory of a synthetic economy: the compact (slotted, interned)
+TypeItem against the previous representation - a dataclass with a __dict__
+and its own string object for every category/usage/value/tag occurrence.
+
+Run: python -m benchmarks.type_item_memory [--items 50000]
+"""
+import argparse
+import dataclasses
+import gc
+import random
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from core.xml_parser import TypesParser
+from models.type_item import TypeItem
+
+CATEGORIES = ['weapons', 'tools', 'food', 'clothes', 'containers', 'explosives']
+USAGES = ['Military', 'Police', 'Medic', 'Firefighter', 'Industrial', 'Farm', 'Coast',
+          'Town', 'Village', 'Hunting', 'Office', 'School', 'Prison', 'Lunapark']
+VALUES = ['Tier1', 'Tier2', 'Tier3', 'Tier4', 'Unique']
+TAGS = ['floor', 'shelves', 'ground']
+
+
+def synthetic_types_xml(count: int, seed: int = 1) -> str:
+    """A types.xml with count items drawn from the vanilla-like vocabulary"""
+    rng = random.Random(seed)
+    lines = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>', '<types>']
+    for i in range(count):
+        lines.append(f'    <type name="Item_{i}_{rng.choice(CATEGORIES)}">')
+        lines.append(f'        <nominal>{rng.randint(0, 50)}</nominal>')
+        lines.append(f'        <lifetime>{rng.choice([3600, 7200, 14400])}</lifetime>')
+        lines.append('        <restock>0</restock>')
+        lines.append(f'        <min>{rng.randint(0, 10)}</min>')
+        lines.append('        <quantmin>-1</quantmin>')
+        lines.append('        <quantmax>-1</quantmax>')
+        lines.append('        <cost>100</cost>')
+        lines.append('        <flags count_in_cargo="0" count_in_hoarder="0" count_in_map="1" '
+                     'count_in_player="0" crafted="0" deloot="0"/>')
+        lines.append(f'        <category name="{rng.choice(CATEGORIES)}"/>')
+        for usage in rng.sample(USAGES, rng.randint(1, 3)):
+            lines.append(f'        <usage name="{usage}"/>')
+        for value in rng.sample(VALUES, rng.randint(0, 2)):
+            lines.append(f'        <value name="{value}"/>')
+        for tag in rng.sample(TAGS, rng.randint(0, 1)):
+            lines.append(f'        <tag name="{tag}"/>')
+        lines.append('    </type>')
+    lines.append('</types>')
+    return '\n'.join(lines)
+
+
+def _legacy_class():
+    """The previous TypeItem layout: same fields, regular (dict-backed) dataclass"""
+    specs = []
+    for f in dataclasses.fields(TypeItem):
+        if f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+    return dataclasses.make_dataclass('LegacyTypeItem', specs)
+
+
+def _fresh(text):
+    """A new string object equal to text (what the parser produced before interning)"""
+    return text.encode('utf-8').decode('utf-8') if isinstance(text, str) else text
+
+
+def to_legacy(items: List[TypeItem]) -> list:
+    """Copy items into the previous representation"""
+    legacy = _legacy_class()
+    copies = []
+    for item in items:
+        values = {}
+        for f in dataclasses.fields(TypeItem):
+            value = getattr(item, f.name)
+            if isinstance(value, list):
+                value = [_fresh(entry) for entry in value]
+            elif f.name == 'category':
+                value = _fresh(value)
+            values[f.name] = value
+        copies.append(legacy(**values))
+    return copies
+
+
+def retained_bytes(build: Callable[[], object]) -> Tuple[int, object]:
+    """Memory still allocated by build()'s result after it returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def run(count: int) -> dict:
+    """Measure both representations for count items"""
+    xml_content = synthetic_types_xml(count)
+    compact_bytes, types_file = retained_bytes(lambda: TypesParser.parse(xml_content, 'types.xml').items)
+    legacy_bytes, _ = retained_bytes(lambda: to_legacy(types_file))
+    return {
+        'items': count,
+        'compact_bytes': compact_bytes,
+        'legacy_bytes': legacy_bytes,
+        'reduction': 1 - compact_bytes / legacy_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=50000)
+    args = parser.parse_args()
+
+    result = run(args.items)
+    print(f"{result['items']} items")
+    print(f"  previous: {result['legacy_bytes'] / 1e6:8.1f} MB "
+          f"({result['legacy_bytes'] / result['items']:.0f} bytes/item)")
+    print(f"  compact:  {result['compact_bytes'] / 1e6:8.1f} MB "
+          f"({result['compact_bytes'] / result['items']:.0f} bytes/item)")
+    print(f"  reduction: {result['reduction']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
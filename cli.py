@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+DayZ Types Editor - Command Line Entry Point (dayz-types)
+Loads a mission locally or over SFTP, selects items with filter expressions,
+applies batch edits, validates and saves with backups - without the GUI, so
+nightly rebalances can run from cron. PyQt5 is never imported.
+
+Examples:
+    python cli.py /srv/dayz/mpmissions/dayzOffline.chernarusplus --where category=weapons --set "nominal*=0.8"
+    python cli.py --sftp admin@example.com:2022 /mpmissions/dayzOffline.enoch --where usage=Military --validate
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from core.economy_session import EconomySession
+from core.tracing import tracer
+
+# FIELD OP VALUE - longest operators first
+_EXPRESSION = re.compile(r'^\s*([A-Za-z_]+)\s*(\*=|\+=|-=|>=|<=|=)\s*(.*?)\s*$')
+
+# Same default as the editor settings
+DEFAULT_BACKUP_DIR = str(Path.home() / 'DayZEditor' / 'Backups')
+PASSWORD_ENV = 'DAYZ_SFTP_PASSWORD'
+
+
+def _split_expression(expression: str):
+    """(field, operator, value) of an expression, field lowercased"""
+    match = _EXPRESSION.match(expression)
+    if not match:
+        raise ValueError(f"Invalid expression: '{expression}'")
+    field_name, op, value = match.groups()
+    return field_name.lower(), op, value
+
+
+def _names(value: str) -> List[str]:
+    """Comma separated names"""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def _int(value: str, expression: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Expected a whole number in '{expression}'")
+
+
+def parse_filter(expressions: List[str], use_or_logic: bool = False):
+    """
+    Build a FilterQuery from expressions like:
+        name=AK             item name contains the text
+        category=weapons    file=db/types.xml
+        usage=Military,Police   value=Tier3   tag=floor   (any of the names)
+        nominal>=5   nominal<=20
+        crafted=1           (any flag, always ANDed)
+    """
+    from core.filter_engine import FilterQuery
+    from core.item_store import LIST_KEYS
+    from models.type_item import FLAG_FIELDS
+    query = FilterQuery(use_or_logic=use_or_logic)
+    for expression in expressions:
+        field_name, op, value = _split_expression(expression)
+        if field_name == 'nominal' and op in ('>=', '<='):
+            if op == '>=':
+                query.nominal_min = _int(value, expression)
+            else:
+                query.nominal_max = _int(value, expression)
+        elif op != '=':
+            raise ValueError(f"Unsupported filter operator in '{expression}'")
+        elif field_name == 'name':
+            query.search_text = value
+        elif field_name == 'category':
+            query.category = value
+        elif field_name == 'file':
+            query.source_file = value
+        elif field_name in LIST_KEYS:
+            setattr(query, 'tags' if field_name == 'tag' else field_name, _names(value))
+        elif field_name in FLAG_FIELDS:
+            query.flags[field_name] = 1 if _int(value, expression) else 0
+        else:
+            raise ValueError(f"Unknown filter field in '{expression}'")
+    return query
+
+
+def parse_edit(expressions: List[str]):
+    """
+    Build a BatchPlan from expressions like:
+        nominal*=1.5   lifetime=7200   (numeric fields: multiply or set)
+        crafted=0                      (flags)
+        category=tools   category=     (set or clear the category)
+        usage+=Town,Village   tag-=floor
+    """
+    from core.batch_engine import BatchPlan, MULTIPLY, SET, LIST_FIELDS
+    from models.type_item import NUMERIC_FIELDS, FLAG_FIELDS
+    plan = BatchPlan()
+    for expression in expressions:
+        field_name, op, value = _split_expression(expression)
+        if field_name in NUMERIC_FIELDS and op in ('*=', '='):
+            try:
+                number = float(value) if op == '*=' else int(value)
+            except ValueError:
+                raise ValueError(f"Expected a number in '{expression}'")
+            if number < 0:
+                raise ValueError(f"Negative value in '{expression}'")
+            plan.numeric[field_name] = (MULTIPLY if op == '*=' else SET, number)
+        elif field_name in FLAG_FIELDS and op == '=':
+            plan.flags[field_name] = 1 if _int(value, expression) else 0
+        elif field_name == 'category' and op == '=':
+            plan.set_category = True
+            plan.category = value or None
+        elif field_name in LIST_FIELDS and op in ('+=', '-='):
+            target = plan.add if op == '+=' else plan.remove
+            target.setdefault(field_name, []).extend(_names(value))
+        else:
+            raise ValueError(f"Unsupported edit '{expression}'")
+    return plan
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='dayz-types',
+        description="Filter, batch edit, validate and save DayZ types.xml files without the GUI."
+    )
+    parser.add_argument('mission', help="Mission folder (local path, or remote path with --sftp)")
+    parser.add_argument('--sftp', metavar='USER@HOST[:PORT]',
+                        help=f"Load over SFTP; the password is read from ${PASSWORD_ENV}")
+    parser.add_argument('--where', action='append', default=[], metavar='EXPR',
+                        help="Filter expression, e.g. category=weapons, usage=Military,Police, nominal>=5")
+    parser.add_argument('--any', action='store_true', help="Match any filter instead of all (flags are always ANDed)")
+    parser.add_argument('--set', action='append', default=[], metavar='EXPR', dest='edits',
+                        help="Batch edit, e.g. nominal*=0.8, lifetime=7200, crafted=0, usage+=Town")
+    parser.add_argument('--list', action='store_true', help="Print the selected items")
+    parser.add_argument('--validate', action='store_true',
+                        help="Check the selected items against the limits definitions (exit 1 on errors)")
+    parser.add_argument('--dry-run', action='store_true', help="Report the changes without saving")
+    parser.add_argument('--backup-dir', default=DEFAULT_BACKUP_DIR, help="Where originals are backed up")
+    parser.add_argument('--no-backup', action='store_true', help="Save without backing up the originals")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Record timing spans and write them as Chrome trace JSON (chrome://tracing)")
+    return parser
+
+
+def connect(args):
+    """Connected file manager for the mission (SFTP or local)"""
+    if args.sftp:
+        from config.sftp_manager import SFTPManager  # paramiko only when needed
+        match = re.match(r'^([^@]+)@([^:]+)(?::(\d+))?$', args.sftp)
+        if not match:
+            raise ValueError(f"Invalid --sftp target '{args.sftp}', expected USER@HOST[:PORT]")
+        username, host, port = match.groups()
+        manager = SFTPManager()
+        success, message = manager.connect(host, int(port or 22), username,
+                                           os.environ.get(PASSWORD_ENV, ''), args.mission)
+    else:
+        from config.local_file_manager import LocalFileManager
+        manager = LocalFileManager()
+        success, message = manager.connect(args.mission)
+    if not success:
+        raise ConnectionError(message)
+    return manager
+
+
+def run(args) -> int:
+    """Run the command; returns the exit code"""
+    try:
+        query = parse_filter(args.where, args.any) if args.where else None
+        plan = parse_edit(args.edits) if args.edits else None
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    tracer.enable(bool(args.trace))
+    start = time.perf_counter()
+    try:
+        file_manager = connect(args)
+    except (ValueError, ConnectionError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    exit_code = 0
+    try:
+        session = EconomySession(file_manager)
+        for error in session.load():
+            print(f"Warning: {error}", file=sys.stderr)
+        total = sum(len(types_file.items) for types_file in session.types_files)
+        print(f"Loaded {total} items from {len(session.types_files)} file(s) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        items = session.select(query)
+        print(f"Selected {len(items)} item(s)")
+        if args.list:
+            for item in items:
+                print(f"  {item.name}  nominal={item.nominal} min={item.min} "
+                      f"category={item.category or '-'}  ({item.source_file})")
+
+        if plan is not None and not plan.is_empty():
+            diff = session.apply(plan, items)
+            statistics = diff.statistics
+            print(f"Changed {statistics.changed_items} item(s), {statistics.change_count} value(s); "
+                  f"nominal {statistics.nominal_before} -> {statistics.nominal_after}")
+
+        if args.validate:
+            errors = session.validate(items)
+            for error in errors:
+                print(f"Invalid: {error}")
+            if errors:
+                print(f"{len(errors)} validation error(s) - not saving", file=sys.stderr)
+                return 1
+
+        if plan is not None:
+            backup_manager = None
+            if not args.no_backup and not args.dry_run:
+                from core.backup_manager import BackupManager
+                backup_manager = BackupManager(args.backup_dir)
+            saved, errors = session.save(backup_manager, dry_run=args.dry_run)
+            for path in saved:
+                print(f"{'Would save' if args.dry_run else 'Saved'} {path}")
+            for path, error in errors.items():
+                print(f"Error saving {path}: {error}", file=sys.stderr)
+                exit_code = 1
+            if not saved and not errors:
+                print("No files changed")
+    finally:
+        file_manager.disconnect()
+        if args.trace:
+            write_trace(args.trace)
+    return exit_code
+
+
+def write_trace(path: str):
+    """Write the recorded spans and print the per-stage totals"""
+    try:
+        tracer.write_chrome_trace(path)
+    except OSError as e:
+        print(f"Error writing trace: {e}", file=sys.stderr)
+        return
+    print(f"Trace: {tracer.format_stages()} ({len(tracer.records)} spans written to {path})")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,8 +6,9 @@ import json
 import os
 from pathlib import Path
 from typing import Optional, Dict, Any
-from cryptography.fernet import Fernet
 import base64
+from config.file_cache import FileCache
+from config.model_cache import ModelCache
 
 class AppConfig:
     def __init__(self, config_path: Optional[str] = None):
@@ -20,11 +21,17 @@ class AppConfig:
             self.config_path = Path(config_path)
         
         self.key_file = self.config_path.parent / '.key'
-        self._encryption_key = self._get_or_create_key()
+        self._encryption_key: Optional[bytes] = None  # Read on first use of saved credentials
         self.config = self._load_config()
+        
+        # File contents are cached outside the settings file
+        self.file_cache = FileCache(str(self.config_path.parent / 'cache'))
+        self.model_cache = ModelCache(str(self.config_path.parent / 'cache' / 'models'))
+        self._migrate_legacy_file_cache()
     
     def _get_or_create_key(self) -> bytes:
         """Get or create encryption key for credentials"""
+        from cryptography.fernet import Fernet  # Slow import - only needed for saved credentials
         if self.key_file.exists():
             with open(self.key_file, 'rb') as f:
                 return f.read()
@@ -36,15 +43,20 @@ class AppConfig:
             os.chmod(self.key_file, 0o600)
             return key
     
+    def _fernet(self):
+        """Cipher for stored credentials"""
+        from cryptography.fernet import Fernet
+        if self._encryption_key is None:
+            self._encryption_key = self._get_or_create_key()
+        return Fernet(self._encryption_key)
+    
     def _encrypt(self, data: str) -> str:
         """Encrypt sensitive data"""
-        f = Fernet(self._encryption_key)
-        return f.encrypt(data.encode()).decode()
+        return self._fernet().encrypt(data.encode()).decode()
     
     def _decrypt(self, data: str) -> str:
         """Decrypt sensitive data"""
-        f = Fernet(self._encryption_key)
-        return f.decrypt(data.encode()).decode()
+        return self._fernet().decrypt(data.encode()).decode()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file"""
@@ -69,14 +81,31 @@ class AppConfig:
                 'save_credentials': False,
                 'last_connected': None
             },
-            'file_cache': {},  # path -> {'timestamp': ..., 'content': ...}
             'map_profiles': [],
             'active_map_profile': None,
             'backup_location': str(Path.home() / 'DayZEditor' / 'Backups'),
             'window_geometry': None,
-            'window_state': None
+            'window_state': None,
+            'parse_processes': 0,
+            'undo_memory_mb': 64,
+            'trace_enabled': False
         }
     
+    def _migrate_legacy_file_cache(self):
+        """Move file contents cached by older versions into the on-disk cache"""
+        legacy_cache = self.config.pop('file_cache', None)
+        if legacy_cache is None:
+            return
+        
+        for path, cached in legacy_cache.items():
+            try:
+                self.file_cache.put(path, cached['timestamp'], cached['content'])
+            except (KeyError, TypeError, IOError) as e:
+                print(f"Skipping legacy cache entry {path}: {e}")
+        
+        # Rewrite the config without the embedded file contents
+        self.save()
+    
     def save(self):
         """Save configuration to JSON file"""
         try:
@@ -168,6 +197,36 @@ class AppConfig:
         self.config['backup_location'] = path
         self.save()
     
+    # Parsing
+    def get_parse_processes(self) -> int:
+        """Get number of parser worker processes (0 = parse in the loader threads)"""
+        return self.config.get('parse_processes', 0)
+    
+    def set_parse_processes(self, processes: int):
+        """Set number of parser worker processes"""
+        self.config['parse_processes'] = processes
+        self.save()
+    
+    # Undo
+    def get_undo_memory_mb(self) -> int:
+        """Get the memory budget of the undo history in MB"""
+        return self.config.get('undo_memory_mb', 64)
+    
+    def set_undo_memory_mb(self, megabytes: int):
+        """Set the memory budget of the undo history in MB"""
+        self.config['undo_memory_mb'] = megabytes
+        self.save()
+    
+    # Tracing
+    def get_trace_enabled(self) -> bool:
+        """Get whether load/parse/filter/save timing spans are recorded"""
+        return self.config.get('trace_enabled', False)
+    
+    def set_trace_enabled(self, enabled: bool):
+        """Set whether timing spans are recorded"""
+        self.config['trace_enabled'] = enabled
+        self.save()
+    
     # Window State
     def get_window_geometry(self):
         """Get saved window geometry"""
@@ -190,21 +249,17 @@ class AppConfig:
     # File Cache
     def get_cached_file(self, path: str) -> Optional[Dict[str, Any]]:
         """Get cached file data if it exists"""
-        if 'file_cache' not in self.config:
-            self.config['file_cache'] = {}
-        return self.config['file_cache'].get(path)
+        return self.file_cache.get(path)
     
     def set_cached_file(self, path: str, timestamp: float, content: str):
         """Cache a file with its timestamp"""
-        if 'file_cache' not in self.config:
-            self.config['file_cache'] = {}
-        self.config['file_cache'][path] = {
-            'timestamp': timestamp,
-            'content': content
-        }
-        self.save()
+        self.file_cache.put(path, timestamp, content)
+    
+    def flush_file_cache(self):
+        """Persist cache hit times after a load"""
+        self.file_cache.flush()
     
     def clear_file_cache(self):
-        """Clear all cached files"""
-        self.config['file_cache'] = {}
-        self.save()
+        """Clear all cached files and parsed models"""
+        self.file_cache.clear()
+        self.model_cache.clear()
@@ -0,0 +1,248 @@
+"""
+File Cache
+Content-addressed on-disk store for downloaded XML files.
+Each file body is stored once as a zlib-compressed blob named by its SHA-256,
+with a small JSON index mapping path -> (mtime, size, hash).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024  # Compressed size on disk
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of text content (UTF-8)"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class FileCache:
+    """On-disk cache of remote file contents keyed by content hash"""
+
+    INDEX_NAME = 'index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / 'blobs'
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / self.INDEX_NAME
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+
+        # Loaders call into the cache from worker threads
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+        # Index entries per blob, so a blob is deleted when its last path goes
+        self._refs = Counter(entry['hash'] for entry in self._index.values())
+        # Cache hits only touch last_used in memory - flush() writes it out
+        self._dirty = False
+
+        self.evict()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the path index"""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading file cache index: {e}")
+        return {}
+
+    def _save_index(self):
+        """Write the path index (atomically, so a crash never leaves it truncated)"""
+        tmp_file = self.index_file.with_suffix('.tmp')
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_file, self.index_file)
+            self._dirty = False
+        except IOError as e:
+            print(f"Error saving file cache index: {e}")
+
+    def _blob_path(self, digest: str) -> Path:
+        """Location of the blob for a content hash"""
+        return self.blob_dir / digest[:2] / f"{digest}.xml.z"
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached file data if it exists
+        Returns: {'timestamp', 'size', 'hash', 'content'} or None
+        """
+        with self._lock:
+            entry = self._index.get(path)
+            if not entry:
+                return None
+            entry = dict(entry)
+
+        # Blobs are immutable once written, so other threads can use the cache
+        # while this one reads and decompresses
+        try:
+            with open(self._blob_path(entry['hash']), 'rb') as f:
+                content = zlib.decompress(f.read()).decode('utf-8')
+        except (IOError, zlib.error, UnicodeDecodeError):
+            # Blob missing or corrupt - drop the entry
+            with self._lock:
+                current = self._index.get(path)
+                if current and current['hash'] == entry['hash']:
+                    self._drop_locked(path)
+                    self._save_index()
+            return None
+
+        with self._lock:
+            current = self._index.get(path)
+            if current and current['hash'] == entry['hash']:
+                current['last_used'] = time.time()
+                self._dirty = True
+        return {
+            'timestamp': entry['mtime'],
+            'size': entry['size'],
+            'hash': entry['hash'],
+            'content': content
+        }
+
+    def flush(self):
+        """Write last-used times recorded by cache hits (call once per load)"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def get_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """Get index metadata (mtime, size, hash) for a path without reading the blob"""
+        with self._lock:
+            entry = self._index.get(path)
+            return dict(entry) if entry else None
+
+    def put(self, path: str, timestamp: float, content: str) -> str:
+        """
+        Cache a file with its timestamp
+        Returns: Content hash of the stored file
+        """
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            blob_path = self._blob_path(digest)
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_suffix('.tmp')
+                with open(tmp_path, 'wb') as f:
+                    f.write(zlib.compress(data, 6))
+                os.replace(tmp_path, blob_path)
+
+            old_entry = self._index.get(path)
+            self._index[path] = {
+                'mtime': timestamp,
+                'size': len(data),
+                'hash': digest,
+                'last_used': time.time()
+            }
+
+            self._refs[digest] += 1
+            if old_entry:
+                self._release_blob(old_entry['hash'])
+
+            self._evict_locked()
+            self._save_index()
+
+        return digest
+
+    def remove(self, path: str):
+        """Remove a path from the cache"""
+        with self._lock:
+            if path in self._index:
+                self._drop_locked(path)
+                self._save_index()
+
+    def clear(self):
+        """Clear all cached files"""
+        with self._lock:
+            for entry in list(self._index.values()):
+                blob_path = self._blob_path(entry['hash'])
+                if blob_path.exists():
+                    blob_path.unlink()
+            self._index = {}
+            self._refs.clear()
+            self._save_index()
+
+    def evict(self) -> int:
+        """
+        Evict entries older than the age limit, then least recently used
+        entries until the cache fits in its size budget
+        Returns: Number of entries evicted
+        """
+        with self._lock:
+            evicted = self._evict_locked()
+            if evicted:
+                self._save_index()
+            return evicted
+
+    def _evict_locked(self) -> int:
+        """Eviction pass - caller must hold the lock"""
+        evicted = 0
+        now = time.time()
+
+        # Age limit
+        if self.max_age_seconds:
+            for path, entry in list(self._index.items()):
+                if now - entry.get('last_used', 0) > self.max_age_seconds:
+                    self._drop_locked(path)
+                    evicted += 1
+
+        # Size limit - blobs are shared, so count each hash once
+        if self.max_bytes:
+            blob_sizes = {digest: self._blob_size(digest) for digest in self._refs}
+            total = sum(blob_sizes.values())
+
+            by_age = sorted(self._index.items(), key=lambda kv: kv[1].get('last_used', 0))
+            for path, entry in by_age:
+                if total <= self.max_bytes:
+                    break
+                if self._drop_locked(path):
+                    total -= blob_sizes.get(entry['hash'], 0)
+                evicted += 1
+
+        return evicted
+
+    def _blob_size(self, digest: str) -> int:
+        """Compressed size of a blob on disk"""
+        try:
+            return self._blob_path(digest).stat().st_size
+        except OSError:
+            return 0
+
+    def _drop_locked(self, path: str) -> bool:
+        """Remove an index entry - caller must hold the lock. Returns True if its blob was deleted."""
+        entry = self._index.pop(path)
+        return self._release_blob(entry['hash'])
+
+    def _release_blob(self, digest: str) -> bool:
+        """Drop one reference to a blob and delete it once unused. Returns True if deleted."""
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return False
+        del self._refs[digest]
+        blob_path = self._blob_path(digest)
+        if blob_path.exists():
+            blob_path.unlink()
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics about the cache"""
+        with self._lock:
+            hashes = list(self._refs)
+            total_size = sum(self._blob_size(digest) for digest in hashes)
+            return {
+                'files': len(self._index),
+                'blobs': len(hashes),
+                'total_size_bytes': total_size,
+                'total_size_mb': total_size / (1024 * 1024)
+            }
@@ -3,13 +3,18 @@ Local File Manager
 Handles reading/writing files from local filesystem (mirrors SFTP manager interface)
 """
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any
 import os
+import shutil
+import uuid
 
 class LocalFileManager:
     def __init__(self):
         self.connected = False
         self.mission_path = None
+        
+        # Per-session cache for case-insensitive path resolution
+        self._resolved_paths: Dict[str, Path] = {}  # relative path -> actual path on disk
     
     def connect(self, mission_path: str) -> Tuple[bool, str]:
         """
@@ -43,6 +48,7 @@ class LocalFileManager:
         """Disconnect from local folder"""
         self.connected = False
         self.mission_path = None
+        self._resolved_paths = {}
     
     def is_connected(self) -> bool:
         """Check if currently connected"""
@@ -89,6 +95,20 @@ class LocalFileManager:
         except Exception as e:
             raise IOError(f"Failed to read file {relative_path}: {str(e)}")
     
+    def open_file(self, relative_path: str):
+        """
+        Open a file in the local mission folder for streaming reads
+        (text mode, same newline handling as read_file)
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to local folder")
+        
+        full_path = self._resolve_path(relative_path)
+        try:
+            return open(full_path, 'r', encoding='utf-8')
+        except Exception as e:
+            raise IOError(f"Failed to read file {relative_path}: {str(e)}")
+    
     def write_file(self, relative_path: str, content: str):
         """
         Write a file to the local mission folder
@@ -97,43 +117,54 @@ class LocalFileManager:
             raise ConnectionError("Not connected to local folder")
         
         try:
-            if Path(relative_path).is_absolute():
-                full_path = Path(relative_path)
-            else:
-                # Start with mission path
-                full_path = Path(self.mission_path)
-                
-                # Navigate through each path component with case-insensitive matching
-                parts = relative_path.replace('\\', '/').split('/')
-                for part in parts:
-                    if not part:
-                        continue
-                    
-                    # Try to find existing directory/file with case-insensitive match
-                    matched = None
-                    if full_path.exists():
-                        for item in full_path.iterdir():
-                            if item.name.lower() == part.lower():
-                                matched = item
-                                break
-                    
-                    if matched:
-                        # Use the actual case-sensitive name
-                        full_path = matched
-                    else:
-                        # Doesn't exist yet, use the provided case
-                        full_path = full_path / part
+            full_path = self._resolve_path(relative_path)
             
             # Ensure parent directory exists
             full_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write file
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Write to a temp file in the same folder, then swap it in atomically
+            tmp_path = full_path.with_name(f".{full_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                if full_path.exists():
+                    shutil.copymode(str(full_path), str(tmp_path))
+                os.replace(str(tmp_path), str(full_path))
+            except Exception:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                raise
                 
         except Exception as e:
             raise IOError(f"Failed to write file {relative_path}: {str(e)}")
     
+    def read_many(self, relative_paths: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Read several files (mirrors SFTPManager.read_many)
+        Returns: {path: (True, content) or (False, error message)}
+        """
+        results = {}
+        for relative_path in relative_paths:
+            try:
+                results[relative_path] = (True, self.read_file(relative_path))
+            except Exception as e:
+                results[relative_path] = (False, str(e))
+        return results
+    
+    def write_many(self, files: Dict[str, str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Write several files (mirrors SFTPManager.write_many)
+        Returns: {path: (success, message)}
+        """
+        results = {}
+        for relative_path, content in files.items():
+            try:
+                self.write_file(relative_path, content)
+                results[relative_path] = (True, f"Saved {relative_path}")
+            except Exception as e:
+                results[relative_path] = (False, str(e))
+        return results
+    
     def file_exists(self, relative_path: str) -> bool:
         """Check if a file exists"""
         if not self.is_connected():
@@ -155,32 +186,95 @@ class LocalFileManager:
             return None
         
         try:
-            if Path(relative_path).is_absolute():
-                full_path = Path(relative_path)
-            else:
-                # Use case-insensitive resolution
-                full_path = Path(self.mission_path)
-                parts = relative_path.replace('\\', '/').split('/')
-                for part in parts:
-                    if not part:
-                        continue
-                    matched = None
-                    if full_path.exists():
-                        for item in full_path.iterdir():
-                            if item.name.lower() == part.lower():
-                                matched = item
-                                break
-                    if matched:
-                        full_path = matched
-                    else:
-                        full_path = full_path / part
-            
+            full_path = self._resolve_path(relative_path)
             if full_path.exists():
                 return full_path.stat().st_mtime
             return None
         except Exception:
             return None
     
+    def _resolve_path(self, relative_path: str) -> Path:
+        """
+        Resolve a path relative to the mission folder with case-insensitive
+        matching for each component. Components that don't exist keep the
+        provided case (for new files/dirs) and aren't cached.
+        """
+        if Path(relative_path).is_absolute():
+            return Path(relative_path)
+        
+        key = relative_path.replace('\\', '/').strip('/')
+        if key in self._resolved_paths:
+            return self._resolved_paths[key]
+        
+        full_path = Path(self.mission_path)
+        found = True
+        for part in key.split('/'):
+            if not part:
+                continue
+            
+            # Try to find existing directory/file with case-insensitive match
+            matched = None
+            if found and full_path.exists():
+                if (full_path / part).exists():
+                    matched = full_path / part
+                else:
+                    for item in full_path.iterdir():
+                        if item.name.lower() == part.lower():
+                            matched = item
+                            break
+            
+            if matched:
+                # Use the actual case-sensitive name
+                full_path = matched
+            else:
+                # Doesn't exist yet, use the provided case
+                full_path = full_path / part
+                found = False
+        
+        if found:
+            self._resolved_paths[key] = full_path
+        return full_path
+    
+    def stat_many(self, relative_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get metadata for many files with one directory scan per directory
+        Returns: {requested path: {'mtime', 'size', 'path'} or None if missing}
+        """
+        if not self.is_connected():
+            return {path: None for path in relative_paths}
+        
+        # Group requested files by their (resolved) parent directory
+        by_dir: Dict[Path, List[Tuple[str, str]]] = {}
+        for relative_path in relative_paths:
+            normalized = relative_path.replace('\\', '/').rstrip('/')
+            parent, _, name = normalized.rpartition('/')
+            directory = self._resolve_path(parent) if parent else Path(self.mission_path)
+            by_dir.setdefault(directory, []).append((relative_path, name))
+        
+        results = {}
+        for directory, entries in by_dir.items():
+            try:
+                with os.scandir(directory) as it:
+                    listing = {entry.name: entry for entry in it if entry.is_file()}
+            except OSError:
+                listing = {}
+            lower_names = {name.lower(): name for name in listing}
+            
+            for relative_path, name in entries:
+                actual_name = name if name in listing else lower_names.get(name.lower())
+                if actual_name is None:
+                    results[relative_path] = None
+                    continue
+                
+                stat = listing[actual_name].stat()
+                results[relative_path] = {
+                    'mtime': stat.st_mtime,
+                    'size': stat.st_size,
+                    'path': str(directory / actual_name)
+                }
+        
+        return results
+    
     def list_directory(self, relative_path: str = "") -> List[str]:
         """List files in a directory"""
         if not self.is_connected():
@@ -0,0 +1,147 @@
+"""
+Model Cache
+Stores parsed TypesFile / SpawnableTypesFile / RandomPresetsFile objects on disk
+so unchanged files can be rebuilt without parsing XML again
+"""
+import copy
+import dataclasses
+import hashlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+from models.spawnable_type import (SpawnableTypesFile, SpawnableType, CargoBlock,
+                                   AttachmentsBlock, SpawnableItem)
+from models.random_preset import RandomPresetsFile, RandomPreset, PresetItem
+
+# Bump when parsing behaviour changes in a way the schema hash can't see
+MODEL_CACHE_VERSION = 2
+
+
+def _schema_fingerprint() -> str:
+    """Hash of the model field layouts - any field change invalidates the cache"""
+    parts = [str(MODEL_CACHE_VERSION)]
+    for cls in (TypeItem, SpawnableTypesFile, SpawnableType, CargoBlock,
+                AttachmentsBlock, SpawnableItem, RandomPresetsFile, RandomPreset, PresetItem):
+        parts.append(cls.__name__ + ':' + ','.join(f.name for f in dataclasses.fields(cls)))
+    # TypesFile is a plain class - use the attributes a fresh instance has
+    parts.append('TypesFile:' + ','.join(sorted(vars(TypesFile('')).keys())))
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+SCHEMA_FINGERPRINT = _schema_fingerprint()
+
+
+class ModelCache:
+    """
+    On-disk cache of parsed models. Entries are keyed by file path, content hash
+    and limits fingerprint, and stamped with the model schema fingerprint.
+    Only the latest entry per (kind, path) is kept.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def _entry_paths(self, kind: str, path: str, digest: str, limits_fingerprint: str):
+        """Return (entry file, prefix shared by all entries for this path)"""
+        prefix = self._hash(kind, path)[:24]
+        key = self._hash(digest, limits_fingerprint)[:24]
+        return self.cache_dir / f"{prefix}-{key}.pkl", prefix
+
+    def get(self, kind: str, path: str, digest: str, limits_fingerprint: str = '') -> Optional[Any]:
+        """Load a cached model, or None if missing or stale"""
+        entry_file, _ = self._entry_paths(kind, path, digest, limits_fingerprint)
+        try:
+            with open(entry_file, 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Unreadable entry (e.g. written by an older version) - treat as miss
+            print(f"Discarding model cache entry for {path}: {e}")
+            self._unlink(entry_file)
+            return None
+
+        if payload.get('schema') != SCHEMA_FINGERPRINT:
+            self._unlink(entry_file)
+            return None
+        return payload.get('model')
+
+    def put(self, kind: str, path: str, digest: str, model: Any, limits_fingerprint: str = ''):
+        """Store a parsed model, replacing older entries for the same path"""
+        entry_file, prefix = self._entry_paths(kind, path, digest, limits_fingerprint)
+
+        # Original XML is already in the file cache - don't store it twice
+        stored = model
+        if getattr(model, 'original_content', None):
+            stored = copy.copy(model)
+            stored.original_content = None if isinstance(model, TypesFile) else ""
+            if isinstance(model, TypesFile):
+                stored.source_layout = None  # Rebuilt from the content on the first save
+
+        payload = {'schema': SCHEMA_FINGERPRINT, 'model': stored}
+
+        with self._lock:
+            for old_file in self.cache_dir.glob(f"{prefix}-*.pkl"):
+                if old_file != entry_file:
+                    self._unlink(old_file)
+
+            tmp_file = entry_file.with_suffix('.tmp')
+            try:
+                with open(tmp_file, 'wb') as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_file, entry_file)
+            except (IOError, pickle.PicklingError) as e:
+                print(f"Error writing model cache for {path}: {e}")
+                self._unlink(tmp_file)
+
+    def parse_cached(self, kind: str, path: str, content: str,
+                     parse_func: Callable[[str, str], Any], limits_fingerprint: str = '') -> Any:
+        """
+        Return the cached model for this content if there is one, otherwise
+        parse it with parse_func(content, path) and cache the result
+        """
+        digest = self._content_digest(content)
+
+        model = self.get(kind, path, digest, limits_fingerprint)
+        if model is not None:
+            if hasattr(model, 'original_content'):
+                model.original_content = content
+            return model
+
+        model = parse_func(content, path)
+        self.put(kind, path, digest, model, limits_fingerprint)
+        return model
+
+    def put_content(self, kind: str, path: str, content: str, model: Any,
+                    limits_fingerprint: str = ''):
+        """Cache a model that was parsed elsewhere (e.g. from a stream) under its content"""
+        self.put(kind, path, self._content_digest(content), model, limits_fingerprint)
+
+    @staticmethod
+    def _content_digest(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def clear(self):
+        """Remove all cached models"""
+        with self._lock:
+            for entry_file in self.cache_dir.glob('*.pkl'):
+                self._unlink(entry_file)
+
+    @staticmethod
+    def _unlink(file_path: Path):
+        try:
+            file_path.unlink()
+        except OSError:
+            pass
+
@@ -0,0 +1,96 @@
+"""
+SFTP Channel Pool
+Small pool of SFTP sessions opened over one SSH transport, so several
+transfers can be in flight at once instead of queueing on a single channel
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+import paramiko
+
+# Each channel is a separate SFTP session - a handful hides most latency
+DEFAULT_CHANNELS = 4
+
+
+class SFTPChannelPool:
+    """
+    Hands out SFTPClient channels for the duration of one transfer.
+    Channels are opened lazily up to `size` and reused; a channel that
+    fails with a connection error is discarded and reopened on demand.
+    """
+
+    def __init__(self, transport: paramiko.Transport, size: int = DEFAULT_CHANNELS):
+        self.transport = transport
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[paramiko.SFTPClient]" = queue.LifoQueue()
+        self._all: List[paramiko.SFTPClient] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def channel(self):
+        """Borrow a channel: `with pool.channel() as sftp: ...`"""
+        sftp = self._acquire()
+        broken = False
+        try:
+            yield sftp
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            # Only connection-level failures poison the channel - a missing
+            # file raises FileNotFoundError (an OSError) but leaves it usable
+            broken = not isinstance(e, (FileNotFoundError, PermissionError))
+            raise
+        finally:
+            self._release(sftp, broken)
+
+    def _acquire(self) -> paramiko.SFTPClient:
+        """Take an idle channel, open a new one, or wait for one to free up"""
+        while True:
+            if self._closed:
+                raise ConnectionError("SFTP channel pool is closed")
+
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if len(self._all) < self.size:
+                    sftp = paramiko.SFTPClient.from_transport(self.transport)
+                    if sftp is None:
+                        raise ConnectionError("Failed to open SFTP channel")
+                    self._all.append(sftp)
+                    return sftp
+
+            # Pool is full - wait, but wake up periodically in case a broken
+            # channel was dropped (freeing a slot) or the pool was closed
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def _release(self, sftp: paramiko.SFTPClient, broken: bool = False):
+        """Return a channel to the pool (or drop it if it failed)"""
+        if broken or self._closed:
+            with self._lock:
+                if sftp in self._all:
+                    self._all.remove(sftp)
+            self._close_channel(sftp)
+            return
+        self._idle.put(sftp)
+
+    def close(self):
+        """Close all channels"""
+        with self._lock:
+            self._closed = True
+            channels, self._all = self._all, []
+        for sftp in channels:
+            self._close_channel(sftp)
+
+    @staticmethod
+    def _close_channel(sftp: Optional[paramiko.SFTPClient]):
+        try:
+            sftp.close()
+        except Exception:
+            pass
@@ -3,19 +3,38 @@ SFTP Manager
 Handles SFTP connections and file operations
 """
 import paramiko
+import posixpath
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any
 import io
 
+from config.sftp_channel_pool import SFTPChannelPool, DEFAULT_CHANNELS
+
+# Below this size one plain read is a single round trip - prefetching wouldn't help
+PREFETCH_MIN_BYTES = 32 * 1024
+
 class SFTPManager:
-    def __init__(self):
+    def __init__(self, transfer_channels: int = DEFAULT_CHANNELS):
         self.client: Optional[paramiko.SSHClient] = None
-        self.sftp: Optional[paramiko.SFTPClient] = None
+        self.sftp: Optional[paramiko.SFTPClient] = None  # Metadata operations
+        # SFTPClient can't serve concurrent requests - a response read by the
+        # wrong waiting thread is dropped - so worker threads take turns on it
+        self._metadata_lock = threading.RLock()
+        self.channel_pool: Optional[SFTPChannelPool] = None  # File transfers
+        self.transfer_channels = transfer_channels
         self.connected = False
         self.host = None
         self.port = None
         self.username = None
         self.mission_path = None
+        
+        # Per-session caches for case-insensitive path resolution
+        self._dir_listings: Dict[str, Dict[str, Any]] = {}  # dir -> {filename: SFTPAttributes}
+        self._resolved_paths: Dict[str, str] = {}  # requested path -> actual path on server
     
     def connect(self, host: str, port: int, username: str, password: str, mission_path: str) -> Tuple[bool, str]:
         """
@@ -37,6 +56,7 @@ class SFTPManager:
             )
             
             self.sftp = self.client.open_sftp()
+            self.channel_pool = SFTPChannelPool(self.client.get_transport(), self.transfer_channels)
             self.connected = True
             self.host = host
             self.port = port
@@ -50,6 +70,10 @@ class SFTPManager:
                 self.disconnect()
                 return False, f"Mission path not found: {mission_path}"
             
+            # Mission path is known to exist - resolution starts below it
+            mission_root = mission_path.rstrip('/') or '/'
+            self._resolved_paths[mission_root] = mission_root
+            
             return True, f"Connected to {host}:{port}"
             
         except paramiko.AuthenticationException:
@@ -64,6 +88,10 @@ class SFTPManager:
     
     def disconnect(self):
         """Disconnect from SFTP server"""
+        if self.channel_pool:
+            self.channel_pool.close()
+            self.channel_pool = None
+        
         if self.sftp:
             try:
                 self.sftp.close()
@@ -83,6 +111,8 @@ class SFTPManager:
         self.port = None
         self.username = None
         self.mission_path = None
+        self._dir_listings = {}
+        self._resolved_paths = {}
     
     def is_connected(self) -> bool:
         """Check if currently connected"""
@@ -101,7 +131,8 @@ class SFTPManager:
         
         try:
             full_path = f"{self.mission_path}/{path}" if path else self.mission_path
-            return self.sftp.listdir(full_path)
+            with self._metadata_lock:
+                return self.sftp.listdir(full_path)
         except Exception as e:
             raise IOError(f"Failed to list directory {path}: {str(e)}")
     
@@ -125,44 +156,15 @@ class SFTPManager:
             
             # Try to read the file directly first
             try:
-                with self.sftp.open(full_path, 'r') as f:
-                    return f.read().decode('utf-8')
+                return self._read_remote(full_path)
             except FileNotFoundError:
-                # File not found - try case-insensitive search
-                # Split path into directory and filename
-                import posixpath
-                parts = remote_path.split('/')
-                
-                # Start from mission path
-                current_path = self.mission_path.rstrip('/')
-                
-                # Navigate through each directory part with case-insensitive matching
-                for i, part in enumerate(parts):
-                    if not part:
-                        continue
-                    
-                    try:
-                        # List current directory
-                        entries = self.sftp.listdir(current_path)
-                        
-                        # Find case-insensitive match
-                        matched = None
-                        for entry in entries:
-                            if entry.lower() == part.lower():
-                                matched = entry
-                                break
-                        
-                        if matched:
-                            current_path = posixpath.join(current_path, matched)
-                        else:
-                            # No match found
-                            raise FileNotFoundError(f"Path component '{part}' not found in {current_path}")
-                    except:
-                        raise
+                # File not found - try case-insensitive match
+                resolved_path = self._resolve_path_case_insensitive(full_path)
+                if resolved_path == full_path:
+                    raise
                 
                 # Try reading with corrected path
-                with self.sftp.open(current_path, 'r') as f:
-                    return f.read().decode('utf-8')
+                return self._read_remote(resolved_path)
                 
         except Exception as e:
             raise IOError(f"Failed to read file {remote_path}: {str(e)}")
@@ -188,64 +190,291 @@ class SFTPManager:
             resolved_path = self._resolve_path_case_insensitive(full_path)
             
             # Ensure parent directory exists
-            import posixpath
             parent_dir = posixpath.dirname(resolved_path)
-            try:
-                self.sftp.stat(parent_dir)
-            except FileNotFoundError:
-                # Create parent directories if they don't exist
-                self._makedirs(parent_dir)
+            with self._metadata_lock:
+                try:
+                    self.sftp.stat(parent_dir)
+                except FileNotFoundError:
+                    # Create parent directories if they don't exist
+                    self._makedirs(parent_dir)
             
             # Write file
-            with self.sftp.open(resolved_path, 'w') as f:
-                f.write(content.encode('utf-8'))
+            self._write_remote(resolved_path, content.encode('utf-8'))
+            
+            # Size and mtime changed - drop the cached listing
+            self._invalidate_directory(parent_dir)
         except Exception as e:
             raise IOError(f"Failed to write file {remote_path}: {str(e)}")
     
+    def read_many(self, remote_paths: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Read several files concurrently over the channel pool
+        Returns: {path: (True, content) or (False, error message)}
+        """
+        return self._run_many(self.read_file, remote_paths)
+    
+    def write_many(self, files: Dict[str, str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Write several files concurrently over the channel pool
+        Returns: {path: (success, message)}
+        """
+        def write(remote_path: str) -> str:
+            self.write_file(remote_path, files[remote_path])
+            return f"Saved {remote_path}"
+        
+        return self._run_many(write, list(files))
+    
+    def _run_many(self, func, paths: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """Run func(path) for each path with one worker per pool channel"""
+        if not paths:
+            return {}
+        if not self.is_connected():
+            return {path: (False, "Not connected to SFTP server") for path in paths}
+        
+        def run(path: str) -> Tuple[bool, str]:
+            try:
+                return True, func(path)
+            except Exception as e:
+                return False, str(e)
+        
+        workers = min(self.channel_pool.size, len(paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(run, paths))
+        return dict(zip(paths, outcomes))
+    
+    @contextmanager
+    def open_file(self, remote_path: str):
+        """
+        Open a file on the server for streaming binary reads on a pooled channel.
+        Read requests are pipelined, so a consumer parsing chunk by chunk
+        overlaps with the download instead of waiting for the whole file.
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to SFTP server")
+        
+        full_path = self._full_path(remote_path)
+        with self.channel_pool.channel() as sftp:
+            try:
+                try:
+                    f = self._open_remote(sftp, full_path)
+                except FileNotFoundError:
+                    # File not found - try case-insensitive match
+                    resolved_path = self._resolve_path_case_insensitive(full_path)
+                    if resolved_path == full_path:
+                        raise
+                    f = self._open_remote(sftp, resolved_path)
+            except Exception as e:
+                raise IOError(f"Failed to read file {remote_path}: {str(e)}")
+            
+            with f:
+                yield f
+    
+    def _open_remote(self, sftp: paramiko.SFTPClient, path: str) -> paramiko.SFTPFile:
+        """Open a file for reading, pipelining requests for large files"""
+        size = self._cached_size(path)
+        f = sftp.open(path, 'rb')
+        if size is None or size >= PREFETCH_MIN_BYTES:
+            # Issues all read requests up front instead of one per round trip
+            f.prefetch(size)
+        return f
+    
+    def _read_remote(self, path: str) -> str:
+        """Read a file on a pooled channel"""
+        with self.channel_pool.channel() as sftp:
+            with self._open_remote(sftp, path) as f:
+                return f.read().decode('utf-8')
+    
+    def _write_remote(self, path: str, data: bytes):
+        """
+        Write a file atomically on a pooled channel: upload to a temp file next
+        to it (pipelined, without waiting for each chunk's ack), then rename it
+        over the target so a half-written file never exists at the real path
+        """
+        parent, name = posixpath.split(path)
+        tmp_path = posixpath.join(parent, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+        
+        with self.channel_pool.channel() as sftp:
+            try:
+                with sftp.open(tmp_path, 'wb') as f:
+                    f.set_pipelined(True)
+                    f.write(data)
+                
+                # Keep the existing file's permissions
+                mode = self._existing_mode(sftp, path)
+                if mode is not None:
+                    sftp.chmod(tmp_path, mode)
+                
+                try:
+                    # OpenSSH extension - atomically replaces the target
+                    sftp.posix_rename(tmp_path, path)
+                except IOError as e:
+                    if not self._is_unsupported(e):
+                        raise
+                    self._swap_in(sftp, tmp_path, path)
+            except Exception:
+                try:
+                    sftp.remove(tmp_path)
+                except Exception:
+                    pass
+                raise
+    
+    @staticmethod
+    def _is_unsupported(error: IOError) -> bool:
+        """Whether a request failed because the server doesn't support it (SFTP_OP_UNSUPPORTED)"""
+        unsupported = paramiko.sftp.SFTP_DESC[paramiko.sftp.SFTP_OP_UNSUPPORTED]
+        return error.errno is None and error.args == (unsupported,)
+    
+    def _swap_in(self, sftp: paramiko.SFTPClient, tmp_path: str, path: str):
+        """
+        Replace a file with plain SFTP renames, which don't overwrite: move the
+        existing file aside, rename the new one in, and put the old one back if
+        that fails
+        """
+        parent, name = posixpath.split(path)
+        backup_path = posixpath.join(parent, f".{name}.{uuid.uuid4().hex[:8]}.bak")
+        try:
+            sftp.rename(path, backup_path)
+        except FileNotFoundError:
+            backup_path = None
+        
+        try:
+            sftp.rename(tmp_path, path)
+        except Exception:
+            if backup_path:
+                sftp.rename(backup_path, path)
+            raise
+        
+        if backup_path:
+            try:
+                sftp.remove(backup_path)
+            except IOError:
+                pass
+    
+    def _existing_mode(self, sftp: paramiko.SFTPClient, path: str) -> Optional[int]:
+        """Permission bits of an existing file, or None if it doesn't exist"""
+        parent, name = posixpath.split(path)
+        listing = self._dir_listings.get(parent)
+        if listing and name in listing and listing[name].st_mode is not None:
+            return listing[name].st_mode & 0o7777
+        try:
+            return sftp.stat(path).st_mode & 0o7777
+        except IOError:
+            return None
+    
+    def _cached_size(self, path: str) -> Optional[int]:
+        """File size from a cached directory listing (e.g. after stat_many), if known"""
+        parent, name = posixpath.split(path)
+        listing = self._dir_listings.get(parent)
+        if listing and name in listing:
+            return listing[name].st_size
+        return None
+    
     def _resolve_path_case_insensitive(self, path: str) -> str:
         """
         Resolve a path using case-insensitive matching for existing directories.
         Returns the path with actual casing from the server.
+        Each directory is listed at most once per session; components that don't
+        exist keep the provided case (for new files/dirs) and aren't cached.
         """
-        parts = path.split('/')
-        current = ''
+        path = posixpath.normpath(path) if path else path
+        if path in self._resolved_paths:
+            return self._resolved_paths[path]
         
-        for i, part in enumerate(parts):
-            if not part:
-                current += '/'
-                continue
-            
-            parent = current or '/'
+        parent, name = posixpath.split(path)
+        if not name or parent == path:
+            # Root or relative path base
+            return path
+        
+        resolved_parent = self._resolve_path_case_insensitive(parent) if parent else parent
+        listing = self._list_directory_cached(resolved_parent or '.')
+        
+        actual_name = self._match_name(listing, name) if listing is not None else None
+        if actual_name is None:
+            # Doesn't exist (or can't list) - use provided case
+            return posixpath.join(resolved_parent, name) if resolved_parent else name
+        
+        resolved = posixpath.join(resolved_parent, actual_name) if resolved_parent else actual_name
+        self._resolved_paths[path] = resolved
+        return resolved
+    
+    @staticmethod
+    def _match_name(listing: Dict[str, Any], name: str) -> Optional[str]:
+        """Find a name in a directory listing - exact match first, then case-insensitive"""
+        if name in listing:
+            return name
+        name_lower = name.lower()
+        for entry in listing:
+            if entry.lower() == name_lower:
+                return entry
+        return None
+    
+    def _list_directory_cached(self, directory: str) -> Optional[Dict[str, Any]]:
+        """
+        List a directory once per session with listdir_attr
+        Returns: {filename: SFTPAttributes} or None if it can't be listed
+        """
+        with self._metadata_lock:
+            if directory in self._dir_listings:
+                return self._dir_listings[directory]
             
-            # Try exact match first
-            test_path = f"{current}/{part}" if current and not current.endswith('/') else f"{current}{part}"
             try:
-                self.sftp.stat(test_path)
-                current = test_path
-                continue
-            except:
-                pass
+                listing = {attr.filename: attr for attr in self.sftp.listdir_attr(directory)}
+            except IOError:
+                return None
             
-            # Try case-insensitive match for existing items
-            try:
-                entries = self.sftp.listdir(parent)
-                matched = None
-                for entry in entries:
-                    if entry.lower() == part.lower():
-                        matched = entry
-                        break
+            self._dir_listings[directory] = listing
+            return listing
+    
+    def _invalidate_directory(self, directory: str):
+        """Forget the cached listing of a directory after it changed"""
+        self._dir_listings.pop(directory, None)
+    
+    def stat_many(self, remote_paths: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get metadata for many files with one listdir_attr call per directory
+        instead of a stat round trip per file. Listings are always fresh;
+        only the case-insensitive directory resolution is reused.
+        Returns: {requested path: {'mtime', 'size', 'path'} or None if missing}
+        """
+        if not self.is_connected():
+            return {path: None for path in remote_paths}
+        
+        # Group requested files by their (resolved) parent directory
+        by_dir: Dict[str, List[Tuple[str, str]]] = {}
+        for remote_path in remote_paths:
+            full_path = posixpath.normpath(self._full_path(remote_path))
+            parent, name = posixpath.split(full_path)
+            resolved_parent = self._resolve_path_case_insensitive(parent)
+            by_dir.setdefault(resolved_parent, []).append((remote_path, name))
+        
+        results = {}
+        for directory, entries in by_dir.items():
+            self._invalidate_directory(directory)
+            listing = self._list_directory_cached(directory)
+            
+            for remote_path, name in entries:
+                actual_name = self._match_name(listing, name) if listing is not None else None
+                attr = listing[actual_name] if actual_name is not None else None
+                if attr is None or attr.st_mtime is None:
+                    results[remote_path] = None
+                    continue
                 
-                if matched:
-                    # Use actual case from server
-                    current = f"{current}/{matched}" if current and not current.endswith('/') else f"{current}{matched}"
-                else:
-                    # Doesn't exist - use provided case for new files/dirs
-                    current = test_path
-            except:
-                # Can't list directory - use provided case
-                current = test_path
+                resolved_path = posixpath.join(directory, actual_name)
+                self._resolved_paths[posixpath.normpath(self._full_path(remote_path))] = resolved_path
+                results[remote_path] = {
+                    'mtime': float(attr.st_mtime),
+                    'size': attr.st_size,
+                    'path': resolved_path
+                }
         
-        return current
+        return results
+    
+    def _full_path(self, remote_path: str) -> str:
+        """Absolute server path for a path relative to the mission folder"""
+        if remote_path.startswith('/'):
+            return remote_path
+        mission = self.mission_path.rstrip('/')
+        return f"{mission}/{remote_path}"
     
     def _makedirs(self, path: str):
         """Recursively create directories"""
@@ -255,14 +484,16 @@ class SFTPManager:
             if not part:
                 continue
             current += '/' + part if current else part
-            try:
-                self.sftp.stat(current)
-            except FileNotFoundError:
+            with self._metadata_lock:
                 try:
-                    self.sftp.mkdir(current)
-                except OSError:
-                    # Directory might already exist, ignore
-                    pass
+                    self.sftp.stat(current)
+                except FileNotFoundError:
+                    try:
+                        self.sftp.mkdir(current)
+                        self._invalidate_directory(posixpath.dirname(current) or '/')
+                    except OSError:
+                        # Directory might already exist, ignore
+                        pass
     
     def file_exists(self, remote_path: str) -> bool:
         """Check if a file exists on the server"""
@@ -277,7 +508,8 @@ class SFTPManager:
                 mission = self.mission_path.rstrip('/')
                 full_path = f"{mission}/{remote_path}"
             
-            self.sftp.stat(full_path)
+            with self._metadata_lock:
+                self.sftp.stat(full_path)
             return True
         except FileNotFoundError:
             return False
@@ -297,7 +529,8 @@ class SFTPManager:
             
             # Resolve path case-insensitively
             resolved_path = self._resolve_path_case_insensitive(full_path)
-            stat = self.sftp.stat(resolved_path)
+            with self._metadata_lock:
+                stat = self.sftp.stat(resolved_path)
             return float(stat.st_mtime)
         except Exception:
             return None
@@ -317,7 +550,8 @@ class SFTPManager:
             
             # Ensure local directory exists
             Path(local_path).parent.mkdir(parents=True, exist_ok=True)
-            self.sftp.get(full_remote_path, local_path)
+            with self._metadata_lock:
+                self.sftp.get(full_remote_path, local_path)
         except Exception as e:
             raise IOError(f"Failed to download file {remote_path}: {str(e)}")
     
@@ -335,13 +569,13 @@ class SFTPManager:
                 full_remote_path = f"{mission}/{remote_path}"
             
             # Ensure remote directory exists
-            import posixpath
             parent_dir = posixpath.dirname(full_remote_path)
-            try:
-                self.sftp.stat(parent_dir)
-            except FileNotFoundError:
-                self._makedirs(parent_dir)
-            
-            self.sftp.put(local_path, full_remote_path)
+            with self._metadata_lock:
+                try:
+                    self.sftp.stat(parent_dir)
+                except FileNotFoundError:
+                    self._makedirs(parent_dir)
+                
+                self.sftp.put(local_path, full_remote_path)
         except Exception as e:
             raise IOError(f"Failed to upload file {remote_path}: {str(e)}")
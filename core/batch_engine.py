@@ -0,0 +1,305 @@
+"""
+Batch Engine
+Compiles the batch operations chosen in BatchOperationsDialog into a plan
+and evaluates it column by column over the selected items. The result is a
+BatchDiff holding only the values that actually change, used for the
+preview table (rows are materialized on demand), for applying the edit and
+for reverting it, plus statistics over the whole selection.
+"""
+import operator
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import compress, count
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional - the pure Python path gives the same results
+    np = None
+
+from models.type_item import TypeItem, NUMERIC_FIELDS, FLAG_FIELDS
+
+LIST_FIELDS = ('usage', 'value', 'tag')
+
+MULTIPLY = 'multiply'
+SET = 'set'
+
+
+@dataclass
+class FieldChange:
+    """New values of one field, for the items (diff positions) where it changes"""
+    positions: List[int]
+    old: list
+    new: list
+
+
+@dataclass
+class BatchStatistics:
+    """Totals over the whole selection, before and after the batch edit"""
+    items: int = 0  # Selected items
+    changed_items: int = 0
+    change_count: int = 0  # Changed (item, field) values
+    nominal_before: int = 0
+    nominal_after: int = 0
+    min_before: int = 0
+    min_after: int = 0
+    clamped_min: int = 0  # Items whose new min was capped at their nominal
+    # Change of the nominal total per category (by the category after the edit)
+    category_nominal_delta: Dict[Optional[str], int] = field(default_factory=dict)
+
+
+class BatchDiff:
+    """
+    Changes of a batch plan over an item list. Per field, only the positions
+    whose value changes are kept, so unchanged items and fields cost nothing.
+    Rows for a preview are assembled on request (row()), not up front.
+    """
+
+    def __init__(self, items: Sequence[TypeItem], changes: Dict[str, FieldChange],
+                 statistics: Optional[BatchStatistics] = None):
+        self.items = items
+        self.changes = changes
+        touched = set()
+        for change in changes.values():
+            touched.update(change.positions)
+        self._positions = sorted(touched)
+        self._old_modified: List[bool] = []
+        self.statistics = statistics or BatchStatistics(items=len(items))
+        self.statistics.changed_items = len(self._positions)
+        self.statistics.change_count = self.change_count
+
+    def __len__(self) -> int:
+        """Number of items that change"""
+        return len(self._positions)
+
+    @property
+    def change_count(self) -> int:
+        """Number of changed (item, field) values"""
+        return sum(len(change.positions) for change in self.changes.values())
+
+    @property
+    def changed_items(self) -> List[TypeItem]:
+        """Items that change, in item list order"""
+        return [self.items[position] for position in self._positions]
+
+    def row(self, index: int) -> Tuple[TypeItem, Dict[str, Tuple]]:
+        """(item, {field: (old, new)}) of the index-th changed item"""
+        position = self._positions[index]
+        changes = {}
+        for field_name, change in self.changes.items():
+            i = bisect_left(change.positions, position)
+            if i < len(change.positions) and change.positions[i] == position:
+                changes[field_name] = (change.old[i], change.new[i])
+        return self.items[position], changes
+
+    def rows(self, limit: Optional[int] = None) -> List[Tuple[TypeItem, Dict[str, Tuple]]]:
+        """row() for the first limit changed items (all if limit is None)"""
+        end = len(self) if limit is None else min(limit, len(self))
+        return [self.row(index) for index in range(end)]
+
+    def apply(self) -> List[TypeItem]:
+        """Write the new values and mark the changed items modified"""
+        changed = self.changed_items
+        self._old_modified = [item.modified for item in changed]
+        self._write('new')
+        for item in changed:
+            item.modified = True
+        return changed
+
+    def revert(self) -> List[TypeItem]:
+        """Write the old values back, restoring the modified flags"""
+        self._write('old')
+        changed = self.changed_items
+        for item, modified in zip(changed, self._old_modified):
+            item.modified = modified
+        return changed
+
+    def _write(self, side: str):
+        """Set one side of every field change on the items"""
+        items = self.items
+        for field_name, change in self.changes.items():
+            values = getattr(change, side)
+            copy_lists = field_name in LIST_FIELDS
+            for position, value in zip(change.positions, values):
+                setattr(items[position], field_name, list(value) if copy_lists else value)
+
+
+@dataclass
+class BatchPlan:
+    """
+    Operations to apply to every selected item: numeric fields are multiplied
+    (truncated to int) or set, flags set to 0/1, the category set or cleared,
+    and usage/value/tag entries added or removed. A changed min is capped at
+    the item's (new) nominal.
+    """
+    numeric: Dict[str, Tuple[str, float]] = field(default_factory=dict)  # field -> (MULTIPLY/SET, value)
+    flags: Dict[str, int] = field(default_factory=dict)
+    set_category: bool = False
+    category: Optional[str] = None  # None clears the category
+    add: Dict[str, List[str]] = field(default_factory=dict)  # list field -> entries to add
+    remove: Dict[str, List[str]] = field(default_factory=dict)  # list field -> entries to remove
+
+    def is_empty(self) -> bool:
+        """Whether the plan has no operations"""
+        return not (self.numeric or self.flags or self.set_category or
+                    any(self.add.values()) or any(self.remove.values()))
+
+    def diff(self, items: Sequence[TypeItem]) -> BatchDiff:
+        """Evaluate the plan over the items (nothing is modified)"""
+        changes: Dict[str, FieldChange] = {}
+        columns: Dict[str, object] = {}
+
+        for field_name in NUMERIC_FIELDS:
+            if field_name in self.numeric:
+                mode, value = self.numeric[field_name]
+                old, new = _numeric_column(items, field_name, mode, value)
+                columns[field_name] = (old, new)
+
+        old_nominal = columns['nominal'][0] if 'nominal' in columns else _gather(items, 'nominal')
+        new_nominal = columns['nominal'][1] if 'nominal' in columns else old_nominal
+        clamped = 0
+        if 'min' in columns:
+            # min must not exceed the nominal the item ends up with
+            old_min, new_min = columns['min']
+            clamped = _count_greater(new_min, new_nominal)
+            columns['min'] = (old_min, _minimum(new_min, new_nominal))
+        else:
+            old_min = new_min = _gather(items, 'min')
+
+        for field_name, flag_value in self.flags.items():
+            columns[field_name] = _numeric_column(items, field_name, SET, flag_value)
+
+        for field_name, (old, new) in columns.items():
+            change = _field_change(old, new)
+            if change is not None:
+                changes[field_name] = change
+
+        old_categories = list(map(operator.attrgetter('category'), items))
+        new_categories = old_categories
+        if self.set_category:
+            new_categories = [self.category] * len(items)
+            positions = list(compress(range(len(items)), map(operator.ne, old_categories, new_categories)))
+            if positions:
+                changes['category'] = FieldChange(
+                    positions, [old_categories[p] for p in positions], [self.category] * len(positions))
+
+        for field_name in LIST_FIELDS:
+            change = self._list_change(items, field_name)
+            if change is not None:
+                changes[field_name] = change
+
+        statistics = BatchStatistics(
+            items=len(items),
+            nominal_before=_total(old_nominal),
+            nominal_after=_total(new_nominal),
+            min_before=_total(old_min),
+            min_after=_total(columns['min'][1]) if 'min' in columns else _total(new_min),
+            clamped_min=clamped,
+        )
+        delta = _group_totals(new_categories, new_nominal)
+        for category, total in _group_totals(old_categories, old_nominal).items():
+            delta[category] = delta.get(category, 0) - total
+        statistics.category_nominal_delta = {category: change for category, change in delta.items() if change}
+        return BatchDiff(items, changes, statistics)
+
+    def _list_change(self, items: Sequence[TypeItem], field_name: str) -> Optional[FieldChange]:
+        """Add/remove entries of a list field; unchanged if the entry set stays the same"""
+        add = [entry for entry in self.add.get(field_name, ()) if entry]
+        remove = set(self.remove.get(field_name, ()))
+        if not add and not remove:
+            return None
+        add_set = set(add)
+
+        positions, old_lists, new_lists = [], [], []
+        for position, item in enumerate(items):
+            old = getattr(item, field_name)
+            present = set(old)
+            if add_set <= present and not (remove & present):
+                continue
+            new = list(old)
+            for entry in remove:
+                if entry in new:
+                    new.remove(entry)  # One occurrence, like toggling it off per item
+            for entry in add:
+                if entry not in new:
+                    new.append(entry)
+            if sorted(new) != sorted(old):
+                positions.append(position)
+                old_lists.append(list(old))
+                new_lists.append(new)
+        if not positions:
+            return None
+        return FieldChange(positions, old_lists, new_lists)
+
+
+# ---- Column helpers ------------------------------------------------------
+
+def _gather(items: Sequence[TypeItem], field_name: str):
+    """One field of all items as a packed column"""
+    column = array('q', map(operator.attrgetter(field_name), items))
+    if np is not None:
+        return np.frombuffer(column, dtype=np.int64) if column else np.zeros(0, dtype=np.int64)
+    return column
+
+
+def _numeric_column(items: Sequence[TypeItem], field_name: str, mode: str, value):
+    """(old, new) columns of a numeric field"""
+    old = _gather(items, field_name)
+    if mode == MULTIPLY:
+        if np is not None:
+            new = (old * float(value)).astype(np.int64)  # Truncates toward zero like int()
+        else:
+            factor = float(value)
+            new = [int(v * factor) for v in old]
+    elif mode == SET:
+        new = np.full(len(old), int(value), dtype=np.int64) if np is not None else [int(value)] * len(old)
+    else:
+        raise ValueError(f"Unknown batch mode: {mode}")
+    return old, new
+
+
+def _minimum(values, limits):
+    """Element-wise minimum of two columns"""
+    if np is not None:
+        return np.minimum(values, limits)
+    return list(map(min, values, limits))
+
+
+def _total(values) -> int:
+    """Sum of a column"""
+    return int(values.sum()) if np is not None else sum(values)
+
+
+def _count_greater(values, limits) -> int:
+    """Number of positions where values exceed limits"""
+    if np is not None:
+        return int(np.count_nonzero(values > limits))
+    return sum(map(operator.gt, values, limits))
+
+
+def _group_totals(keys: Sequence, values) -> Dict:
+    """Sum of values per key"""
+    if np is not None:
+        codes = {}
+        # setdefault hands each new key the running counter value - sparse but unique codes
+        key_codes = np.fromiter(map(codes.setdefault, keys, count()), dtype=np.int64, count=len(keys))
+        sums = np.bincount(key_codes, weights=values, minlength=1)
+        return {key: int(round(sums[code])) for key, code in codes.items()}
+    totals = {}
+    for key, value in zip(keys, values):
+        totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _field_change(old, new) -> Optional[FieldChange]:
+    """Positions where two columns differ, with their values"""
+    if np is not None:
+        positions = np.flatnonzero(old != new)
+        if not len(positions):
+            return None
+        return FieldChange(positions.tolist(), old[positions].tolist(), new[positions].tolist())
+    positions = list(compress(range(len(old)), map(operator.ne, old, new)))
+    if not positions:
+        return None
+    return FieldChange(positions, [old[p] for p in positions], [new[p] for p in positions])
@@ -0,0 +1,175 @@
+"""
+Economy Session
+The types.xml workflow of the editor without the GUI: load a mission's
+types files through a file manager (SFTP or local), select items with a
+FilterQuery, apply a BatchPlan, validate and save with backups.
+Used by the dayz-types command line tool - nothing here imports PyQt5.
+"""
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from core.economy_parser import EconomyParser
+from core.limits_parser import LimitsParser
+from core.parallel_loader import ParallelLoader, DEFAULT_MAX_WORKERS
+from core.tracing import tracer
+from core.types_writer import TypesWriter
+from core.xml_parser import TypesParser
+from models.item_registry import ItemRegistry
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+if TYPE_CHECKING:  # Imported on use - keeps the command line start fast
+    from core.batch_engine import BatchDiff, BatchPlan
+
+# Loaded by the game even when cfgeconomycore.xml doesn't list it
+VANILLA_TYPES = 'db/types.xml'
+
+
+class EconomySession:
+    """Types files of one mission, loaded through a connected file manager"""
+
+    def __init__(self, file_manager, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            file_manager: Connected SFTPManager or LocalFileManager
+            max_workers: Files fetched and parsed concurrently
+        """
+        self.file_manager = file_manager
+        self.max_workers = max_workers
+        self.limits_parser = LimitsParser()
+        self.types_files: List[TypesFile] = []
+        self.item_registry = ItemRegistry()
+        self._filter_engine = None
+
+    def load(self) -> List[str]:
+        """
+        Load limits definitions and every types file of the mission
+        Returns: Errors of files that could not be loaded (empty if all loaded)
+        """
+        errors = []
+        for path, parse in (('cfglimitsdefinition.xml', self.limits_parser.parse),
+                            ('cfglimitsdefinitionuser.xml', self.limits_parser.parse_user_definitions)):
+            try:
+                with tracer.span('io.read', path=path):
+                    xml_content = self.file_manager.read_file(path)
+                with tracer.span('parse.limits', path=path):
+                    parse(xml_content)
+            except Exception as e:
+                errors.append(f"{path}: {e}")
+
+        with tracer.span('io.read', path='cfgeconomycore.xml'):
+            economy_xml = self.file_manager.read_file('cfgeconomycore.xml')
+        types_file_paths, _ = EconomyParser.parse_all(economy_xml)
+        if VANILLA_TYPES not in types_file_paths and self.file_manager.file_exists(VANILLA_TYPES):
+            types_file_paths.insert(0, VANILLA_TYPES)
+
+        loader = ParallelLoader(
+            self.file_manager,
+            lambda content, path: TypesParser.parse(content, path, self.limits_parser),
+            max_workers=self.max_workers
+        )
+        self.types_files = []
+        for result in loader.load(types_file_paths):
+            if result.success:
+                self.types_files.append(result.parsed)
+            else:
+                errors.append(f"{result.path}: {result.error}")
+
+        self.item_registry.rebuild(self.types_files)
+        self._filter_engine = None
+        return errors
+
+    @property
+    def items(self) -> List[TypeItem]:
+        """All items of all loaded files, in file order"""
+        return [item for types_file in self.types_files for item in types_file.items]
+
+    @property
+    def filter_engine(self):
+        """Filter index over the loaded items (built on first use)"""
+        if self._filter_engine is None:
+            from core.filter_engine import FilterEngine  # Only needed when filtering
+            self._filter_engine = FilterEngine(self.types_files)
+        return self._filter_engine
+
+    def select(self, query=None) -> List[TypeItem]:
+        """Items matching a FilterQuery (all items if query is None or empty)"""
+        if query is None or not query.active_filter_count():
+            return self.items
+        return self.filter_engine.query(query)
+
+    def apply(self, plan: 'BatchPlan', items: List[TypeItem]) -> 'BatchDiff':
+        """Apply a batch plan to items, marking the changed ones modified"""
+        diff = plan.diff(items)
+        diff.apply()
+        if self._filter_engine is not None:
+            self._filter_engine.update_items(diff.changed_items)
+        return diff
+
+    def validate(self, items: Optional[List[TypeItem]] = None) -> List[str]:
+        """
+        Check items (default: all) against the loaded limits definitions
+        Returns: Error messages (empty if all items are valid)
+        """
+        if items is None:
+            items = self.items
+        categories = self.limits_parser.get_categories()
+        usages = self.limits_parser.get_usages()
+        values = self.limits_parser.get_values()
+        tags = self.limits_parser.get_tags()
+        errors = []
+        for item in items:
+            _, item_errors = TypesParser.validate_item_structure(item, categories, usages, values, tags)
+            errors.extend(item_errors)
+        return errors
+
+    def save(self, backup_manager=None, dry_run: bool = False) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Write all types files with modified items, backing up the originals first
+        Args:
+            backup_manager: BackupManager for the originals (None: no backups)
+            dry_run: Only report which files would change
+        Returns: (saved or would-be-saved paths, {path: error})
+        """
+        pending = {}
+        for types_file in self.types_files:
+            if not types_file.has_modifications():
+                continue
+            xml_content = TypesWriter.write(types_file, self.limits_parser)
+            if xml_content == types_file.original_content:
+                self._clear_modified(types_file)
+            else:
+                pending[types_file.path] = (types_file, xml_content)
+
+        if dry_run or not pending:
+            return list(pending), {}
+
+        errors = {}
+        if backup_manager is not None:
+            for path, (types_file, _) in list(pending.items()):
+                if types_file.original_content:
+                    try:
+                        with tracer.span('save.backup', path=path):
+                            backup_manager.create_backup(path, types_file.original_content)
+                    except Exception as e:
+                        # Never overwrite a file whose original couldn't be backed up
+                        errors[path] = f"Backup failed: {e}"
+                        del pending[path]
+
+        saved = []
+        with tracer.span('save.write', files=len(pending)):
+            results = self.file_manager.write_many({path: xml for path, (_, xml) in pending.items()})
+        for path, (success, message) in results.items():
+            if not success:
+                errors[path] = message
+                continue
+            types_file, xml_content = pending[path]
+            types_file.original_content = xml_content
+            self._clear_modified(types_file)
+            saved.append(path)
+        return saved, errors
+
+    def _clear_modified(self, types_file: TypesFile):
+        """Mark a file's items as saved"""
+        for item in types_file.items:
+            item.modified = False
+        if self._filter_engine is not None:
+            self._filter_engine.update_items(types_file.items)
@@ -0,0 +1,360 @@
+"""
+Filter Engine
+Inverted-index item filtering for the types editor.
+Every indexed attribute value maps to a bitset (Python int, bit i = item i),
+so filters are answered with set algebra instead of scanning every item.
+"""
+import operator
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.item_store import ItemStore
+from core.tracing import traced
+from models.name_index import NameIndex
+from models.type_item import TypeItem, FLAG_FIELDS
+from models.types_file import TypesFile
+
+_get_flags = operator.attrgetter(*FLAG_FIELDS)
+
+# Block size of the cumulative nominal bitsets (see _nominal_mask)
+NOMINAL_BLOCK = 256
+
+# Use trigram postings for name search only if they narrow the names to at
+# most 1/SEARCH_SELECTIVITY - for common text the linear scan in C is faster
+SEARCH_SELECTIVITY = 16
+
+# Convert between bin() digits and 0/1 bytes (for itertools.compress / int(..., 2))
+_BIN_TO_FLAGS = bytes.maketrans(b'01', b'\x00\x01')
+_FLAGS_TO_BIN = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def _set_bits(buffer: bytearray, item_ids: Iterable[int]):
+    """Set bits in a little-endian byte buffer"""
+    for item_id in item_ids:
+        buffer[item_id >> 3] |= 1 << (item_id & 7)
+
+
+def _mask_from_ids(item_ids: Iterable[int], size: int) -> int:
+    """
+    Build a bitset from item ids. OR-ing bits into an int one by one copies
+    the whole int each time; filling a byte buffer and converting once is linear.
+    """
+    buffer = bytearray((size + 7) // 8)
+    _set_bits(buffer, item_ids)
+    return int.from_bytes(buffer, 'little')
+
+
+@dataclass
+class FilterQuery:
+    """Filter settings from the types editor (empty fields are not applied)"""
+    search_text: str = ""
+    category: str = ""
+    tags: List[str] = field(default_factory=list)
+    usage: List[str] = field(default_factory=list)
+    value: List[str] = field(default_factory=list)
+    source_file: str = ""
+    nominal_min: Optional[int] = None
+    nominal_max: Optional[int] = None
+    flags: Dict[str, int] = field(default_factory=dict)  # Always ANDed
+    use_or_logic: bool = False
+
+    def active_filter_count(self) -> int:
+        """Number of active filters (nominal range counts once, each flag counts)"""
+        count = sum(1 for active in (self.search_text, self.category, self.tags, self.usage,
+                                     self.value, self.source_file) if active)
+        if self.nominal_min is not None or self.nominal_max is not None:
+            count += 1
+        return count + len(self.flags)
+
+
+class FilterEngine:
+    """
+    Keeps inverted indexes over all items of the loaded types files:
+    category, usage, value, tag, source file and each flag -> bitset, plus a
+    sorted nominal index for range queries. Matches TypeItem.matches_filter
+    semantics: within a list filter any selected entry matches, criteria are
+    combined with AND or OR, flags always AND.
+
+    Name search uses the shared NameIndex (trigram postings) when one is given
+    and the search text is long enough to narrow by, else scans all names.
+
+    store is a columnar ItemStore over the same items with the same row
+    numbers, so query masks can be aggregated without materializing items.
+    """
+
+    def __init__(self, types_files: Optional[Iterable[TypesFile]] = None,
+                 name_index: Optional[NameIndex] = None):
+        self.rebuild(types_files or [], name_index)
+
+    @traced('filter.index')
+    def rebuild(self, types_files: Iterable[TypesFile], name_index: Optional[NameIndex] = None):
+        """Index all items of the given files (item order = file order)"""
+        self.name_index = name_index
+        self._renamed = False  # An item was renamed after the name index was built
+        self._items: List[TypeItem] = []
+        self._ids: Dict[int, int] = {}  # id(item) -> bit position
+        self._keys: List[Optional[Tuple]] = []  # Indexed values per item, for updates
+        self._nominals: List[int] = []  # Nominal / name each item was indexed with
+        self._names: List[str] = []
+        self._all = 0
+
+        self._postings: Dict[str, Dict[object, int]] = {
+            'category': {}, 'usage': {}, 'value': {}, 'tag': {}, 'source_file': {}, 'flag': {}
+        }
+
+        for types_file in types_files:
+            for item in types_file.items:
+                self._ids[id(item)] = len(self._items)
+                self._items.append(item)
+                self._nominals.append(item.nominal)
+                self._names.append(item.name)
+                self._keys.append(self._index_key(item))
+        self._build_postings()
+        self.store = ItemStore(self._items)
+
+        self._nominal_dirty = True
+        self._names_dirty = True
+        self._search_cache: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return bin(self._all).count('1')
+
+    # ---- Index maintenance -------------------------------------------------
+
+    def _build_postings(self):
+        """Bulk-build all postings from the recorded index keys"""
+        ids: Dict[str, Dict[object, List[int]]] = {name: {} for name in self._postings}
+        for item_id, key in enumerate(self._keys):
+            category, usage, value, tag, source_file, flags = key
+            ids['category'].setdefault(category, []).append(item_id)
+            for name, values in (('usage', usage), ('value', value), ('tag', tag)):
+                index = ids[name]
+                for entry in set(values):
+                    index.setdefault(entry, []).append(item_id)
+            ids['source_file'].setdefault(source_file, []).append(item_id)
+            for flag, flag_value in zip(FLAG_FIELDS, flags):
+                if flag_value == 1:
+                    ids['flag'].setdefault(flag, []).append(item_id)
+
+        size = len(self._items)
+        for name, index in ids.items():
+            self._postings[name] = {entry: _mask_from_ids(item_ids, size)
+                                    for entry, item_ids in index.items()}
+        self._all = (1 << size) - 1
+
+    @staticmethod
+    def _index_key(item: TypeItem) -> Tuple:
+        """Values of an item that the postings depend on"""
+        return (item.category, tuple(item.usage), tuple(item.value), tuple(item.tag),
+                item.source_file, _get_flags(item))
+
+    def _index(self, item_id: int, item: TypeItem):
+        """Set the item's bit in every posting it belongs to"""
+        key = self._index_key(item)
+        self._keys[item_id] = key
+        bit = 1 << item_id
+        category, usage, value, tag, source_file, flags = key
+
+        postings = self._postings
+        postings['category'][category] = postings['category'].get(category, 0) | bit
+        for name, values in (('usage', usage), ('value', value), ('tag', tag)):
+            index = postings[name]
+            for entry in set(values):
+                index[entry] = index.get(entry, 0) | bit
+        postings['source_file'][source_file] = postings['source_file'].get(source_file, 0) | bit
+        for flag, flag_value in zip(FLAG_FIELDS, flags):
+            if flag_value == 1:
+                postings['flag'][flag] = postings['flag'].get(flag, 0) | bit
+
+    def _unindex(self, item_id: int):
+        """Clear the item's bit from the postings recorded for it"""
+        key = self._keys[item_id]
+        if key is None:
+            return
+        self._keys[item_id] = None
+        clear = ~(1 << item_id)
+        category, usage, value, tag, source_file, flags = key
+
+        def drop(index: Dict[object, int], entry):
+            remaining = index.get(entry, 0) & clear
+            if remaining:
+                index[entry] = remaining
+            else:
+                index.pop(entry, None)
+
+        postings = self._postings
+        drop(postings['category'], category)
+        for name, values in (('usage', usage), ('value', value), ('tag', tag)):
+            for entry in set(values):
+                drop(postings[name], entry)
+        drop(postings['source_file'], source_file)
+        for flag, flag_value in zip(FLAG_FIELDS, flags):
+            if flag_value == 1:
+                drop(postings['flag'], flag)
+
+    def update_item(self, item: TypeItem):
+        """Re-index an item after it was edited"""
+        item_id = self._ids.get(id(item))
+        if item_id is None:
+            return
+        self.store.update_item(item)
+        if self._index_key(item) != self._keys[item_id]:
+            self._unindex(item_id)
+            self._index(item_id, item)
+
+        # Sorted nominal and name indexes are rebuilt lazily by the next query needing them
+        if item.nominal != self._nominals[item_id]:
+            self._nominals[item_id] = item.nominal
+            self._nominal_dirty = True
+        if item.name != self._names[item_id]:
+            self._names[item_id] = item.name
+            self._names_dirty = True
+            self._renamed = True
+
+    def update_items(self, items: Iterable[TypeItem]):
+        """Re-index several edited items"""
+        for item in items:
+            self.update_item(item)
+
+    # ---- Lazily built indexes ----------------------------------------------
+
+    def _build_nominal_index(self):
+        """Sort item ids by nominal and precompute cumulative bitsets per block"""
+        live = sorted(zip(self._nominals, range(len(self._nominals))))
+        self._nominal_values = [nominal for nominal, _ in live]
+        self._nominal_ids = [item_id for _, item_id in live]
+
+        # _nominal_prefix[b] = bits of the first b * NOMINAL_BLOCK sorted entries
+        prefix = [0]
+        buffer = bytearray((len(self._items) + 7) // 8)
+        for start in range(0, len(live), NOMINAL_BLOCK):
+            _set_bits(buffer, self._nominal_ids[start:start + NOMINAL_BLOCK])
+            prefix.append(int.from_bytes(buffer, 'little'))
+        self._nominal_prefix = prefix
+        self._nominal_dirty = False
+
+    def _build_name_index(self):
+        """Lower-case names for case-insensitive search"""
+        self._lower_names = [name.lower() for name in self._names]
+        self._ids_by_lower: Dict[str, List[int]] = {}
+        for item_id, lower in enumerate(self._lower_names):
+            self._ids_by_lower.setdefault(lower, []).append(item_id)
+        self._search_cache = {}
+        self._names_dirty = False
+
+    # ---- Queries -----------------------------------------------------------
+
+    def _prefix_range(self, start: int, end: int) -> int:
+        """Bits of sorted nominal entries [start, end)"""
+        block_start = -(-start // NOMINAL_BLOCK)  # First whole block
+        block_end = end // NOMINAL_BLOCK  # Blocks fully below end
+        ids = self._nominal_ids
+
+        size = len(self._items)
+        if block_start >= block_end:
+            return _mask_from_ids(ids[start:end], size)
+
+        prefix = self._nominal_prefix
+        mask = prefix[block_end] & ~prefix[block_start]
+        edges = ids[start:block_start * NOMINAL_BLOCK] + ids[block_end * NOMINAL_BLOCK:end]
+        return mask | _mask_from_ids(edges, size)
+
+    def _nominal_mask(self, nominal_min: Optional[int], nominal_max: Optional[int]) -> int:
+        """Items with nominal_min <= nominal <= nominal_max"""
+        if self._nominal_dirty:
+            self._build_nominal_index()
+        values = self._nominal_values
+        start = bisect_left(values, nominal_min) if nominal_min is not None else 0
+        end = bisect_right(values, nominal_max) if nominal_max is not None else len(values)
+        if start >= end:
+            return 0
+        return self._prefix_range(start, end)
+
+    def _search_mask(self, search_text: str) -> int:
+        """Items whose name contains search_text (case-insensitive)"""
+        if self._names_dirty:
+            self._build_name_index()
+        needle = search_text.lower()
+        if needle in self._search_cache:
+            return self._search_cache[needle]
+
+        name_index = self.name_index
+        if (name_index is not None and not self._renamed and len(needle) >= 3
+                and name_index.substring_estimate(needle) * SEARCH_SELECTIVITY <= len(self._items)):
+            # Candidates from the trigram postings, mapped back to item bits
+            ids_by_lower = self._ids_by_lower
+            item_ids = [item_id for lower in name_index.substring_lower(needle)
+                        for item_id in ids_by_lower.get(lower, ())]
+            mask = _mask_from_ids(item_ids, len(self._items))
+        else:
+            # Test every name in C and pack the 0/1 results straight into a bitset
+            flags = bytes(map(operator.contains, self._lower_names, repeat(needle)))
+            mask = int(flags[::-1].translate(_FLAGS_TO_BIN), 2) if flags else 0
+        mask &= self._all
+
+        if len(self._search_cache) > 32:
+            self._search_cache.clear()
+        self._search_cache[needle] = mask
+        return mask
+
+    def _any_of(self, index_name: str, entries: List) -> int:
+        """Items having at least one of the entries"""
+        index = self._postings[index_name]
+        mask = 0
+        for entry in entries:
+            mask |= index.get(entry, 0)
+        return mask
+
+    @traced('filter.query')
+    def query_mask(self, query: FilterQuery) -> int:
+        """Bitset of items matching the query"""
+        criteria = []
+        if query.search_text:
+            criteria.append(self._search_mask(query.search_text))
+        if query.category:
+            criteria.append(self._postings['category'].get(query.category, 0))
+        if query.tags:
+            criteria.append(self._any_of('tag', query.tags))
+        if query.usage:
+            criteria.append(self._any_of('usage', query.usage))
+        if query.value:
+            criteria.append(self._any_of('value', query.value))
+        if query.source_file:
+            criteria.append(self._postings['source_file'].get(query.source_file, 0))
+        # Min and max are separate criteria (matters for OR logic)
+        if query.nominal_min is not None:
+            criteria.append(self._nominal_mask(query.nominal_min, None))
+        if query.nominal_max is not None:
+            criteria.append(self._nominal_mask(None, query.nominal_max))
+
+        if not criteria:
+            mask = self._all
+        elif query.use_or_logic:
+            mask = 0
+            for criterion in criteria:
+                mask |= criterion
+        else:
+            mask = self._all
+            for criterion in criteria:
+                mask &= criterion
+                if not mask:
+                    break
+
+        for flag, flag_value in query.flags.items():
+            flag_mask = self._postings['flag'].get(flag, 0)
+            mask &= flag_mask if flag_value == 1 else self._all & ~flag_mask
+
+        return mask
+
+    def query(self, query: FilterQuery) -> List[TypeItem]:
+        """Items matching the query, in file order"""
+        return self.items_for_mask(self.query_mask(query))
+
+    def items_for_mask(self, mask: int) -> List[TypeItem]:
+        """Materialize a bitset into the list of items it selects"""
+        if not mask:
+            return []
+        selectors = bin(mask)[:1:-1].encode('ascii').translate(_BIN_TO_FLAGS)
+        return list(compress(self._items, selectors))
@@ -0,0 +1,273 @@
+"""
+Item Store
+Columnar view of the loaded type items: one packed column per numeric field
+and flag, so economy-wide totals and group-bys run over machine integers
+instead of visiting every TypeItem. Columns are array.array; when NumPy is
+installed the aggregates run on zero-copy NumPy views of the same buffers.
+"""
+import operator
+from array import array
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional - the pure Python path gives the same results
+    np = None
+
+from models.type_item import TypeItem, NUMERIC_FIELDS, FLAG_FIELDS
+
+COLUMNS = NUMERIC_FIELDS + FLAG_FIELDS
+
+# Keys for group_by: single-valued keys have one code per row, list keys any number
+SINGLE_KEYS = ('category', 'source_file')
+LIST_KEYS = ('usage', 'value', 'tag')
+GROUP_KEYS = SINGLE_KEYS + LIST_KEYS
+
+_get_columns = operator.attrgetter(*COLUMNS)
+
+# 64-bit columns: nominals go up to 99 million and totals must not overflow
+_TYPECODE = 'q'
+_BIN_TO_FLAGS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def _np_view(buffer, dtype):
+    """Zero-copy NumPy view of a buffer (older NumPy rejects empty buffers)"""
+    return np.frombuffer(buffer, dtype=dtype) if len(buffer) else np.zeros(0, dtype=dtype)
+
+
+class ItemStore:
+    """
+    Packed numeric columns for a list of items, row i = item i.
+    Row numbers match the FilterEngine bit positions, so a filter bitset
+    selects rows directly. Edited items must be passed to update_item
+    (the FilterEngine does this for the items it indexes).
+    """
+
+    def __init__(self, items: Optional[Iterable[TypeItem]] = None):
+        self.rebuild(items or [])
+
+    def rebuild(self, items: Iterable[TypeItem]):
+        """Load all columns from the items (row order = iteration order)"""
+        self._items: List[TypeItem] = list(items)
+        self._rows: Dict[int, int] = {id(item): row for row, item in enumerate(self._items)}
+
+        values = [_get_columns(item) for item in self._items]
+        self._columns: Dict[str, array] = {
+            name: array(_TYPECODE, [row[i] for row in values]) for i, name in enumerate(COLUMNS)
+        }
+
+        # Categorical columns: per-key vocabulary, codes per row
+        self._vocab: Dict[str, List] = {key: [] for key in GROUP_KEYS}
+        self._vocab_codes: Dict[str, Dict[object, int]] = {key: {} for key in GROUP_KEYS}
+        self._codes: Dict[str, array] = {
+            key: array(_TYPECODE, [self._code(key, getattr(item, key)) for item in self._items])
+            for key in SINGLE_KEYS
+        }
+        self._list_codes: Dict[str, List[Tuple[int, ...]]] = {
+            key: [tuple(self._code(key, entry) for entry in getattr(item, key)) for item in self._items]
+            for key in LIST_KEYS
+        }
+        self._pairs: Dict[str, Tuple[array, array]] = {}  # Lazily flattened list keys
+
+        # Modified flags with running totals, overall and per source file
+        self._modified = bytearray(1 if item.modified else 0 for item in self._items)
+        self._modified_count = 0
+        self._modified_by_file: Dict[int, int] = {}
+        file_codes = self._codes['source_file']
+        for row in compress(range(len(self._items)), self._modified):
+            self._count_modified(file_codes[row], 1)
+
+        self._views: Dict[str, object] = {}  # NumPy views of the columns
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # ---- Maintenance -------------------------------------------------------
+
+    def _code(self, key: str, value) -> int:
+        """Code of a value in a key's vocabulary (added on first use)"""
+        codes = self._vocab_codes[key]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._vocab[key])
+            self._vocab[key].append(value)
+        return code
+
+    def _count_modified(self, file_code: int, delta: int):
+        """Adjust the running modified counts"""
+        self._modified_count += delta
+        self._modified_by_file[file_code] = self._modified_by_file.get(file_code, 0) + delta
+
+    def update_item(self, item: TypeItem):
+        """Copy an edited item's values into its row"""
+        row = self._rows.get(id(item))
+        if row is None:
+            return
+        for name, value in zip(COLUMNS, _get_columns(item)):
+            self._columns[name][row] = value
+
+        old_file = self._codes['source_file'][row]
+        for key in SINGLE_KEYS:
+            self._codes[key][row] = self._code(key, getattr(item, key))
+        for key in LIST_KEYS:
+            entries = tuple(self._code(key, entry) for entry in getattr(item, key))
+            if entries != self._list_codes[key][row]:
+                self._list_codes[key][row] = entries
+                self._pairs.pop(key, None)
+
+        modified = 1 if item.modified else 0
+        file_code = self._codes['source_file'][row]
+        if modified != self._modified[row] or file_code != old_file:
+            if self._modified[row]:
+                self._count_modified(old_file, -1)
+            if modified:
+                self._count_modified(file_code, 1)
+            self._modified[row] = modified
+
+    def update_items(self, items: Iterable[TypeItem]):
+        """Copy several edited items into their rows"""
+        for item in items:
+            self.update_item(item)
+
+    # ---- Modified counts ---------------------------------------------------
+
+    @property
+    def modified_count(self) -> int:
+        """Number of modified items (kept up to date, no scan)"""
+        return self._modified_count
+
+    def modified_count_for(self, source_file: str) -> int:
+        """Number of modified items of one file"""
+        code = self._vocab_codes['source_file'].get(source_file)
+        return 0 if code is None else self._modified_by_file.get(code, 0)
+
+    # ---- Aggregates --------------------------------------------------------
+
+    def column(self, name: str):
+        """A column (NumPy view when NumPy is installed, else the array.array)"""
+        column = self._columns[name]
+        if np is None:
+            return column
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = _np_view(column, np.int64)
+        return view
+
+    def _selectors(self, mask: Optional[int]) -> Optional[bytes]:
+        """0/1 byte per row for a row bitset (None = all rows)"""
+        if mask is None:
+            return None
+        size = len(self._items)
+        mask &= (1 << size) - 1
+        if not mask:
+            return bytes(size)
+        digits = bin(mask)[:1:-1].encode('ascii').translate(_BIN_TO_FLAGS)
+        return digits + bytes(size - len(digits))
+
+    def count(self, mask: Optional[int] = None) -> int:
+        """Number of rows selected by a bitset (None = all rows)"""
+        if mask is None:
+            return len(self._items)
+        return bin(mask & ((1 << len(self._items)) - 1)).count('1')
+
+    def total(self, name: str, mask: Optional[int] = None) -> int:
+        """Sum of a column over the rows selected by a bitset (None = all rows)"""
+        return self.totals((name,), mask)[name]
+
+    def totals(self, names: Sequence[str], mask: Optional[int] = None) -> Dict[str, int]:
+        """Sums of several columns over the same selection"""
+        selectors = self._selectors(mask)
+        result = {}
+        if np is not None:
+            chosen = None if selectors is None else _np_view(selectors, np.bool_)
+            for name in names:
+                view = self.column(name)
+                result[name] = int(view.sum() if chosen is None else view[chosen].sum())
+        else:
+            for name in names:
+                column = self._columns[name]
+                result[name] = sum(column if selectors is None else compress(column, selectors))
+        return result
+
+    def group_by(self, key: str, names: Sequence[str] = ('nominal',),
+                 mask: Optional[int] = None) -> Dict[object, Dict[str, int]]:
+        """
+        Row count and column sums per category, source file, usage, value or tag
+        ({group: {'count': n, name: sum, ...}}). For list keys an item counts
+        towards each of its entries; items without a category group under None.
+        """
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Cannot group by '{key}' (expected one of {', '.join(GROUP_KEYS)})")
+        if key in SINGLE_KEYS:
+            rows, codes = None, self._codes[key]
+        else:
+            rows, codes = self._flat_pairs(key)
+        selectors = self._selectors(mask)
+        vocab = self._vocab[key]
+
+        if np is not None:
+            counts, sums = self._group_numpy(rows, codes, names, selectors, len(vocab))
+        else:
+            counts, sums = self._group_python(rows, codes, names, selectors, len(vocab))
+
+        groups = {}
+        for code, value in enumerate(vocab):
+            if counts[code]:
+                group = {'count': int(counts[code])}
+                for name in names:
+                    group[name] = int(sums[name][code])
+                groups[value] = group
+        return groups
+
+    def _flat_pairs(self, key: str) -> Tuple[array, array]:
+        """(row, code) pairs of a list key, rebuilt after an entry changed"""
+        pairs = self._pairs.get(key)
+        if pairs is None:
+            rows, codes = array(_TYPECODE), array(_TYPECODE)
+            for row, entries in enumerate(self._list_codes[key]):
+                for code in set(entries):
+                    rows.append(row)
+                    codes.append(code)
+            pairs = self._pairs[key] = (rows, codes)
+        return pairs
+
+    def _group_numpy(self, rows, codes, names, selectors, size):
+        """Grouped counts and sums with bincount"""
+        codes = _np_view(codes, np.int64)
+        row_index = None if rows is None else _np_view(rows, np.int64)
+        if selectors is not None:
+            chosen = _np_view(selectors, np.bool_)
+            keep = chosen if row_index is None else chosen[row_index]
+            codes = codes[keep]
+            if row_index is not None:
+                row_index = row_index[keep]
+
+        counts = np.bincount(codes, minlength=size)
+        sums = {}
+        for name in names:
+            values = self.column(name)
+            if row_index is not None:
+                values = values[row_index]
+            elif selectors is not None:
+                values = values[chosen]
+            # Float weights are exact for totals below 2**53
+            sums[name] = np.rint(np.bincount(codes, weights=values, minlength=size)).astype(np.int64)
+        return counts, sums
+
+    def _group_python(self, rows, codes, names, selectors, size):
+        """Grouped counts and sums with plain loops"""
+        if rows is None:
+            rows = range(len(self._items))
+        pairs = zip(rows, codes)
+        if selectors is not None:
+            pairs = ((row, code) for row, code in pairs if selectors[row])
+
+        counts = [0] * size
+        sums = {name: [0] * size for name in names}
+        columns = [(sums[name], self._columns[name]) for name in names]
+        for row, code in pairs:
+            counts[code] += 1
+            for group_sums, column in columns:
+                group_sums[code] += column[row]
+        return counts, sums
@@ -4,6 +4,8 @@ Parses cfglimitsdefinition.xml and cfglimitsdefinitionuser.xml
 to extract valid categories, usages, values, tags, and user definitions
 """
 import xml.etree.ElementTree as ET
+import hashlib
+import json
 from typing import List, Set, Dict
 
 class LimitsParser:
@@ -134,6 +136,14 @@ class LimitsParser:
         """Get sorted list of user definition names"""
         return sorted(self.user_definitions.keys())
     
+    def fingerprint(self) -> str:
+        """
+        Hash of the user definitions, which are the only limits data that
+        change how types files are parsed (user tag expansion)
+        """
+        data = json.dumps(self.user_definitions, sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    
     def merge(self, other: 'LimitsParser'):
         """Merge another LimitsParser's data into this one"""
         self.categories.update(other.categories)
@@ -0,0 +1,169 @@
+"""
+Parallel File Loader
+Fetches and parses economy files concurrently on a worker pool
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, List, Optional
+from core.tracing import tracer
+
+# Enough to hide SFTP round-trip latency without flooding the server
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading a single file"""
+    index: int  # Position of the file in the requested path list
+    path: str
+    parsed: Any = None
+    content: Optional[str] = None
+    mtime: Optional[float] = None
+    from_cache: bool = False
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the file was fetched and parsed without errors"""
+        return self.error is None
+
+
+class ParallelLoader:
+    """
+    Loads a list of files through a file manager (SFTP or local) using a
+    thread pool. Each worker fetches (or takes from cache) and parses one file.
+    Results are reported as they complete and returned in request order.
+    """
+
+    def __init__(self, file_manager, parse_func: Callable[[str, str], Any],
+                 cache_lookup: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+                 use_cache: bool = True, max_workers: int = DEFAULT_MAX_WORKERS,
+                 stream_parse_func: Optional[Callable[[IO, str], Any]] = None):
+        """
+        Args:
+            file_manager: SFTPManager or LocalFileManager
+            parse_func: Called as parse_func(content, path), returns the parsed model
+            cache_lookup: Returns cached {'timestamp', 'content'} for a path, or None.
+                If not given, no mtime is tracked for the loaded files.
+            use_cache: If False, always download but still report mtime for caching
+            max_workers: Maximum number of files processed concurrently
+            stream_parse_func: Called as stream_parse_func(stream, path) for files
+                that have to be downloaded, if the file manager can open_file -
+                parses while the file is transferred. The model's original_content
+                is reported as the file content.
+        """
+        self.file_manager = file_manager
+        self.parse_func = parse_func
+        self.cache_lookup = cache_lookup
+        self.use_cache = use_cache
+        self.max_workers = max(1, max_workers)
+        self.stream_parse_func = stream_parse_func
+        self._cancel_event = threading.Event()
+        self._file_stats: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+
+    def cancel(self):
+        """Request cancellation - files not yet started are skipped"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Check if loading was cancelled"""
+        return self._cancel_event.is_set()
+
+    def load(self, paths: List[str],
+             on_result: Optional[Callable[[LoadResult], None]] = None) -> List[LoadResult]:
+        """
+        Load all paths concurrently
+
+        Args:
+            paths: File paths relative to the mission folder
+            on_result: Called from the calling thread as each file completes
+
+        Returns:
+            Results of all completed files, ordered as in paths
+        """
+        if not paths:
+            return []
+
+        results: List[Optional[LoadResult]] = [None] * len(paths)
+        workers = min(self.max_workers, len(paths))
+
+        # One batched stat (a listing per directory) instead of a round trip per file
+        self._file_stats = None
+        if self.cache_lookup and hasattr(self.file_manager, 'stat_many'):
+            try:
+                with tracer.span('io.stat_many', files=len(paths)):
+                    self._file_stats = self.file_manager.stat_many(paths)
+            except Exception as e:
+                print(f"Batched stat failed, falling back to per-file stat: {e}")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._load_one, index, path)
+                       for index, path in enumerate(paths)]
+
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    results[result.index] = result
+                    if on_result:
+                        on_result(result)
+
+                if self.is_cancelled():
+                    # Drop everything that hasn't started yet
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        return [result for result in results if result is not None]
+
+    def _load_one(self, index: int, path: str) -> Optional[LoadResult]:
+        """Fetch and parse a single file (runs on a worker thread)"""
+        if self.is_cancelled():
+            return None
+
+        result = LoadResult(index=index, path=path)
+
+        try:
+            content = None
+
+            # Use cached content if the remote file hasn't changed
+            if self.cache_lookup and self.use_cache:
+                remote_mtime = self._get_mtime(path)
+                if remote_mtime:
+                    cached = self.cache_lookup(path)
+                    if cached and cached.get('timestamp') == remote_mtime:
+                        content = cached.get('content')
+                        result.mtime = remote_mtime
+                        result.from_cache = True
+
+            # Download if not using cache
+            if content is None:
+                if self.stream_parse_func and hasattr(self.file_manager, 'open_file'):
+                    # Transfer and parse overlap - one span for both
+                    with tracer.span('io.read_and_parse', path=path):
+                        with self.file_manager.open_file(path) as stream:
+                            result.parsed = self.stream_parse_func(stream, path)
+                    content = getattr(result.parsed, 'original_content', None)
+                else:
+                    with tracer.span('io.read', path=path):
+                        content = self.file_manager.read_file(path)
+                if self.cache_lookup:
+                    result.mtime = self._get_mtime(path)
+
+            result.content = content
+            if result.parsed is None:
+                with tracer.span('parse.file', path=path):
+                    result.parsed = self.parse_func(content, path)
+
+        except Exception as e:
+            result.error = str(e)
+
+        return result
+
+    def _get_mtime(self, path: str) -> Optional[float]:
+        """Modification time from the batched stat, or a single stat as fallback"""
+        if self._file_stats is not None and path in self._file_stats:
+            stat = self._file_stats[path]
+            return stat['mtime'] if stat else None
+        with tracer.span('io.mtime', path=path):
+            return self.file_manager.get_file_mtime(path)
@@ -0,0 +1,155 @@
+"""
+Process Pool Parser
+Optional parse stage that decodes large economy files in worker processes,
+so several files are parsed on several cores instead of taking turns on the GIL
+"""
+import dataclasses
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+from core.xml_parser import TypesParser
+from core.spawnabletypes_parser import SpawnableTypesParser
+from core.random_presets_parser import RandomPresetsParser
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+# Files smaller than this are parsed in-process - shipping them to a worker
+# and the model back costs more than the parse itself
+PROCESS_PARSE_MIN_BYTES = 256 * 1024
+
+# Leave a core for the UI thread
+DEFAULT_PROCESSES = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+KINDS = ('types', 'spawnabletypes', 'randompresets')
+
+# TypeItem fields shipped per item, in constructor order. source_file and
+# modified (the trailing fields) are set when the file is rebuilt.
+_FIELD_NAMES = [f.name for f in dataclasses.fields(TypeItem)]
+_ROW_FIELDS = tuple(_FIELD_NAMES[:_FIELD_NAMES.index('source_file')])
+_LIST_FIELDS = {'usage', 'value', 'tag', 'original_users'}
+
+
+def parse_local(kind: str, content: str, path: str, limits_parser=None) -> Any:
+    """Parse a file of the given kind in this process"""
+    if kind == 'types':
+        return TypesParser.parse(content, path, limits_parser)
+    if kind == 'spawnabletypes':
+        return SpawnableTypesParser.parse(content, path)
+    if kind == 'randompresets':
+        return RandomPresetsParser.parse(content, path)
+    raise ValueError(f"Unknown file kind: {kind}")
+
+
+def _intern(value):
+    """Intern strings so repeated values are pickled once (pickle memoizes by identity)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _types_payload(types_file: TypesFile) -> tuple:
+    """Compact form of a TypesFile: one tuple of field values per item"""
+    rows = []
+    for item in types_file.items:
+        row = []
+        for name in _ROW_FIELDS:
+            value = getattr(item, name)
+            if name in _LIST_FIELDS:
+                value = [_intern(entry) for entry in value]
+            else:
+                value = _intern(value)
+            row.append(value)
+        rows.append(tuple(row))
+    return (rows, types_file.header_comments, types_file.footer_comments, types_file.item_comments)
+
+
+def _types_from_payload(payload: tuple, path: str) -> TypesFile:
+    """Rebuild a TypesFile from _types_payload output"""
+    rows, header_comments, footer_comments, item_comments = payload
+    types_file = TypesFile(path)
+    for row in rows:
+        types_file.add_item(TypeItem(*row))
+    types_file.header_comments = header_comments
+    types_file.footer_comments = footer_comments
+    types_file.item_comments = item_comments
+    return types_file
+
+
+def _parse_in_worker(kind: str, data: bytes, path: str, limits_parser=None) -> Any:
+    """Worker process entry point: raw bytes in, picklable payload out"""
+    model = parse_local(kind, data.decode('utf-8'), path, limits_parser)
+    if kind == 'types':
+        return _types_payload(model)
+    # The caller still has the text - don't send it back
+    if hasattr(model, 'original_content'):
+        model.original_content = ""
+    return model
+
+
+class ProcessParser:
+    """
+    Parses files above a size threshold on a process pool, smaller ones
+    in the calling thread. Meant to be called from loader threads: each call
+    blocks only its own thread while a worker process does the parsing.
+    Results don't depend on which worker parsed a file or when it finished.
+    """
+
+    def __init__(self, processes: int = DEFAULT_PROCESSES,
+                 min_bytes: int = PROCESS_PARSE_MIN_BYTES):
+        """
+        Args:
+            processes: Worker processes (0 disables the pool - everything parses in-process)
+            min_bytes: Files smaller than this (UTF-8 encoded) parse in-process
+        """
+        self.processes = max(0, processes)
+        self.min_bytes = min_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether large files go to worker processes"""
+        return self.processes > 0
+
+    def parse(self, kind: str, content: str, path: str, limits_parser=None) -> Any:
+        """Parse content as a file of the given kind (see KINDS)"""
+        if not self.enabled or len(content) < self.min_bytes:
+            # Character count is a lower bound of the byte count - skip encoding small files
+            return parse_local(kind, content, path, limits_parser)
+
+        data = content.encode('utf-8')
+        if len(data) < self.min_bytes:
+            return parse_local(kind, content, path, limits_parser)
+
+        try:
+            payload = self._get_executor().submit(
+                _parse_in_worker, kind, data, path, limits_parser).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed) - drop the pool and parse here
+            print(f"Parser process pool failed, parsing {path} in-process: {e}")
+            self.shutdown()
+            return parse_local(kind, content, path, limits_parser)
+
+        if kind == 'types':
+            model = _types_from_payload(payload, path)
+        else:
+            model = payload
+        if hasattr(model, 'original_content'):
+            model.original_content = content
+        return model
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes)
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes (a later parse starts a new pool)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
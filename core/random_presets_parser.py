@@ -4,6 +4,7 @@ Parses cfgrandompresets.xml files and creates RandomPreset objects
 """
 import xml.etree.ElementTree as ET
 from typing import Tuple
+from core.xml_comments import scan_comments
 from models.random_preset import RandomPresetsFile, RandomPreset, PresetItem, PresetType
 
 class RandomPresetsParser:
@@ -76,37 +77,13 @@ class RandomPresetsParser:
     
     @staticmethod
     def _extract_comments(xml_content: str, presets_file):
-        """Extract and store comments from XML content"""
-        import re
-        
-        # Find all comments
-        comment_pattern = r'<!--(.*?)-->'
-        
-        # Find header comments (before <randompresets>)
-        presets_start = xml_content.find('<randompresets')
-        if presets_start > 0:
-            header_section = xml_content[:presets_start]
-            header_comments = re.findall(comment_pattern, header_section, re.DOTALL)
-            presets_file.header_comments = [f'<!--{c.strip()}-->' for c in header_comments]
-        
-        # Find footer comments (after </randompresets>)
-        presets_end = xml_content.find('</randompresets>')
-        if presets_end > 0:
-            footer_section = xml_content[presets_end + 16:]  # 16 = len('</randompresets>')
-            footer_comments = re.findall(comment_pattern, footer_section, re.DOTALL)
-            presets_file.footer_comments = [f'<!--{c.strip()}-->' for c in footer_comments]
-        
-        # Find comments associated with specific presets
-        # Look for comments immediately before <cargo or <attachments tags
-        preset_pattern = r'((?:<!--.*?-->\s*)*)<(cargo|attachments)\s+[^>]*name="([^"]+)"'
-        matches = re.findall(preset_pattern, xml_content, re.DOTALL)
-        
-        for comment_block, preset_type, preset_name in matches:
-            if comment_block.strip():
-                # Extract individual comments from the block
-                preset_comments = re.findall(comment_pattern, comment_block, re.DOTALL)
-                if preset_comments:
-                    presets_file.preset_comments[preset_name] = [f'<!--{c.strip()}-->' for c in preset_comments]
+        """Extract and store header, footer and per-preset comments (single pass)"""
+        layout = scan_comments(xml_content, ('cargo', 'attachments'))
+        presets_file.header_comments = [f'<!--{c}-->' for c in layout.header]
+        presets_file.footer_comments = [f'<!--{c}-->' for c in layout.footer]
+        for _, preset_name, comments in layout.attached:
+            if preset_name is not None:
+                presets_file.preset_comments[preset_name] = [f'<!--{c}-->' for c in comments]
     
     @staticmethod
     def _parse_preset_element(elem: ET.Element, preset_type: PresetType) -> RandomPreset:
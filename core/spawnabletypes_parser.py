@@ -3,8 +3,8 @@ Spawnable Types XML Parser
 Parses cfgspawnabletypes.xml files with comment preservation
 """
 import xml.etree.ElementTree as ET
-import re
 from typing import List, Tuple
+from core.xml_comments import scan_comments
 from models.spawnable_type import (
     SpawnableTypesFile, SpawnableType, CargoBlock, 
     AttachmentsBlock, SpawnableItem
@@ -218,45 +218,17 @@ class SpawnableTypesParser:
     @staticmethod
     def _extract_comments(xml_content: str) -> Tuple[List[str], List[str], dict]:
         """
-        Extract comments from XML content
+        Extract comments from XML content (single pass)
         
         Returns:
             Tuple of (header_comments, footer_comments, type_comments)
         """
-        header_comments = []
-        footer_comments = []
-        type_comments = {}
-        
-        # Find all comments
-        comment_pattern = r'<!--(.*?)-->'
-        comments = re.findall(comment_pattern, xml_content, re.DOTALL)
-        
-        # Find position of <spawnabletypes> and </spawnabletypes>
-        root_start = xml_content.find('<spawnabletypes')
-        root_end = xml_content.rfind('</spawnabletypes>')
-        
-        if root_start == -1 or root_end == -1:
-            return header_comments, footer_comments, type_comments
+        layout = scan_comments(xml_content, ('type',))
         
-        # Find header comments (before <spawnabletypes>)
-        header_section = xml_content[:root_start]
-        for comment in re.finditer(comment_pattern, header_section, re.DOTALL):
-            header_comments.append(comment.group(1).strip())
-        
-        # Find footer comments (after </spawnabletypes>)
-        footer_section = xml_content[root_end + len('</spawnabletypes>'):]
-        for comment in re.finditer(comment_pattern, footer_section, re.DOTALL):
-            footer_comments.append(comment.group(1).strip())
-        
-        # Find type-specific comments (comments immediately before <type> tags)
-        # Only match comments that appear directly before a type (no other elements between)
-        type_pattern = r'<!--([^<>]*?)-->\s*<type\s+name="([^"]+)"'
-        for match in re.finditer(type_pattern, xml_content):
-            comment_text = match.group(1).strip()
-            type_name = match.group(2)
-            
-            if type_name not in type_comments:
-                type_comments[type_name] = []
-            type_comments[type_name].append(comment_text)
+        # Comments directly before a <type> belong to it
+        type_comments = {}
+        for _, type_name, comments in layout.attached:
+            if type_name is not None:
+                type_comments.setdefault(type_name, []).extend(comments)
         
-        return header_comments, footer_comments, type_comments
+        return layout.header, layout.footer, type_comments
@@ -0,0 +1,182 @@
+"""
+Tracing
+Named timing spans around the load, parse, filter, render and save stages.
+Disabled by default: Tracer.span() then hands out one shared no-op object, so an
+instrumented call costs a flag check. When enabled, finished spans go to a
+bounded buffer that can be summarized per stage or exported as Chrome
+trace-event JSON (chrome://tracing, Perfetto).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+# Finished spans kept (oldest dropped first) - bounds memory of long sessions
+DEFAULT_CAPACITY = 100000
+
+
+class SpanRecord(NamedTuple):
+    """One finished span (times in nanoseconds from perf_counter_ns)"""
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+    args: Optional[dict]
+
+
+class StageTotal(NamedTuple):
+    """Summary of all spans with one name"""
+    name: str
+    count: int
+    total_seconds: float
+    max_seconds: float
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A running span; recorded when the with-block ends"""
+    __slots__ = ('tracer', 'name', 'args', 'start_ns')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        self.tracer.records.append(SpanRecord(self.name, self.start_ns, end_ns - self.start_ns,
+                                              threading.get_ident(), self.args))
+        return False
+
+
+class Tracer:
+    """Collects spans from all threads while enabled"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = False
+        self.records: Deque[SpanRecord] = deque(maxlen=capacity)  # append is thread-safe
+
+    def span(self, name: str, **args):
+        """
+        Context manager timing a block, e.g. with tracer.span('io.read', path=path).
+        Names are 'stage.detail' - the part before the dot is the stage.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args or None)
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def clear(self):
+        """Drop all recorded spans"""
+        self.records.clear()
+
+    def summary(self) -> List[StageTotal]:
+        """Totals per span name, largest total first"""
+        totals: Dict[str, List[int]] = {}
+        for record in list(self.records):
+            entry = totals.setdefault(record.name, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += record.duration_ns
+            entry[2] = max(entry[2], record.duration_ns)
+        stages = [StageTotal(name, count, total / 1e9, longest / 1e9)
+                  for name, (count, total, longest) in totals.items()]
+        return sorted(stages, key=lambda stage: stage.total_seconds, reverse=True)
+
+    def format_summary(self, limit: int = 0) -> str:
+        """One line per span name: total, count and longest span"""
+        stages = self.summary()
+        if limit:
+            stages = stages[:limit]
+        return '\n'.join(f"{stage.name}: {stage.total_seconds * 1000:.1f} ms "
+                         f"({stage.count}x, max {stage.max_seconds * 1000:.1f} ms)" for stage in stages)
+
+    def stage_totals(self) -> Dict[str, float]:
+        """
+        Seconds spent per stage (span name up to the first dot), largest first.
+        Nested spans of one stage count once; time on parallel threads adds up.
+        """
+        intervals: Dict[tuple, List[tuple]] = {}
+        for record in list(self.records):
+            key = (record.name.split('.', 1)[0], record.thread_id)
+            intervals.setdefault(key, []).append((record.start_ns, record.start_ns + record.duration_ns))
+
+        totals: Dict[str, int] = {}
+        for (stage, _), spans in intervals.items():
+            covered = 0
+            end = None
+            for span_start, span_end in sorted(spans):
+                if end is None or span_start > end:
+                    covered += span_end - span_start
+                    end = span_end
+                elif span_end > end:
+                    covered += span_end - end
+                    end = span_end
+            totals[stage] = totals.get(stage, 0) + covered
+        return {stage: total / 1e9 for stage, total in sorted(totals.items(), key=lambda entry: -entry[1])}
+
+    def format_stages(self) -> str:
+        """Stage totals on one line, e.g. 'io 1.20s, parse 0.85s, render 0.10s'"""
+        return ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in self.stage_totals().items())
+
+    def to_chrome_trace(self) -> dict:
+        """Chrome trace-event format (complete 'X' events, microseconds)"""
+        pid = os.getpid()
+        events = []
+        for record in list(self.records):
+            event = {
+                'name': record.name,
+                'cat': record.name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': record.start_ns / 1000,
+                'dur': record.duration_ns / 1000,
+                'pid': pid,
+                'tid': record.thread_id,
+            }
+            if record.args:
+                event['args'] = {key: str(value) for key, value in record.args.items()}
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        """Write the recorded spans as a Chrome trace JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+# Process-wide tracer used by the instrumented modules
+tracer = Tracer()
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a function in a span of the global tracer"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with _Span(tracer, name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,160 @@
+"""
+Types XML Writer
+Saves a types.xml file by splicing into its original text: only modified,
+added and removed <type> elements are rendered or cut, every other element
+keeps its exact original bytes (formatting, attribute order, comments)
+"""
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+from core.tracing import traced
+from core.xml_comments import CommentLayout, ChildSpan, scan_comments
+from core.xml_parser import TypesParser
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+# Fields compared to decide whether a modified item still matches its original element
+_CONTENT_FIELDS = ('name', 'nominal', 'lifetime', 'restock', 'min', 'quantmin', 'quantmax', 'cost',
+                   'category', 'usage', 'value', 'tag', 'count_in_cargo', 'count_in_hoarder',
+                   'count_in_map', 'count_in_player', 'crafted', 'deloot')
+
+
+class TypesWriter:
+    """Incremental writer for types.xml files"""
+
+    @staticmethod
+    @traced('save.render')
+    def write(types_file: TypesFile, limits_parser=None) -> str:
+        """
+        Generate the XML for a types file, re-rendering only what changed
+
+        Args:
+            types_file: TypesFile object
+            limits_parser: LimitsParser instance for user tag preservation
+
+        Returns:
+            XML string content - equal to original_content if nothing changed.
+            Falls back to a full TypesFile.to_xml() when there is no original
+            text or the items can't be matched to it (duplicate names,
+            reordered items)
+        """
+        layout = TypesWriter._layout(types_file)
+        if layout is None:
+            return types_file.to_xml(limits_parser)
+
+        content = types_file.original_content
+        spans: Dict[str, ChildSpan] = {}
+        for span in layout.spans:
+            if span.name is None or span.name in spans:
+                return types_file.to_xml(limits_parser)
+            spans[span.name] = span
+
+        # Items in the original keep their places; new ones go before </types>
+        kept: Dict[str, TypeItem] = {}
+        added: List[TypeItem] = []
+        order = []
+        for item in types_file.items:
+            if item.name in kept:
+                return types_file.to_xml(limits_parser)
+            if item.name in spans:
+                kept[item.name] = item
+                order.append(spans[item.name].start)
+            else:
+                added.append(item)
+        if order != sorted(order):
+            return types_file.to_xml(limits_parser)
+
+        # Build the output and, on the way, the spans of its <type> elements -
+        # the next save of the written text needs no rescan
+        pieces = []
+        new_spans: List[ChildSpan] = []
+        pos = 0  # Position in the original text
+        shift = 0  # Output position - original position for text copied from pos on
+        for span in layout.spans:
+            item = kept.get(span.name)
+            if item is None:
+                # Removed - cut the element with its comments and indentation
+                cut = TypesWriter._line_start(content, span.lead, cut_newline=True)
+                pieces.append(content[pos:cut])
+                shift -= span.end - cut
+                pos = span.end
+            elif item.modified and not TypesWriter._matches_original(item, content[span.start:span.end],
+                                                                     limits_parser):
+                element = item.to_xml_element(limits_parser).lstrip()
+                pieces.append(content[pos:span.start])
+                pieces.append(element)
+                new_spans.append(ChildSpan(span.tag, span.name, span.lead + shift, span.start + shift,
+                                           span.start + shift + len(element)))
+                shift += len(element) - (span.end - span.start)
+                pos = span.end
+            else:
+                new_spans.append(ChildSpan(span.tag, span.name, span.lead + shift,
+                                           span.start + shift, span.end + shift))
+
+        if added:
+            insert_at = TypesWriter._line_start(content, layout.root_end)
+            pieces.append(content[pos:insert_at])
+            cursor = insert_at + shift  # Output position of the next inserted text
+            block = []
+            if insert_at > 0 and content[insert_at - 1] not in '\r\n':
+                block.append('\n')  # </types> shares a line with the last element
+                cursor += 1
+            for item in added:
+                lead = cursor + 4  # After the indentation
+                for comment in types_file.item_comments.get(item.name, ()):
+                    block.append(f'    {comment}\n')
+                    cursor += len(block[-1])
+                element = item.to_xml_element(limits_parser)
+                block.append(element + '\n')
+                start = cursor + 4
+                cursor += len(block[-1])
+                new_spans.append(ChildSpan('type', item.name, min(lead, start), start, cursor - 1))
+            pieces.extend(block)
+            shift = cursor - insert_at
+            pos = insert_at
+
+        pieces.append(content[pos:])
+        xml_content = ''.join(pieces)
+        if xml_content != content:
+            types_file.source_layout = (xml_content, CommentLayout(
+                header=layout.header, footer=layout.footer, spans=new_spans, root_end=layout.root_end + shift))
+        return xml_content
+
+    @staticmethod
+    def _layout(types_file: TypesFile) -> Optional[CommentLayout]:
+        """Spans of the <type> elements in original_content (scanned again if stale)"""
+        content = types_file.original_content
+        if not content:
+            return None
+        if types_file.source_layout is None or types_file.source_layout[0] is not content:
+            types_file.source_layout = (content, scan_comments(content, ('type',)))
+        layout = types_file.source_layout[1]
+        return layout if layout.root_end is not None else None
+
+    @staticmethod
+    def _line_start(content: str, pos: int, cut_newline: bool = False) -> int:
+        """
+        Start of the indentation before pos if only spaces/tabs precede it on
+        its line (pos otherwise); with cut_newline, also take the line break
+        before it so the whole line can be removed
+        """
+        start = pos
+        while start > 0 and content[start - 1] in ' \t':
+            start -= 1
+        if start > 0 and content[start - 1] not in '\r\n':
+            return pos
+        if cut_newline and start > 0:
+            start -= 1
+            if start > 0 and content[start] == '\n' and content[start - 1] == '\r':
+                start -= 1
+        return start
+
+    @staticmethod
+    def _matches_original(item: TypeItem, element_text: str, limits_parser=None) -> bool:
+        """Whether an item's values equal those of its original element (edits cancelled out)"""
+        try:
+            original = TypesParser._parse_type_element(ET.fromstring(element_text), limits_parser)
+        except ET.ParseError:
+            return False
+        if original.original_users != item.original_users:
+            return False
+        return all(getattr(original, name) == getattr(item, name) for name in _CONTENT_FIELDS)
@@ -0,0 +1,248 @@
+"""
+Undo History
+One undo/redo history for the types, spawnable types and random presets
+editors. An entry saves only the objects an edit touches: a copy of an
+edited object's fields, or for a container whose children were added,
+removed or reordered a one-level copy that shares the children. Memory
+follows the size of the edits, not the size of the loaded files.
+
+Each entry carries an estimate of the bytes it keeps alive; the history
+drops its oldest entries once a memory budget is exceeded. Repeated edits
+of the same field of the same objects in quick succession (spin box steps,
+typing) can be coalesced into one undo step.
+"""
+import copy
+import dataclasses
+import sys
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Hashable, Iterable, List, Optional
+
+# Entry kinds - which editor has to refresh after an undo/redo
+TYPES = 'types'
+SPAWNABLE_TYPES = 'spawnable_types'
+RANDOM_PRESETS = 'random_presets'
+
+_ATOMIC = (str, int, float, bool, type(None), Enum)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_COALESCE_SECONDS = 1.0
+
+
+def _field_names(target) -> List[str]:
+    """Attributes making up an object's state (dataclass fields or instance dict)"""
+    if dataclasses.is_dataclass(target):
+        return [f.name for f in dataclasses.fields(target)]
+    return list(vars(target))
+
+
+def _copy_value(value, deep: bool):
+    """Copy of a field value that later edits of the live object can't reach"""
+    if isinstance(value, _ATOMIC):
+        return value
+    if not deep:
+        return copy.copy(value)  # Lists/dicts of children: share the children
+    if isinstance(value, list) and all(isinstance(entry, _ATOMIC) for entry in value):
+        return list(value)  # Fast path for name lists (usage, tags, ...)
+    return copy.deepcopy(value)
+
+
+def estimate_bytes(value, deep: bool = True) -> int:
+    """
+    Approximate bytes a saved value keeps alive. Atomic values (names,
+    numbers) are shared with the live objects, so only the containers and
+    objects copied for the entry are counted. With deep=False only the
+    container itself is counted - its children are shared as well.
+    """
+    if isinstance(value, _ATOMIC):
+        return 0
+    size = sys.getsizeof(value)
+    if not deep:
+        return size
+    if isinstance(value, (list, tuple, set)):
+        return size + sum(estimate_bytes(entry) for entry in value)
+    if isinstance(value, dict):
+        return size + sum(estimate_bytes(entry) for entry in value.values())
+    if dataclasses.is_dataclass(value) or hasattr(value, '__dict__'):
+        return size + sum(estimate_bytes(getattr(value, name, None)) for name in _field_names(value))
+    return size
+
+
+class ObjectState:
+    """
+    Saved fields of one object. swap() exchanges them with the live fields,
+    so the same state object serves undo and then redo. The object itself is
+    kept (restored in place), so references held by the editors stay valid.
+    """
+
+    def __init__(self, target, deep: bool = True):
+        """
+        Args:
+            target: Object about to be edited
+            deep: Copy nested objects (edits inside the object) or only one level
+                  (children added to / removed from / reordered in the object)
+        """
+        self.target = target
+        self.deep = deep
+        self.state = self._capture()
+        self.size = self._estimate()
+
+    def _capture(self) -> dict:
+        return {name: _copy_value(getattr(self.target, name), self.deep)
+                for name in _field_names(self.target)}
+
+    def _estimate(self) -> int:
+        return sys.getsizeof(self.state) + sum(estimate_bytes(value, self.deep)
+                                               for value in self.state.values())
+
+    def swap(self):
+        """Restore the saved fields, keeping the current ones for the way back"""
+        current = self._capture()
+        for name, value in self.state.items():
+            setattr(self.target, name, value)
+        self.state = current
+        self.size = self._estimate()
+
+
+class UndoEntry:
+    """One undoable edit: the saved states of the objects it changed"""
+
+    def __init__(self, kind: str, states: List[ObjectState], label: str = "",
+                 coalesce_key: Optional[Hashable] = None):
+        self.kind = kind
+        self.states = states
+        self.label = label
+        self.coalesce_key = coalesce_key
+        self.timestamp = time.monotonic()  # Last edit folded into this entry
+
+    @property
+    def size(self) -> int:
+        """Approximate bytes kept alive by the entry"""
+        return sum(state.size for state in self.states)
+
+    @property
+    def targets(self) -> list:
+        """The edited objects"""
+        return [state.target for state in self.states]
+
+    def swap(self):
+        """Undo the edit if it is applied, redo it if it was undone"""
+        for state in self.states:
+            state.swap()
+
+    def matches(self, kind: str, targets: list, coalesce_key: Hashable) -> bool:
+        """Whether an edit of these objects continues this entry's edit"""
+        return (self.coalesce_key is not None and self.coalesce_key == coalesce_key and
+                self.kind == kind and len(targets) == len(self.states) and
+                all(state.target is target for state, target in zip(self.states, targets)))
+
+
+class UndoHistory:
+    """
+    Undo and redo stacks of UndoEntry, newest last. Old entries are dropped
+    when there are more than max_entries or the entries together hold more
+    than max_bytes (the newest entry is always kept, however large).
+    """
+
+    def __init__(self, max_entries: int = 50, max_bytes: int = DEFAULT_MAX_BYTES,
+                 coalesce_seconds: float = DEFAULT_COALESCE_SECONDS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.coalesce_seconds = coalesce_seconds
+        self.undo_stack: Deque[UndoEntry] = deque()
+        self.redo_stack: Deque[UndoEntry] = deque()
+        self.total_bytes = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def record(self, kind: str, targets: Iterable, deep: bool = True, label: str = "",
+               coalesce_key: Optional[Hashable] = None) -> Optional[UndoEntry]:
+        """
+        Save the state of objects about to be edited (call before changing them).
+
+        With a coalesce_key (e.g. the edited field name), an edit of the same
+        objects with the same key within coalesce_seconds of the newest entry
+        is folded into it: that entry already holds the state before the
+        first of the edits, so one undo reverts them all.
+        """
+        unique = []
+        seen = set()
+        for target in targets:
+            if target is not None and id(target) not in seen:
+                seen.add(id(target))
+                unique.append(target)
+        if not unique:
+            return None
+
+        now = time.monotonic()
+        if coalesce_key is not None and self.undo_stack and not self.redo_stack:
+            last = self.undo_stack[-1]
+            if now - last.timestamp <= self.coalesce_seconds and last.matches(kind, unique, coalesce_key):
+                last.timestamp = now
+                return last
+
+        entry = UndoEntry(kind, [ObjectState(target, deep) for target in unique], label, coalesce_key)
+        self.push(entry)
+        return entry
+
+    def push(self, entry: UndoEntry):
+        """Add an entry; a new edit drops the redo history"""
+        for dropped in self.redo_stack:
+            self.total_bytes -= dropped.size
+        self.redo_stack.clear()
+        self.undo_stack.append(entry)
+        self.total_bytes += entry.size
+        self._trim()
+
+    def _trim(self):
+        """Drop the oldest entries until the history fits its limits"""
+        while len(self.undo_stack) > 1 and (len(self.undo_stack) > self.max_entries or
+                                            self.total_bytes > self.max_bytes):
+            self.total_bytes -= self.undo_stack.popleft().size
+
+    def _swap(self, entry: UndoEntry):
+        """Swap an entry, keeping the byte total in step with its new state"""
+        self.total_bytes -= entry.size
+        entry.swap()
+        entry.coalesce_key = None  # Never fold new edits into an undone/redone step
+        self.total_bytes += entry.size
+
+    def undo(self) -> Optional[UndoEntry]:
+        """Revert the newest edit, returning its entry (None if nothing to undo)"""
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        self._swap(entry)
+        self.redo_stack.append(entry)
+        return entry
+
+    def redo(self) -> Optional[UndoEntry]:
+        """Re-apply the newest undone edit, returning its entry"""
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        self._swap(entry)
+        self.undo_stack.append(entry)
+        self._trim()
+        return entry
+
+    def set_limits(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Change the limits, dropping old entries that no longer fit"""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._trim()
+
+    def clear(self):
+        """Drop all history (after saving - a save is a commit)"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.total_bytes = 0
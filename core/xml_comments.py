@@ -0,0 +1,144 @@
+"""
+XML Comment Scanner
+Single left-to-right pass over an XML document that finds header, footer and
+element comments for the parsers (ElementTree drops comments), and where each
+child element of the root starts and ends (for writers that splice edits into
+the original text)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+# Everything up to the closing '>' of a tag, skipping '>' inside quoted values.
+# Each character can only be matched one way, so a failed match backtracks linearly.
+_TAG_END = re.compile(r'''(?:[^>"']|"[^"]*"|'[^']*')*>''')
+_TAG_NAME = re.compile(r'[^\s/>]+')
+_NAME_ATTR = re.compile(r'''\sname\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+
+
+@dataclass
+class ChildSpan:
+    """Position of a direct child of the root in the document text"""
+    tag: str
+    name: Optional[str]  # name attribute
+    lead: int  # Start of the comments attached to the element (== start if none)
+    start: int  # '<' of the start tag
+    end: int  # Just after the end tag (or the '/>' of an empty element)
+
+
+@dataclass
+class CommentLayout:
+    """Comments of a document (texts without <!-- --> and surrounding whitespace)"""
+    header: List[str] = field(default_factory=list)  # Before the root element
+    footer: List[str] = field(default_factory=list)  # After the root element
+    # (tag, name attribute, comments) for each direct child of the root that is
+    # immediately preceded by comments (only whitespace in between), in document order
+    attached: List[Tuple[str, str, List[str]]] = field(default_factory=list)
+    # Every direct child of the root that is one of child_tags, in document order
+    spans: List[ChildSpan] = field(default_factory=list)
+    root_end: Optional[int] = None  # '<' of the root's end tag (None if never closed)
+
+
+def scan_comments(xml_content: str, child_tags: Iterable[str]) -> CommentLayout:
+    """
+    Scan a document once and sort its comments into header, footer and
+    comments attached to the following child element (one of child_tags),
+    noting the span of each such child.
+    Runs in time linear in the document size - every position is visited
+    once and all searches move forward.
+    """
+    child_tags = set(child_tags)
+    layout = CommentLayout()
+    pending: List[str] = []
+    lead = 0  # Start of the first pending comment
+    open_child = None  # (tag, name, lead, start) of the child element being scanned
+    depth = 0
+    root_seen = False
+    root_closed = False
+    pos = 0
+    length = len(xml_content)
+
+    while pos < length:
+        lt = xml_content.find('<', pos)
+        if lt == -1:
+            break
+        # Text between markup (other than whitespace) separates comments from the next element
+        if pending and lt > pos and not xml_content[pos:lt].isspace():
+            pending = []
+
+        if xml_content.startswith('<!--', lt):
+            end = xml_content.find('-->', lt + 4)
+            if end == -1:
+                break  # Unterminated - the XML parser reports the error
+            text = xml_content[lt + 4:end].strip()
+            if not pending:
+                lead = lt
+            if not root_seen:
+                layout.header.append(text)
+            elif root_closed:
+                layout.footer.append(text)
+            else:
+                pending.append(text)
+            pos = end + 3
+            continue
+
+        if xml_content.startswith('<![CDATA[', lt):
+            end = xml_content.find(']]>', lt + 9)
+            pos = length if end == -1 else end + 3
+            pending = []
+            continue
+
+        if xml_content.startswith('<?', lt):
+            end = xml_content.find('?>', lt + 2)
+            pos = length if end == -1 else end + 2
+            continue
+
+        match = _TAG_END.match(xml_content, lt + 1)
+        if match is None:
+            break
+        pos = match.end()
+        tag_text = xml_content[lt + 1:pos - 1]
+
+        if tag_text.startswith('!'):  # DOCTYPE and other declarations
+            continue
+
+        if tag_text.startswith('/'):
+            depth -= 1
+            pending = []
+            if depth == 1 and open_child is not None:
+                layout.spans.append(ChildSpan(*open_child, pos))
+                open_child = None
+            elif depth == 0 and root_seen:
+                root_closed = True
+                layout.root_end = lt
+            continue
+
+        name_match = _TAG_NAME.match(tag_text)
+        tag = name_match.group(0) if name_match else ''
+        if not root_seen:
+            root_seen = True
+        elif depth == 1 and tag in child_tags:
+            name = _name_attribute(tag_text)
+            if pending:
+                layout.attached.append((tag, name, pending))
+            child = (tag, name, lead if pending else lt, lt)
+            if tag_text.endswith('/'):
+                layout.spans.append(ChildSpan(*child, pos))
+            else:
+                open_child = child
+        pending = []
+
+        if not tag_text.endswith('/'):
+            depth += 1
+        elif depth == 0:
+            root_closed = True  # Empty root element
+
+    return layout
+
+
+def _name_attribute(tag_text: str) -> Optional[str]:
+    """Value of the name="..." attribute of a start tag"""
+    match = _NAME_ATTR.search(tag_text)
+    if not match:
+        return None
+    return match.group(1) if match.group(1) is not None else match.group(2)
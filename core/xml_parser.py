@@ -2,12 +2,21 @@
 Types XML Parser
 Parses types.xml files and creates TypeItem objects
 """
+import sys
 import xml.etree.ElementTree as ET
-import re
-from typing import List, Dict
+from typing import List, Dict, IO
+from core.tracing import tracer
+from core.xml_comments import scan_comments
 from models.type_item import TypeItem
 from models.types_file import TypesFile
 
+# Bytes read from a stream per parser feed
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Category/usage/value/tag/user names come from a small vocabulary - share one
+# string object per name instead of one per occurrence
+_intern = sys.intern
+
 class TypesParser:
     """Parser for types.xml files"""
     
@@ -27,7 +36,8 @@ class TypesParser:
         
         try:
             # Extract comments before parsing
-            TypesParser._extract_comments(xml_content, types_file)
+            with tracer.span('parse.comments', path=source_file):
+                TypesParser._extract_comments(xml_content, types_file)
             
             # Clean XML content - remove leading whitespace and comments before <?xml
             cleaned_content = xml_content.strip()
@@ -38,18 +48,20 @@ class TypesParser:
                 if xml_start > 0:
                     cleaned_content = cleaned_content[xml_start:]
             
-            root = ET.fromstring(cleaned_content)
+            with tracer.span('parse.xml', path=source_file):
+                root = ET.fromstring(cleaned_content)
             
-            # Parse all type elements
-            for type_elem in root.findall('type'):
-                try:
-                    item = TypesParser._parse_type_element(type_elem, limits_parser)
-                    types_file.add_item(item)
-                except Exception as e:
-                    # Skip this individual type element but continue parsing others
-                    item_name = type_elem.get('name', 'unknown')
-                    print(f"Warning: Skipping malformed type '{item_name}' in {source_file}: {e}")
-                    continue
+            # Parse all type elements (includes expanding <user> groups)
+            with tracer.span('parse.items', path=source_file):
+                for type_elem in root.findall('type'):
+                    try:
+                        item = TypesParser._parse_type_element(type_elem, limits_parser)
+                        types_file.add_item(item)
+                    except Exception as e:
+                        # Skip this individual type element but continue parsing others
+                        item_name = type_elem.get('name', 'unknown')
+                        print(f"Warning: Skipping malformed type '{item_name}' in {source_file}: {e}")
+                        continue
             
             return types_file
             
@@ -59,39 +71,124 @@ class TypesParser:
             raise ValueError(f"Error parsing types file {source_file}: {str(e)}")
     
     @staticmethod
-    def _extract_comments(xml_content: str, types_file: TypesFile):
-        """Extract and store comments from XML content"""
-        # Find all comments
-        comment_pattern = r'<!--(.*?)-->'
+    def parse_stream(stream: IO, source_file: str, limits_parser=None,
+                     keep_content: bool = True, chunk_size: int = STREAM_CHUNK_SIZE) -> TypesFile:
+        """
+        Parse a types.xml file incrementally from a binary or text stream
+        (e.g. an open SFTP file), so parsing overlaps the download.
+        Comments are captured from the parser events in the same pass and each
+        <type> element is dropped once it has been turned into a TypeItem,
+        so no full element tree is ever held.
+        Args:
+            stream: Object with read(size) returning bytes or str
+            source_file: Relative path to the source file
+            limits_parser: LimitsParser instance for expanding user tags
+            keep_content: Keep the raw text as original_content (for caching
+                and change detection) - costs one copy of the file
+            chunk_size: Bytes (or characters) read per step
+        Returns:
+            TypesFile object containing all parsed items
+        """
+        types_file = TypesFile(source_file)
+        chunks = []
+        parser = ET.XMLPullParser(events=('start', 'end', 'comment'))
         
-        # Find header comments (before <types>)
-        types_start = xml_content.find('<types')
-        if types_start > 0:
-            header_section = xml_content[:types_start]
-            header_comments = re.findall(comment_pattern, header_section, re.DOTALL)
-            # Strip any trailing/leading whitespace including line endings
-            types_file.header_comments = [f'<!--{c.strip()}-->' for c in header_comments]
+        root = None
+        root_closed = False
+        depth = 0
+        pending_comments = []  # Comments since the last tag, attached to the next <type>
         
-        # Find footer comments (after </types>)
-        types_end = xml_content.find('</types>')
-        if types_end > 0:
-            footer_section = xml_content[types_end + 8:]  # 8 = len('</types>')
-            footer_comments = re.findall(comment_pattern, footer_section, re.DOTALL)
-            # Strip any trailing/leading whitespace including line endings
-            types_file.footer_comments = [f'<!--{c.strip()}-->' for c in footer_comments]
+        def handle_events():
+            nonlocal root, root_closed, depth, pending_comments
+            for event, elem in parser.read_events():
+                if event == 'comment':
+                    comment = f'<!--{(elem.text or "").strip()}-->'
+                    if root is None:
+                        types_file.header_comments.append(comment)
+                    elif root_closed:
+                        types_file.footer_comments.append(comment)
+                    else:
+                        pending_comments.append(comment)
+                elif event == 'start':
+                    depth += 1
+                    if depth == 1:
+                        root = elem
+                    elif depth == 2 and elem.tag == 'type' and pending_comments:
+                        types_file.item_comments[elem.get('name', '')] = pending_comments
+                    pending_comments = []
+                else:
+                    depth -= 1
+                    pending_comments = []
+                    if depth == 0:
+                        root_closed = True
+                    elif depth == 1:
+                        if elem.tag == 'type':
+                            try:
+                                types_file.add_item(TypesParser._parse_type_element(elem, limits_parser))
+                            except Exception as e:
+                                # Skip this individual type element but continue parsing others
+                                item_name = elem.get('name', 'unknown')
+                                print(f"Warning: Skipping malformed type '{item_name}' in {source_file}: {e}")
+                        # Consumed - drop it so memory stays flat
+                        root.remove(elem)
         
-        # Find comments associated with specific items
-        # Look for comments immediately before <type name="...">
-        type_pattern = r'((?:<!--.*?-->\s*)*)<type\s+name="([^"]+)"'
-        matches = re.findall(type_pattern, xml_content, re.DOTALL)
+        try:
+            # Comments before <?xml are not well-formed XML - take them as header
+            # comments and start feeding the parser at the declaration
+            head = stream.read(chunk_size)
+            chunks.append(head)
+            text_mode = isinstance(head, str)
+            # Read enough of the start to tell a comment from the declaration
+            while len(head.lstrip()) < len('<?xml'):
+                more = stream.read(chunk_size)
+                if not more:
+                    break
+                chunks.append(more)
+                head += more
+            head = head.lstrip()
+            if head.startswith('<!--' if text_mode else b'<!--'):
+                marker = '<?xml' if text_mode else b'<?xml'
+                while marker not in head:
+                    more = stream.read(chunk_size)
+                    if not more:
+                        break
+                    chunks.append(more)
+                    head += more
+                xml_start = head.find(marker)
+                if xml_start > 0:
+                    preamble = head[:xml_start] if text_mode else head[:xml_start].decode('utf-8')
+                    types_file.header_comments.extend(
+                        f'<!--{c}-->' for c in scan_comments(preamble, ()).header)
+                    head = head[xml_start:]
+            
+            while head:
+                parser.feed(head)
+                handle_events()
+                head = stream.read(chunk_size)
+                if keep_content and head:
+                    chunks.append(head)
+            parser.close()
+            handle_events()
+            
+        except ET.ParseError as e:
+            raise ValueError(f"Failed to parse {source_file}: {str(e)}")
+        except Exception as e:
+            raise ValueError(f"Error parsing types file {source_file}: {str(e)}")
         
-        for comment_block, item_name in matches:
-            if comment_block.strip():
-                # Extract individual comments from the block
-                item_comments = re.findall(comment_pattern, comment_block, re.DOTALL)
-                if item_comments:
-                    # Strip any trailing/leading whitespace including line endings
-                    types_file.item_comments[item_name] = [f'<!--{c.strip()}-->' for c in item_comments]
+        if keep_content:
+            types_file.original_content = ''.join(chunks) if text_mode else b''.join(chunks).decode('utf-8')
+        return types_file
+    
+    @staticmethod
+    def _extract_comments(xml_content: str, types_file: TypesFile):
+        """Extract and store header, footer and per-item comments (single pass)"""
+        layout = scan_comments(xml_content, ('type',))
+        types_file.source_layout = (xml_content, layout)  # <type> spans for the incremental writer
+        types_file.header_comments = [f'<!--{c}-->' for c in layout.header]
+        types_file.footer_comments = [f'<!--{c}-->' for c in layout.footer]
+        for _, item_name, comments in layout.attached:
+            if item_name is not None:
+                types_file.item_comments[item_name] = [f'<!--{c}-->' for c in comments]
     
     @staticmethod
     def _parse_type_element(elem: ET.Element, limits_parser=None) -> TypeItem:
@@ -121,6 +218,8 @@ class TypesParser:
         category_elem = elem.find('category')
         if category_elem is not None:
             category = category_elem.get('name')
+            if category:
+                category = _intern(category)
         
         # Parse usage (multiple values) - handle both <usage> and <user> tags
         usage_list = []
@@ -132,25 +231,25 @@ class TypesParser:
         for usage_elem in elem.findall('usage'):
             usage_name = usage_elem.get('name')
             if usage_name:
-                usage_list.append(usage_name)
+                usage_list.append(_intern(usage_name))
         
         # Parse value (multiple values)
         for value_elem in elem.findall('value'):
             value_name = value_elem.get('name')
             if value_name:
-                value_list.append(value_name)
+                value_list.append(_intern(value_name))
         
         # Parse tag (multiple values)
         for tag_elem in elem.findall('tag'):
             tag_name = tag_elem.get('name')
             if tag_name:
-                tag_list.append(tag_name)
+                tag_list.append(_intern(tag_name))
         
         # Look for direct <user> children and expand them
         for user_elem in elem.findall('user'):
             user_name = user_elem.get('name')
             if user_name:
-                original_users.append(user_name)
+                original_users.append(_intern(user_name))
                 if limits_parser:
                     # Expand user group
                     expanded = limits_parser.expand_user(user_name)
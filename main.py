@@ -3,6 +3,7 @@
 DayZ Types Editor - Main Entry Point
 """
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from ui.main_window import MainWindow
 
@@ -90,4 +91,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # Parser worker processes re-launch the frozen executable on Windows
+    multiprocessing.freeze_support()
     main()
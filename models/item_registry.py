@@ -0,0 +1,120 @@
+"""
+Item Registry
+Index of all loaded type items across types files, for constant-time lookup
+by name and of the file that owns an item
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.name_index import NameIndex
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+
+class ItemRegistry:
+    """
+    Maps item name -> (file, item) and item -> owning file.
+
+    The same name may appear in several files (a later mod overriding an
+    earlier one); lookups by name return the first registration in load order,
+    matching a scan of the files in order.
+    """
+
+    def __init__(self, types_files: Optional[Iterable[TypesFile]] = None):
+        self._by_name: Dict[str, List[Tuple[TypesFile, TypeItem]]] = {}
+        self._by_lower_name: Dict[str, List[Tuple[TypesFile, TypeItem]]] = {}
+        # TypeItem is an unhashable dataclass - key by identity
+        self._owner: Dict[int, Tuple[TypeItem, TypesFile]] = {}
+        # Search index over the same names, shared by search boxes and completers
+        self.name_index = NameIndex()
+
+        if types_files:
+            self.rebuild(types_files)
+
+    def rebuild(self, types_files: Iterable[TypesFile]):
+        """Re-index all items of the given files (in order)"""
+        self.clear()
+        for types_file in types_files:
+            for item in types_file.items:
+                self.register(item, types_file)
+
+    def clear(self):
+        """Remove everything"""
+        self._by_name = {}
+        self._by_lower_name = {}
+        self._owner = {}
+        self.name_index.clear()
+
+    def register(self, item: TypeItem, types_file: TypesFile):
+        """Index an item that was added to a file"""
+        if id(item) in self._owner:
+            self.unregister(item)
+        entry = (types_file, item)
+        self._by_name.setdefault(item.name, []).append(entry)
+        self._by_lower_name.setdefault(item.name.lower(), []).append(entry)
+        self._owner[id(item)] = (item, types_file)
+        self.name_index.add(item.name)
+
+    def unregister(self, item: TypeItem):
+        """Drop an item that was removed from its file"""
+        owner = self._owner.pop(id(item), None)
+        if owner is None:
+            return
+        self._remove_entry(self._by_name, item.name, item)
+        self._remove_entry(self._by_lower_name, item.name.lower(), item)
+        self.name_index.remove(item.name)
+
+    def rename(self, item: TypeItem, new_name: str):
+        """Rename an item and move its index entries"""
+        owner = self._owner.get(id(item))
+        if owner is None:
+            item.name = new_name
+            return
+        self.unregister(item)
+        item.name = new_name
+        self.register(item, owner[1])
+
+    @staticmethod
+    def _remove_entry(index: Dict[str, List[Tuple[TypesFile, TypeItem]]], key: str, item: TypeItem):
+        entries = index.get(key)
+        if not entries:
+            return
+        entries[:] = [entry for entry in entries if entry[1] is not item]
+        if not entries:
+            del index[key]
+
+    def get(self, name: str) -> Optional[TypeItem]:
+        """Get the first item with this exact name"""
+        entries = self._by_name.get(name)
+        return entries[0][1] if entries else None
+
+    def get_with_file(self, name: str) -> Optional[Tuple[TypesFile, TypeItem]]:
+        """Get (file, item) for the first item with this exact name"""
+        entries = self._by_name.get(name)
+        return entries[0] if entries else None
+
+    def get_file(self, item: TypeItem) -> Optional[TypesFile]:
+        """Get the file that owns an item"""
+        owner = self._owner.get(id(item))
+        return owner[1] if owner else None
+
+    def files_containing(self, name: str, case_sensitive: bool = False) -> List[TypesFile]:
+        """Files that contain an item with this name (each file once, in load order)"""
+        if case_sensitive:
+            entries = self._by_name.get(name, [])
+        else:
+            entries = self._by_lower_name.get(name.lower(), [])
+
+        files = []
+        for types_file, _ in entries:
+            if not any(types_file is f for f in files):
+                files.append(types_file)
+        return files
+
+    def names(self) -> List[str]:
+        """All distinct item names"""
+        return list(self._by_name.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self._owner)
@@ -0,0 +1,234 @@
+"""
+Name Index
+Shared search index over item names: a sorted array of lower-case names for
+prefix lookups and trigram postings for substring and typo-tolerant lookups
+"""
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+# Minimum trigram similarity for a fuzzy match to be reported
+DEFAULT_MIN_SIMILARITY = 0.3
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigrams of a string as-is (used for substring candidates)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded_trigrams(text: str) -> Set[str]:
+    """Trigrams with word padding so short names and word starts still match"""
+    return _trigrams(f"  {text} ")
+
+
+class NameIndex:
+    """
+    Case-insensitive index of distinct item names.
+
+    A name may be added several times (the same item in several files);
+    it stays in the index until it was removed as often as it was added.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.clear()
+        for name in names:
+            self.add(name)
+
+    def clear(self):
+        """Remove all names"""
+        self._counts: Dict[str, int] = {}
+        self._by_lower: Dict[str, List[str]] = {}  # lower -> original spellings
+        self._sorted_lower: List[str] = []  # Prefix index (sorted lazily)
+        self._lower_dirty = False
+        self._postings: Dict[str, Set[str]] = {}  # trigram -> lower names
+        self._trigram_counts: Dict[str, int] = {}  # lower -> number of padded trigrams
+        self._sorted_names = None
+
+    # ---- Maintenance -------------------------------------------------------
+
+    def add(self, name: str):
+        """Add a name (or one more occurrence of it)"""
+        count = self._counts.get(name, 0)
+        self._counts[name] = count + 1
+        if count:
+            return
+
+        self._sorted_names = None
+        lower = name.lower()
+        spellings = self._by_lower.get(lower)
+        if spellings:
+            spellings.append(name)
+            return
+
+        self._by_lower[lower] = [name]
+        self._sorted_lower.append(lower)
+        self._lower_dirty = True
+        trigrams = _padded_trigrams(lower)
+        self._trigram_counts[lower] = len(trigrams)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(lower)
+
+    def remove(self, name: str):
+        """Remove one occurrence of a name"""
+        count = self._counts.get(name, 0)
+        if count > 1:
+            self._counts[name] = count - 1
+            return
+        if not count:
+            return
+
+        del self._counts[name]
+        self._sorted_names = None
+        lower = name.lower()
+        spellings = self._by_lower[lower]
+        spellings.remove(name)
+        if spellings:
+            return
+
+        del self._by_lower[lower]
+        sorted_lower = self._get_sorted_lower()
+        del sorted_lower[bisect_left(sorted_lower, lower)]
+        del self._trigram_counts[lower]
+        for trigram in _padded_trigrams(lower):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(lower)
+                if not postings:
+                    del self._postings[trigram]
+
+    # ---- Lookups -----------------------------------------------------------
+
+    def _get_sorted_lower(self) -> List[str]:
+        """Prefix index - bulk adds append, the sort happens once on first use"""
+        if self._lower_dirty:
+            self._sorted_lower.sort()
+            self._lower_dirty = False
+        return self._sorted_lower
+
+    @property
+    def names(self) -> List[str]:
+        """All distinct names, sorted"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._counts)
+        return self._sorted_names
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._counts
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _originals(self, lower_names: Iterable[str]) -> List[str]:
+        """Expand lower-case names to their original spellings"""
+        return [name for lower in lower_names for name in self._by_lower.get(lower, ())]
+
+    def exact(self, name: str) -> List[str]:
+        """Names equal to name ignoring case (for duplicate checks)"""
+        return list(self._by_lower.get(name.lower(), ()))
+
+    def prefix_lower(self, text: str) -> List[str]:
+        """Lower-case names starting with text, in sorted order"""
+        text = text.lower()
+        names = self._get_sorted_lower()
+        start = bisect_left(names, text)
+        # Every string with this prefix sorts before prefix + U+10FFFF
+        end = bisect_left(names, text + '\U0010ffff', start)
+        return names[start:end]
+
+    def prefix(self, text: str) -> List[str]:
+        """Names starting with text (ignoring case), in sorted order"""
+        return self._originals(self.prefix_lower(text))
+
+    def substring_estimate(self, text: str) -> int:
+        """Upper bound on the number of names containing text (cheap to compute)"""
+        text = text.lower()
+        if len(text) < 3:
+            return len(self._by_lower)
+        return min(len(self._postings.get(trigram, ())) for trigram in _trigrams(text))
+
+    def substring_lower(self, text: str) -> List[str]:
+        """Lower-case names containing text"""
+        text = text.lower()
+        if len(text) < 3:
+            # No full trigram to narrow by - short strings scan the names
+            return [name for name in self._get_sorted_lower() if text in name]
+
+        postings = []
+        for trigram in _trigrams(text):
+            names = self._postings.get(trigram)
+            if not names:
+                return []
+            postings.append(names)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for names in postings[1:]:
+            candidates &= names
+            if not candidates:
+                return []
+        # Trigrams only prove the pieces exist - verify the whole string
+        return sorted(name for name in candidates if text in name)
+
+    def substring(self, text: str) -> List[str]:
+        """Names containing text (ignoring case)"""
+        return self._originals(self.substring_lower(text))
+
+    def fuzzy_lower(self, text: str, limit: int = 20,
+                    min_similarity: float = DEFAULT_MIN_SIMILARITY) -> List[str]:
+        """
+        Lower-case names similar to text, tolerating typos - ranked by trigram
+        similarity (shared trigrams / all trigrams of both names)
+        """
+        query = _padded_trigrams(text.lower())
+        if not query:
+            return []
+
+        shared = Counter()
+        for trigram in query:
+            shared.update(self._postings.get(trigram, ()))
+
+        scored = []
+        for lower, common in shared.items():
+            similarity = common / (len(query) + self._trigram_counts[lower] - common)
+            if similarity >= min_similarity:
+                scored.append((-similarity, lower))
+        scored.sort()
+        return [lower for _, lower in scored[:limit]]
+
+    def fuzzy(self, text: str, limit: int = 20,
+              min_similarity: float = DEFAULT_MIN_SIMILARITY) -> List[str]:
+        """Names similar to text (ignoring case), most similar first"""
+        return self._originals(self.fuzzy_lower(text, limit, min_similarity))
+
+    def search(self, text: str, limit: int = 50) -> List[str]:
+        """
+        Ranked lookup for completers: exact match, then prefix matches
+        (shortest first), then other substring matches (earliest match first),
+        then fuzzy matches if there is still room
+        """
+        text = text.strip().lower()
+        if not text:
+            return self.names[:limit]
+
+        ranked: List[str] = []
+        seen = set()
+
+        def take(lower_names: Iterable[str]) -> bool:
+            for lower in lower_names:
+                if lower not in seen:
+                    seen.add(lower)
+                    ranked.append(lower)
+                    if len(ranked) >= limit:
+                        return True
+            return False
+
+        done = take([text] if text in self._by_lower else [])
+        if not done:
+            done = take(sorted(self.prefix_lower(text), key=lambda name: (len(name), name)))
+        if not done:
+            substring = self.substring_lower(text)
+            done = take(sorted(substring, key=lambda name: (name.find(text), len(name), name)))
+        if not done:
+            take(self.fuzzy_lower(text, limit))
+
+        return self._originals(ranked)[:limit]
@@ -2,12 +2,51 @@
 Type Item Data Model
 Represents a single type entry from types.xml
 """
+from collections import Counter
 from typing import List, Optional, Dict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 
+# Integer fields and 0/1 flags of TypeItem, in declaration order
+NUMERIC_FIELDS = ('nominal', 'lifetime', 'restock', 'min', 'quantmin', 'quantmax', 'cost')
+FLAG_FIELDS = ('count_in_cargo', 'count_in_hoarder', 'count_in_map',
+               'count_in_player', 'crafted', 'deloot')
+
+
+def _slotted(cls):
+    """
+    Recreate a dataclass with __slots__ instead of a per-instance __dict__
+    (dataclass(slots=True) needs Python 3.10). Defaults live on in __init__.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _drop_covered(entries: List[str], remaining: Counter) -> List[str]:
+    """
+    Entries not covered by a preserved user tag: remaining holds how many of
+    each entry are left, the first occurrences are the covered ones
+    """
+    skip = Counter(entries)
+    skip.subtract(remaining)
+    kept = []
+    for entry in entries:
+        if skip[entry] > 0:
+            skip[entry] -= 1
+        else:
+            kept.append(entry)
+    return kept
+
+
+@_slotted
 @dataclass
 class TypeItem:
-    """Represents a single type entry"""
+    """
+    Represents a single type entry.
+    Slotted - tens of thousands are loaded at once, so there is no per-item __dict__.
+    """
     name: str
     nominal: int = 0
     lifetime: int = 3600
@@ -95,46 +134,37 @@ class TypeItem:
         if self.category:
             lines.append(f'        <category name="{self.category}"/>')
         
-        # Initialize remaining lists
-        remaining_usage = self.usage.copy()
-        remaining_value = self.value.copy()
-        remaining_tag = self.tag.copy()
+        remaining_usage = self.usage
+        remaining_value = self.value
+        remaining_tag = self.tag
         
         # Handle user tags intelligently
         if limits_parser and self.original_users:
-            # Try to preserve user tags
+            # Try to preserve user tags - count the entries once instead of
+            # searching and removing from the lists for every user tag
+            available = {'usage': Counter(self.usage), 'value': Counter(self.value), 'tag': Counter(self.tag)}
             preserved_users = []
             
             for user_name in self.original_users:
                 user_def = limits_parser.expand_user(user_name)
                 
-                # Check if all components of this user are still present
-                all_present = True
-                if user_def['usage']:
-                    all_present = all_present and all(u in remaining_usage for u in user_def['usage'])
-                if user_def['value']:
-                    all_present = all_present and all(v in remaining_value for v in user_def['value'])
-                if user_def['tag']:
-                    all_present = all_present and all(t in remaining_tag for t in user_def['tag'])
+                # Keep the user tag if all of its components are still present
                 # Note: category in user tags is rare, skipping for now
-                
-                if all_present:
-                    # Keep this user tag
+                if all(available[kind][entry] > 0 for kind in available for entry in user_def[kind]):
                     preserved_users.append(user_name)
-                    # Remove these items from remaining lists
-                    for u in user_def['usage']:
-                        if u in remaining_usage:
-                            remaining_usage.remove(u)
-                    for v in user_def['value']:
-                        if v in remaining_value:
-                            remaining_value.remove(v)
-                    for t in user_def['tag']:
-                        if t in remaining_tag:
-                            remaining_tag.remove(t)
+                    for kind, counts in available.items():
+                        for entry in user_def[kind]:
+                            if counts[entry] > 0:
+                                counts[entry] -= 1
             
             # Export preserved user tags
             for user in preserved_users:
                 lines.append(f'        <user name="{user}"/>')
+            
+            if preserved_users:
+                remaining_usage = _drop_covered(self.usage, available['usage'])
+                remaining_value = _drop_covered(self.value, available['value'])
+                remaining_tag = _drop_covered(self.tag, available['tag'])
         
         # Export remaining individual tags as direct children (no wrapper)
         for u in remaining_usage:
@@ -16,6 +16,9 @@ class TypesFile:
         self.header_comments: List[str] = []  # Comments before <types>
         self.footer_comments: List[str] = []  # Comments after </types>
         self.item_comments: Dict[str, List[str]] = {}  # Comments before each item
+        # (original_content, its CommentLayout with the <type> spans) for
+        # incremental saving - stale once original_content is replaced
+        self.source_layout = None
     
     def add_item(self, item: TypeItem):
         """Add an item to this file"""
@@ -0,0 +1,162 @@
+"""
+Tests for the batch operations engine
+"""
+import random
+import time
+import unittest
+from core.batch_engine import BatchPlan, MULTIPLY, SET
+from models.type_item import TypeItem
+
+USAGES = ['Military', 'Town', 'Village', 'Farm']
+TAGS = ['floor', 'shelves']
+
+
+def make_items(count=500, seed=1):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        nominal = rng.randint(0, 40)
+        items.append(TypeItem(
+            name=f"Item{i}",
+            nominal=nominal,
+            min=rng.randint(0, nominal) if nominal else 0,
+            lifetime=rng.choice([3600, 7200]),
+            quantmin=rng.choice([-1, 30]),
+            category=rng.choice([None, 'tools', 'food']),
+            usage=rng.sample(USAGES, rng.randint(0, 3)),
+            tag=rng.sample(TAGS, rng.randint(0, 1)),
+            crafted=rng.randint(0, 1),
+        ))
+    return items
+
+
+def reference(items, plan):
+    """Per-item evaluation with the dialog's original rules"""
+    expected = {}
+    for position, item in enumerate(items):
+        changes = {}
+        new_nominal = item.nominal
+        for field_name, (mode, value) in plan.numeric.items():
+            old = getattr(item, field_name)
+            new = int(old * value) if mode == MULTIPLY else int(value)
+            if field_name == 'nominal':
+                new_nominal = new
+            changes[field_name] = (old, new)
+        if 'min' in changes:
+            changes['min'] = (item.min, min(changes['min'][1], new_nominal))
+        for field_name, value in plan.flags.items():
+            changes[field_name] = (getattr(item, field_name), value)
+        if plan.set_category:
+            changes['category'] = (item.category, plan.category)
+        for field_name in ('usage', 'value', 'tag'):
+            new = list(getattr(item, field_name))
+            for entry in plan.remove.get(field_name, []):
+                if entry in new:
+                    new.remove(entry)
+            for entry in plan.add.get(field_name, []):
+                if entry not in new:
+                    new.append(entry)
+            changes[field_name] = (list(getattr(item, field_name)), new)
+        changes = {name: (old, new) for name, (old, new) in changes.items()
+                   if (sorted(old) != sorted(new) if isinstance(old, list) else old != new)}
+        if changes:
+            expected[position] = changes
+    return expected
+
+
+class TestBatchPlan(unittest.TestCase):
+    """Test BatchPlan and BatchDiff"""
+
+    def setUp(self):
+        self.items = make_items()
+        self.plan = BatchPlan(
+            numeric={'nominal': (MULTIPLY, 0.5), 'min': (MULTIPLY, 1.5), 'quantmin': (SET, -1)},
+            flags={'crafted': 0},
+            set_category=True,
+            category='tools',
+            add={'usage': ['Coast', 'Town']},
+            remove={'usage': ['Farm'], 'tag': ['floor']},
+        )
+
+    def test_diff_matches_per_item_rules(self):
+        diff = self.plan.diff(self.items)
+        expected = reference(self.items, self.plan)
+        self.assertEqual(len(diff), len(expected))
+        self.assertEqual({self.items.index(item): changes for item, changes in diff.rows()}, expected)
+        self.assertEqual(diff.change_count, sum(len(changes) for changes in expected.values()))
+
+        first = diff.rows(3)
+        self.assertEqual([item for item, _ in first], diff.changed_items[:3])
+
+    def test_rows_on_demand(self):
+        diff = self.plan.diff(self.items)
+        all_rows = diff.rows()
+        self.assertEqual(diff.row(len(diff) - 1), all_rows[-1])
+        self.assertEqual(diff.row(7), all_rows[7])
+        self.assertEqual(diff.rows(5), all_rows[:5])
+
+    def test_statistics(self):
+        stats = self.plan.diff(self.items).statistics
+        expected = reference(self.items, self.plan)
+        new_nominal = [expected.get(p, {}).get('nominal', (0, item.nominal))[1]
+                       for p, item in enumerate(self.items)]
+        new_min = [expected.get(p, {}).get('min', (0, item.min))[1] for p, item in enumerate(self.items)]
+
+        self.assertEqual(stats.items, len(self.items))
+        self.assertEqual(stats.changed_items, len(expected))
+        self.assertEqual(stats.nominal_before, sum(item.nominal for item in self.items))
+        self.assertEqual(stats.nominal_after, sum(new_nominal))
+        self.assertEqual(stats.min_before, sum(item.min for item in self.items))
+        self.assertEqual(stats.min_after, sum(new_min))
+        self.assertEqual(stats.clamped_min, sum(1 for p, item in enumerate(self.items)
+                                                if int(item.min * 1.5) > new_nominal[p]))
+
+        # Every item ends up in 'tools': it gains the new total, the others lose theirs
+        before = {}
+        for item in self.items:
+            before[item.category] = before.get(item.category, 0) + item.nominal
+        expected_delta = {category: -total for category, total in before.items()}
+        expected_delta['tools'] = sum(new_nominal) - before.get('tools', 0)
+        self.assertEqual(stats.category_nominal_delta,
+                         {category: delta for category, delta in expected_delta.items() if delta})
+
+    def test_only_real_changes(self):
+        items = [TypeItem(name='A', nominal=10, min=5, cost=100), TypeItem(name='B', nominal=10, cost=50)]
+        diff = BatchPlan(numeric={'cost': (SET, 100), 'min': (SET, 20)}).diff(items)
+        self.assertEqual(diff.rows(), [(items[0], {'min': (5, 10)}),
+                                       (items[1], {'cost': (50, 100), 'min': (0, 10)})])
+        self.assertEqual(len(BatchPlan(numeric={'cost': (SET, 100)}).diff(items[:1])), 0)
+        self.assertTrue(BatchPlan().is_empty())
+        self.assertFalse(BatchPlan(remove={'tag': ['floor']}).is_empty())
+
+    def test_remove_drops_one_occurrence(self):
+        items = [TypeItem(name='A', usage=['Town', 'Farm', 'Town'], tag=['floor'])]
+        diff = BatchPlan(remove={'usage': ['Town'], 'tag': ['floor']}).diff(items)
+        self.assertEqual(diff.rows(), [(items[0], {'usage': (['Town', 'Farm', 'Town'], ['Farm', 'Town']),
+                                                   'tag': (['floor'], [])})])
+
+    def test_apply_and_revert(self):
+        before = [item.clone() for item in self.items]
+        diff = self.plan.diff(self.items)
+        changed = diff.apply()
+
+        self.assertTrue(all(item.modified for item in changed))
+        for item, changes in reference(before, self.plan).items():
+            for field_name, (_, new) in changes.items():
+                self.assertEqual(getattr(self.items[item], field_name), new)
+
+        diff.revert()
+        self.assertEqual(self.items, before)
+
+    def test_large_selection_is_fast(self):
+        items = make_items(20000, seed=2)
+        start = time.perf_counter()
+        diff = self.plan.diff(items)
+        diff.rows(100)
+        diff.apply()
+        # Generous bound for slow CI machines; typical runs are far below it
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
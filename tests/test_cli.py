@@ -0,0 +1,177 @@
+"""
+Tests for the headless command line tool and economy session
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import cli
+from config.local_file_manager import LocalFileManager
+from core.economy_session import EconomySession
+from core.batch_engine import MULTIPLY, SET
+from core.tracing import tracer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ECONOMY_CORE = '''<economycore>
+    <ce folder="custom"><file name="types.xml" type="types"/></ce>
+</economycore>'''
+
+LIMITS = '''<lists>
+    <categories><category name="weapons"/><category name="food"/></categories>
+    <tags><tag name="floor"/></tags>
+    <usageflags><usage name="Military"/><usage name="Town"/></usageflags>
+    <valueflags><value name="Tier3"/></valueflags>
+</lists>'''
+
+VANILLA_TYPES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<types>
+    <type name="AKM">
+        <nominal>5</nominal>
+        <min>2</min>
+        <category name="weapons"/>
+        <usage name="Military"/>
+    </type>
+    <type name="Apple">
+        <nominal>20</nominal>
+        <category name="food"/>
+        <usage name="Town"/>
+    </type>
+</types>
+'''
+
+CUSTOM_TYPES = '''<?xml version="1.0"?>
+<types>
+    <type name="M4A1"><nominal>3</nominal><category name="weapons"/><usage name="Military"/></type>
+</types>
+'''
+
+
+class TestExpressions(unittest.TestCase):
+    """Test filter and edit expression parsing"""
+
+    def test_parse_filter(self):
+        query = cli.parse_filter(['category=weapons', 'usage=Military, Town', 'tag=floor', 'nominal>=2',
+                                  'nominal <= 10', 'Crafted=1', 'name=AK', 'file=db/types.xml'], True)
+        self.assertEqual((query.category, query.usage, query.tags), ('weapons', ['Military', 'Town'], ['floor']))
+        self.assertEqual((query.nominal_min, query.nominal_max, query.flags), (2, 10, {'crafted': 1}))
+        self.assertEqual((query.search_text, query.source_file, query.use_or_logic), ('AK', 'db/types.xml', True))
+        for bad in ('colour=red', 'category*=2', 'nominal>=x', 'nonsense'):
+            with self.assertRaises(ValueError):
+                cli.parse_filter([bad])
+
+    def test_parse_edit(self):
+        plan = cli.parse_edit(['nominal*=0.5', 'lifetime=7200', 'deloot=1', 'category=', 'usage+=Town,Village',
+                               'tag-=floor'])
+        self.assertEqual(plan.numeric, {'nominal': (MULTIPLY, 0.5), 'lifetime': (SET, 7200)})
+        self.assertEqual(plan.flags, {'deloot': 1})
+        self.assertTrue(plan.set_category)
+        self.assertIsNone(plan.category)
+        self.assertEqual((plan.add, plan.remove), ({'usage': ['Town', 'Village']}, {'tag': ['floor']}))
+        for bad in ('nominal=-1', 'lifetime*=x', 'usage=Town', 'name=AKM'):
+            with self.assertRaises(ValueError):
+                cli.parse_edit([bad])
+
+
+class TestCommandLine(unittest.TestCase):
+    """Test the dayz-types command against a local mission folder"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mission = os.path.join(self.tmp.name, 'mission')
+        self.backups = os.path.join(self.tmp.name, 'backups')
+        os.makedirs(os.path.join(self.mission, 'db'))
+        os.makedirs(os.path.join(self.mission, 'custom'))
+        self.write('cfgeconomycore.xml', ECONOMY_CORE)
+        self.write('cfglimitsdefinition.xml', LIMITS)
+        self.write('db/types.xml', VANILLA_TYPES)
+        self.write('custom/types.xml', CUSTOM_TYPES)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        with open(os.path.join(self.mission, relative_path), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def read(self, relative_path):
+        with open(os.path.join(self.mission, relative_path), encoding='utf-8') as f:
+            return f.read()
+
+    def run_cli(self, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            code = cli.main([self.mission, '--backup-dir', self.backups, *args])
+        return code, output.getvalue()
+
+    def test_filter_edit_and_save(self):
+        code, output = self.run_cli('--where', 'category=weapons', '--set', 'nominal*=2', '--set', 'min=4')
+        self.assertEqual(code, 0, output)
+        self.assertIn('Selected 2 item(s)', output)
+        self.assertIn('nominal 8 -> 16', output)
+
+        vanilla = self.read('db/types.xml')
+        self.assertIn('<nominal>10</nominal>', vanilla)
+        self.assertIn('<min>4</min>', vanilla)
+        # Apple is untouched - incremental writer keeps its original text
+        self.assertIn(VANILLA_TYPES[VANILLA_TYPES.index('    <type name="Apple">'):], vanilla)
+        self.assertIn('<nominal>6</nominal>', self.read('custom/types.xml'))
+        self.assertEqual(len([name for name in os.listdir(self.backups) if name.endswith('types.xml')]), 2)
+
+    def test_dry_run_and_validation_leave_files(self):
+        code, output = self.run_cli('--where', 'name=Apple', '--set', 'nominal=1', '--dry-run')
+        self.assertEqual(code, 0, output)
+        self.assertIn('Would save db/types.xml', output)
+        self.assertEqual(self.read('db/types.xml'), VANILLA_TYPES)
+        self.assertFalse(os.path.exists(self.backups))
+
+        code, output = self.run_cli('--set', 'usage+=Beach', '--validate')
+        self.assertEqual(code, 1)
+        self.assertIn("invalid usage 'Beach'", output)
+        self.assertEqual(self.read('db/types.xml'), VANILLA_TYPES)
+
+        self.assertEqual(self.run_cli('--set', 'bogus=1')[0], 2)
+        self.assertEqual(cli.main([os.path.join(self.tmp.name, 'missing')]), 2)
+
+    def test_session_skips_unchanged_files(self):
+        manager = LocalFileManager()
+        self.assertTrue(manager.connect(self.mission)[0])
+        session = EconomySession(manager)
+        self.assertEqual(session.load(), ["cfglimitsdefinitionuser.xml: Failed to read file "
+                                          "cfglimitsdefinitionuser.xml: File not found: cfglimitsdefinitionuser.xml"])
+        self.assertEqual([types_file.path for types_file in session.types_files], ['db/types.xml', 'custom/types.xml'])
+
+        akm = session.item_registry.get('AKM')
+        akm.nominal = 5
+        akm.modified = True  # Modified, but back to its original value
+        self.assertEqual(session.save(), ([], {}))
+        self.assertFalse(akm.modified)
+
+    def test_trace_export(self):
+        self.addCleanup(tracer.enable, False)
+        self.addCleanup(tracer.clear)
+        trace_path = os.path.join(self.tmp.name, 'trace.json')
+        code, output = self.run_cli('--where', 'category=weapons', '--set', 'nominal*=2', '--trace', trace_path)
+        self.assertEqual(code, 0, output)
+        self.assertIn('Trace: ', output)
+
+        with open(trace_path, encoding='utf-8') as f:
+            names = {event['name'] for event in json.load(f)['traceEvents']}
+        self.assertTrue({'io.read', 'parse.file', 'parse.items', 'filter.query', 'save.render', 'save.write',
+                         'save.backup'} <= names, names)
+
+    def test_no_gui_imports(self):
+        script = ("import sys, cli; cli.main(sys.argv[1:]); "
+                  "assert not [m for m in sys.modules if m.startswith(('PyQt5', 'paramiko', 'cryptography'))]")
+        result = subprocess.run([sys.executable, '-c', script, self.mission, '--where', 'usage=Town', '--list'],
+                                cwd=ROOT, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('Apple', result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
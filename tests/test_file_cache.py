@@ -0,0 +1,119 @@
+"""
+Tests for the content-addressed file cache
+"""
+import os
+import tempfile
+import time
+import unittest
+from config.file_cache import FileCache, content_hash
+
+
+class TestFileCache(unittest.TestCase):
+    """Test FileCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, 'cache')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_get_roundtrip(self):
+        cache = FileCache(self.cache_dir)
+        content = '<types>\n    <type name="Apple"/>\n</types>' * 50
+        digest = cache.put('db/types.xml', 123.0, content)
+
+        cached = cache.get('db/types.xml')
+        self.assertEqual(cached['timestamp'], 123.0)
+        self.assertEqual(cached['content'], content)
+        self.assertEqual(cached['hash'], digest)
+        self.assertEqual(digest, content_hash(content))
+        self.assertIsNone(cache.get('missing.xml'))
+
+    def test_index_persists_across_instances(self):
+        FileCache(self.cache_dir).put('types.xml', 1.0, 'abc')
+        cached = FileCache(self.cache_dir).get('types.xml')
+        self.assertEqual(cached['content'], 'abc')
+
+    def test_identical_content_shares_one_blob(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('a/types.xml', 1.0, 'same')
+        cache.put('b/types.xml', 2.0, 'same')
+        self.assertEqual(cache.get_statistics()['blobs'], 1)
+
+        # Removing one path keeps the blob for the other
+        cache.remove('a/types.xml')
+        self.assertEqual(cache.get('b/types.xml')['content'], 'same')
+
+    def test_replaced_content_drops_old_blob(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('types.xml', 1.0, 'old')
+        cache.put('types.xml', 2.0, 'new')
+        stats = cache.get_statistics()
+        self.assertEqual(stats['files'], 1)
+        self.assertEqual(stats['blobs'], 1)
+        self.assertEqual(cache.get('types.xml')['content'], 'new')
+
+    def test_evicts_least_recently_used_over_size_budget(self):
+        cache = FileCache(self.cache_dir, max_bytes=0)
+        # Incompressible-ish content so each blob has a predictable size
+        blobs = {f'f{i}.xml': os.urandom(2000).hex() for i in range(3)}
+        for path, content in blobs.items():
+            cache.put(path, 1.0, content)
+            time.sleep(0.01)
+        blob_size = cache.get_statistics()['total_size_bytes'] // 3
+
+        cache.max_bytes = blob_size * 2 + 10
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get_entry('f0.xml'))
+        self.assertIsNotNone(cache.get_entry('f2.xml'))
+
+    def test_evicts_by_age(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('old.xml', 1.0, 'old')
+        cache.put('new.xml', 1.0, 'new')
+        cache._index['old.xml']['last_used'] = time.time() - 60 * 24 * 60 * 60
+
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get('old.xml'))
+        self.assertIsNotNone(cache.get('new.xml'))
+
+    def test_hits_are_flushed_once(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('types.xml', 1.0, 'content')
+        index_file = os.path.join(self.cache_dir, 'index.json')
+        written = os.stat(index_file).st_mtime_ns
+        os.utime(index_file, ns=(written - 10 ** 9, written - 10 ** 9))
+
+        time.sleep(0.01)
+        cache.get('types.xml')
+        cache.get('types.xml')
+        self.assertEqual(os.stat(index_file).st_mtime_ns, written - 10 ** 9)  # Not rewritten per hit
+
+        cache.flush()
+        last_used = cache.get_entry('types.xml')['last_used']
+        self.assertEqual(FileCache(self.cache_dir).get_entry('types.xml')['last_used'], last_used)
+
+    def test_shared_blob_survives_partial_eviction(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('a.xml', 1.0, 'same')
+        cache.put('b.xml', 1.0, 'same')
+        cache.put('c.xml', 1.0, 'other')
+        cache._index['a.xml']['last_used'] = 0
+        cache._index['c.xml']['last_used'] = 0
+
+        self.assertEqual(cache.evict(), 2)
+        self.assertEqual(cache.get('b.xml')['content'], 'same')
+        self.assertEqual(cache.get_statistics()['blobs'], 1)
+        self.assertFalse(cache._blob_path(content_hash('other')).exists())
+
+    def test_clear_removes_everything(self):
+        cache = FileCache(self.cache_dir)
+        cache.put('types.xml', 1.0, 'content')
+        cache.clear()
+        self.assertIsNone(cache.get('types.xml'))
+        self.assertEqual(cache.get_statistics()['files'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for loading files on a background worker behind the progress dialog
+"""
+import os
+import time
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QWidget
+from core.parallel_loader import ParallelLoader
+from tests.test_parallel_loader import FakeFileManager, make_types_xml
+from ui.loading_progress_dialog import LoadingProgressDialog
+from ui.main_window import MainWindow
+
+
+class TestRunParallelLoad(unittest.TestCase):
+    """Test MainWindow.run_parallel_load (only needs a parent widget, not a full window)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.parent = QWidget()
+        self.addCleanup(self.parent.deleteLater)
+        paths = [f"db/types{i}.xml" for i in range(20)]
+        self.paths = paths
+        self.file_manager = FakeFileManager({path: make_types_xml(path) for path in paths},
+                                            delays={path: 0.05 for path in paths})
+        self.loader = ParallelLoader(self.file_manager, lambda content, path: path, max_workers=2)
+
+    def run_load(self, close_dialog):
+        QTimer.singleShot(150, lambda: close_dialog(QApplication.activeModalWidget()))
+        return MainWindow.run_parallel_load(self.parent, self.loader, self.paths, "Loading Files")
+
+    def assert_cancelled(self, results):
+        self.assertTrue(self.loader.is_cancelled())
+        self.assertLess(len(results), len(self.paths))
+        self.assertLessEqual({result.path for result in results}, set(self.file_manager.reads))
+
+        # The worker has stopped - nothing reads through the file manager any more
+        reads = len(self.file_manager.reads)
+        time.sleep(0.2)
+        self.assertEqual(len(self.file_manager.reads), reads)
+
+    def test_cancel_button(self):
+        self.assert_cancelled(self.run_load(lambda dialog: dialog.cancel_btn.click()))
+
+    def test_escape_cancels(self):
+        def press_escape(dialog):
+            self.assertIsInstance(dialog, LoadingProgressDialog)
+            QTest.keyClick(dialog, Qt.Key_Escape)
+            self.assertTrue(dialog.is_cancelled())
+
+        self.assert_cancelled(self.run_load(press_escape))
+
+    def test_completes(self):
+        self.file_manager.delays = {}
+        results = MainWindow.run_parallel_load(self.parent, self.loader, self.paths, "Loading Files")
+        self.assertEqual([result.path for result in results], self.paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Tests for the inverted-index filter engine
+"""
+import random
+import unittest
+from core.filter_engine import FilterEngine, FilterQuery, FLAG_FIELDS
+from models.name_index import NameIndex
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+CATEGORIES = [None, 'weapons', 'food', 'tools']
+TAGS = ['floor', 'shelves', 'ground']
+USAGES = ['Military', 'Town', 'Village', 'Farm']
+VALUES = ['Tier1', 'Tier2', 'Tier3', 'Tier4']
+
+
+def make_files(seed=1, files=3, items_per_file=300):
+    rng = random.Random(seed)
+    types_files = []
+    for f in range(files):
+        types_file = TypesFile(f"mod{f}/types.xml")
+        for i in range(items_per_file):
+            item = TypeItem(
+                name=f"{rng.choice(['AKM', 'Apple', 'Bandage', 'Axe'])}_{f}_{i}",
+                nominal=rng.randint(0, 50),
+                category=rng.choice(CATEGORIES),
+                tag=rng.sample(TAGS, rng.randint(0, 2)),
+                usage=rng.sample(USAGES, rng.randint(0, 2)),
+                value=rng.sample(VALUES, rng.randint(0, 2)),
+            )
+            for flag in FLAG_FIELDS:
+                setattr(item, flag, rng.randint(0, 1))
+            types_file.add_item(item)
+        types_files.append(types_file)
+    return types_files
+
+
+def reference(types_files, query):
+    """Filter the way TypesEditorTab did before the engine"""
+    results = []
+    for types_file in types_files:
+        for item in types_file.items:
+            if any(getattr(item, flag) != value for flag, value in query.flags.items()):
+                continue
+            if item.matches_filter(search_text=query.search_text, category=query.category,
+                                   tags=query.tags, usage=query.usage, value=query.value,
+                                   source_file=query.source_file, nominal_min=query.nominal_min,
+                                   nominal_max=query.nominal_max, use_or_logic=query.use_or_logic):
+                results.append(item)
+    return results
+
+
+class TestFilterEngine(unittest.TestCase):
+    """Test FilterEngine"""
+
+    def setUp(self):
+        self.types_files = make_files()
+        self.engine = FilterEngine(self.types_files)
+
+    def assertSameItems(self, query):
+        expected = reference(self.types_files, query)
+        actual = self.engine.query(query)
+        self.assertEqual([id(i) for i in actual], [id(i) for i in expected], query)
+
+    def test_empty_query_returns_everything_in_order(self):
+        self.assertSameItems(FilterQuery())
+        self.assertEqual(len(self.engine), 900)
+
+    def test_matches_reference_for_random_queries(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            query = FilterQuery(
+                search_text=rng.choice(['', 'akm', 'APP', '_1_', 'zzz', '2_29']),
+                category=rng.choice(['', 'weapons', 'food', 'missing']),
+                tags=rng.sample(TAGS, rng.randint(0, 2)),
+                usage=rng.sample(USAGES, rng.randint(0, 2)),
+                value=rng.sample(VALUES, rng.randint(0, 1)),
+                source_file=rng.choice(['', 'mod1/types.xml']),
+                nominal_min=rng.choice([None, 0, 10, 49]),
+                nominal_max=rng.choice([None, 5, 30, 50]),
+                flags={flag: 1 for flag in rng.sample(FLAG_FIELDS, rng.randint(0, 2))},
+                use_or_logic=rng.random() < 0.5,
+            )
+            self.assertSameItems(query)
+
+    def test_nominal_ranges_across_blocks(self):
+        for nominal_min, nominal_max in [(0, 0), (3, 47), (10, 9), (None, 25), (26, None)]:
+            self.assertSameItems(FilterQuery(nominal_min=nominal_min, nominal_max=nominal_max))
+
+    def test_update_item_reindexes_edits(self):
+        item = self.types_files[1].items[5]
+        item.category = 'brand_new'
+        item.tag = ['attic']
+        item.nominal = 999
+        item.crafted = 1
+        item.name = 'RenamedThing'
+        self.engine.update_item(item)
+
+        self.assertEqual(self.engine.query(FilterQuery(category='brand_new')), [item])
+        self.assertEqual(self.engine.query(FilterQuery(tags=['attic'])), [item])
+        self.assertEqual(self.engine.query(FilterQuery(nominal_min=999)), [item])
+        self.assertEqual(self.engine.query(FilterQuery(search_text='renamed', flags={'crafted': 1})), [item])
+        self.assertSameItems(FilterQuery(nominal_min=10, nominal_max=40))
+        self.assertSameItems(FilterQuery(search_text='_1_'))
+
+    def test_search_through_name_index(self):
+        names = (item.name for types_file in self.types_files for item in types_file.items)
+        self.engine = FilterEngine(self.types_files, NameIndex(names))
+        for search_text in ['akm', 'APP', '_1_', 'zzz', '2_29', 'ax', 'e_2_1']:
+            self.assertSameItems(FilterQuery(search_text=search_text))
+
+    def test_active_filter_count(self):
+        query = FilterQuery(search_text='a', tags=['floor'], nominal_min=1, nominal_max=5,
+                            flags={'crafted': 1, 'deloot': 1})
+        self.assertEqual(query.active_filter_count(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
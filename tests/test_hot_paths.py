@@ -0,0 +1,71 @@
+"""
+Tests for the synthetic mission generator and the hot path benchmarks
+"""
+import os
+import tempfile
+import unittest
+from benchmarks.hot_paths import Regression, compare, run
+from benchmarks.synthetic_mission import MissionSpec, generate_mission, write_mission
+from config.local_file_manager import LocalFileManager
+from core.economy_session import EconomySession
+from core.random_presets_parser import RandomPresetsParser
+from core.spawnabletypes_parser import SpawnableTypesParser
+
+SMALL = MissionSpec(types_files=2, items_per_file=60, user_groups=3, spawnable_types=30, presets=6)
+
+
+class TestSyntheticMission(unittest.TestCase):
+    """Test the generated missions"""
+
+    def test_deterministic(self):
+        self.assertEqual(generate_mission(SMALL), generate_mission(SMALL))
+        other_seed = MissionSpec(**dict(SMALL.__dict__, seed=2))
+        self.assertNotEqual(generate_mission(SMALL)['db/types.xml'], generate_mission(other_seed)['db/types.xml'])
+
+    def test_mission_loads_and_validates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            files = write_mission(tmp, SMALL)
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'custom', 'types_1.xml')))
+
+            manager = LocalFileManager()
+            self.assertTrue(manager.connect(tmp)[0])
+            session = EconomySession(manager)
+            self.assertEqual(session.load(), [])
+            self.assertEqual(len(session.items), 120)
+            self.assertEqual(session.validate(), [])
+            # Some items take their usages from user groups
+            self.assertTrue(any(item.original_users for item in session.items))
+
+        spawnable = SpawnableTypesParser.parse(files['db/cfgspawnabletypes.xml'], 'db/cfgspawnabletypes.xml')
+        self.assertEqual(len(spawnable.types), 30)
+        self.assertTrue(any(block.items for spawnable_type in spawnable.types
+                            for block in spawnable_type.cargo_blocks + spawnable_type.attachments_blocks))
+        presets = RandomPresetsParser.parse(files['cfgrandompresets.xml'], 'cfgrandompresets.xml')
+        self.assertEqual(len(presets.cargo_presets) + len(presets.attachments_presets), 6)
+
+
+class TestHotPaths(unittest.TestCase):
+    """Test the benchmark run and baseline comparison"""
+
+    def test_run(self):
+        result = run(SMALL, repeat=1, only='filter.query.')
+        self.assertEqual(sorted(result['results']), ['filter.query.category', 'filter.query.combined',
+                                                     'filter.query.or', 'filter.query.search'])
+        self.assertEqual(result['meta']['mission']['items_per_file'], 60)
+        for timing in result['results'].values():
+            self.assertGreater(timing['best'], 0)
+            self.assertLessEqual(timing['best'], timing['median'])
+
+    def test_compare(self):
+        baseline = {'results': {'types.parse': {'best': 1.0}, 'filter.index': {'best': 0.1},
+                                'batch.diff': {'best': 0.2}},
+                    'thresholds': {'filter.index': 1.0}}
+        current = {'results': {'types.parse': {'best': 1.3}, 'filter.index': {'best': 0.19},
+                               'batch.diff': {'best': 0.21}, 'presets.parse': {'best': 5.0}}}
+        self.assertEqual(compare(current, baseline), [Regression('types.parse', 1.0, 1.3, 0.25)])
+        self.assertEqual(compare(current, baseline, threshold=0.5), [])
+        self.assertAlmostEqual(Regression('types.parse', 1.0, 1.3, 0.25).ratio, 1.3)
+
+
+if __name__ == '__main__':
+    unittest.main()
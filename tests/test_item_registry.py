@@ -0,0 +1,66 @@
+"""
+Tests for the item registry
+"""
+import unittest
+from models.item_registry import ItemRegistry
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+
+def make_file(path, *names):
+    types_file = TypesFile(path)
+    for name in names:
+        types_file.add_item(TypeItem(name=name))
+    return types_file
+
+
+class TestItemRegistry(unittest.TestCase):
+    """Test ItemRegistry"""
+
+    def setUp(self):
+        self.vanilla = make_file('db/types.xml', 'Apple', 'AKM')
+        self.mod = make_file('mods/types.xml', 'akm', 'Banana')
+        self.registry = ItemRegistry([self.vanilla, self.mod])
+
+    def test_lookup_by_name_and_owner(self):
+        apple = self.vanilla.items[0]
+        self.assertIs(self.registry.get('Apple'), apple)
+        self.assertEqual(self.registry.get_with_file('Banana'), (self.mod, self.mod.items[1]))
+        self.assertIs(self.registry.get_file(self.mod.items[0]), self.mod)
+        self.assertIsNone(self.registry.get('Pear'))
+        self.assertIsNone(self.registry.get_file(TypeItem(name='Apple')))
+        self.assertEqual(len(self.registry), 4)
+
+    def test_first_registration_wins_for_duplicates(self):
+        override = TypeItem(name='Apple')
+        self.mod.add_item(override)
+        self.registry.register(override, self.mod)
+
+        self.assertIs(self.registry.get('Apple'), self.vanilla.items[0])
+        self.assertEqual(self.registry.files_containing('apple'), [self.vanilla, self.mod])
+
+    def test_files_containing_is_case_insensitive_by_default(self):
+        self.assertEqual(self.registry.files_containing('AKM'), [self.vanilla, self.mod])
+        self.assertEqual(self.registry.files_containing('AKM', case_sensitive=True), [self.vanilla])
+
+    def test_unregister_and_rename(self):
+        banana = self.mod.items[1]
+        self.registry.rename(banana, 'Plantain')
+        self.assertEqual(banana.name, 'Plantain')
+        self.assertNotIn('Banana', self.registry)
+        self.assertIs(self.registry.get('Plantain'), banana)
+        self.assertIs(self.registry.get_file(banana), self.mod)
+
+        self.registry.unregister(banana)
+        self.assertNotIn('Plantain', self.registry)
+        self.assertIsNone(self.registry.get_file(banana))
+        self.assertEqual(self.registry.files_containing('plantain'), [])
+
+    def test_rebuild_replaces_index(self):
+        self.registry.rebuild([self.mod])
+        self.assertIsNone(self.registry.get('Apple'))
+        self.assertEqual(sorted(self.registry.names()), ['Banana', 'akm'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for the columnar item store
+"""
+import random
+import unittest
+from core import item_store
+from core.filter_engine import FilterEngine, FilterQuery
+from core.item_store import COLUMNS, ItemStore
+from models.type_item import TypeItem
+from models.types_file import TypesFile
+
+CATEGORIES = [None, 'weapons', 'food', 'tools']
+TAGS = ['floor', 'shelves', 'ground']
+
+
+def make_files(seed=1, files=3, items_per_file=200):
+    rng = random.Random(seed)
+    types_files = []
+    for f in range(files):
+        types_file = TypesFile(f"mod{f}/types.xml")
+        for i in range(items_per_file):
+            types_file.add_item(TypeItem(
+                name=f"Item_{f}_{i}",
+                nominal=rng.randint(0, 50),
+                min=rng.randint(0, 10),
+                cost=rng.randint(0, 200),
+                category=rng.choice(CATEGORIES),
+                tag=rng.sample(TAGS, rng.randint(0, 2)),
+                crafted=rng.randint(0, 1),
+                modified=rng.random() < 0.1,
+            ))
+        types_files.append(types_file)
+    return types_files
+
+
+def reference_groups(items, key, name):
+    """Group the items with plain loops"""
+    groups = {}
+    for item in items:
+        entries = getattr(item, key)
+        for entry in (set(entries) if isinstance(entries, list) else [entries]):
+            group = groups.setdefault(entry, {'count': 0, name: 0})
+            group['count'] += 1
+            group[name] += getattr(item, name)
+    return groups
+
+
+class TestItemStore(unittest.TestCase):
+    """Test ItemStore (NumPy is used when installed, results are the same)"""
+
+    def setUp(self):
+        self.files = make_files()
+        self.items = [item for types_file in self.files for item in types_file.items]
+        self.store = ItemStore(self.items)
+
+    def test_totals(self):
+        for name in COLUMNS:
+            self.assertEqual(self.store.total(name), sum(getattr(item, name) for item in self.items))
+        mask = sum(1 << row for row in range(0, len(self.items), 3))
+        chosen = self.items[::3]
+        self.assertEqual(self.store.totals(('nominal', 'min'), mask),
+                         {'nominal': sum(item.nominal for item in chosen),
+                          'min': sum(item.min for item in chosen)})
+        self.assertEqual(self.store.count(mask), len(chosen))
+        self.assertEqual(self.store.total('nominal', 0), 0)
+
+    def test_group_by(self):
+        for key in ('category', 'source_file', 'tag'):
+            self.assertEqual(self.store.group_by(key, ('cost',)),
+                             reference_groups(self.items, key, 'cost'))
+        mask = sum(1 << row for row in range(1, len(self.items), 2))
+        self.assertEqual(self.store.group_by('tag', ('nominal',), mask),
+                         reference_groups(self.items[1::2], 'tag', 'nominal'))
+        with self.assertRaises(ValueError):
+            self.store.group_by('name')
+
+    def test_modified_counts_follow_updates(self):
+        expected = sum(1 for item in self.items if item.modified)
+        self.assertEqual(self.store.modified_count, expected)
+
+        item = next(item for item in self.files[1].items if not item.modified)
+        item.modified = True
+        item.nominal += 1000
+        item.tag = ['floor', 'new_tag']
+        self.store.update_item(item)
+        self.assertEqual(self.store.modified_count, expected + 1)
+        self.assertEqual(self.store.modified_count_for('mod1/types.xml'),
+                         len(self.files[1].get_modified_items()))
+        self.assertEqual(self.store.total('nominal'), sum(i.nominal for i in self.items))
+        self.assertEqual(self.store.group_by('tag')['new_tag'], {'count': 1, 'nominal': item.nominal})
+
+        for item in self.items:
+            item.modified = False
+        self.store.update_items(self.items)
+        self.assertEqual(self.store.modified_count, 0)
+        self.assertEqual(self.store.modified_count_for('unknown.xml'), 0)
+
+    def test_python_fallback_matches(self):
+        saved, item_store.np = item_store.np, None
+        try:
+            store = ItemStore(self.items)
+            mask = sum(1 << row for row in range(0, len(self.items), 5))
+            self.assertEqual(store.totals(COLUMNS, mask), self.store.totals(COLUMNS, mask))
+            self.assertEqual(store.group_by('category', ('nominal', 'min'), mask),
+                             self.store.group_by('category', ('nominal', 'min'), mask))
+        finally:
+            item_store.np = saved
+
+    def test_empty(self):
+        store = ItemStore()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.total('nominal', 0), 0)
+        self.assertEqual(store.group_by('tag'), {})
+
+
+class TestFilterEngineStore(unittest.TestCase):
+    """The filter engine keeps its store in sync with the items it indexes"""
+
+    def test_query_mask_selects_store_rows(self):
+        files = make_files(seed=2)
+        engine = FilterEngine(files)
+        query = FilterQuery(category='food')
+        mask = engine.query_mask(query)
+        items = engine.items_for_mask(mask)
+        self.assertEqual(engine.store.total('nominal', mask), sum(item.nominal for item in items))
+
+        items[0].nominal += 7
+        items[0].modified = True
+        engine.update_item(items[0])
+        self.assertEqual(engine.store.total('nominal', mask), sum(item.nominal for item in items))
+        self.assertEqual(engine.store.modified_count,
+                         sum(len(types_file.get_modified_items()) for types_file in files))
+
+
+if __name__ == '__main__':
+    unittest.main()
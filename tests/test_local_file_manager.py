@@ -0,0 +1,84 @@
+"""
+Tests for the local file manager
+"""
+import os
+import tempfile
+import unittest
+from config.local_file_manager import LocalFileManager
+
+
+class TestLocalFileManager(unittest.TestCase):
+    """Test LocalFileManager"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, 'DB'))
+        os.makedirs(os.path.join(self.root, 'mods', 'Weapons'))
+        self.write('cfgeconomycore.xml', '<economycore/>')
+        self.write('DB/types.xml', '<types/>')
+        self.write('mods/Weapons/Types.xml', '<types></types>')
+
+        self.fm = LocalFileManager()
+        success, message = self.fm.connect(self.root)
+        self.assertTrue(success, message)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        with open(os.path.join(self.root, relative_path), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_stat_many_resolves_case_insensitively(self):
+        stats = self.fm.stat_many(['db/types.xml', 'mods/weapons/types.xml',
+                                   'cfgeconomycore.xml', 'db/missing.xml'])
+
+        self.assertEqual(stats['db/types.xml']['size'], len('<types/>'))
+        self.assertEqual(stats['db/types.xml']['path'], os.path.join(self.root, 'DB', 'types.xml'))
+        self.assertEqual(stats['mods/weapons/types.xml']['path'],
+                         os.path.join(self.root, 'mods', 'Weapons', 'Types.xml'))
+        self.assertEqual(stats['cfgeconomycore.xml']['mtime'],
+                         os.path.getmtime(os.path.join(self.root, 'cfgeconomycore.xml')))
+        self.assertIsNone(stats['db/missing.xml'])
+
+    def test_stat_many_matches_get_file_mtime(self):
+        stats = self.fm.stat_many(['DB/types.xml'])
+        self.assertEqual(stats['DB/types.xml']['mtime'], self.fm.get_file_mtime('db/TYPES.xml'))
+
+    def test_write_uses_existing_directory_case(self):
+        self.fm.write_file('db/new.xml', '<types/>')
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'DB', 'new.xml')))
+
+        # A new directory keeps the provided case
+        self.fm.write_file('NewMod/types.xml', '<types/>')
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'NewMod', 'types.xml')))
+
+    def test_write_replaces_atomically(self):
+        target = os.path.join(self.root, 'DB', 'types.xml')
+        os.chmod(target, 0o640)
+
+        self.fm.write_file('db/types.xml', '<types>updated</types>')
+
+        with open(target, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<types>updated</types>')
+        self.assertEqual(os.stat(target).st_mode & 0o777, 0o640)
+        # No temp files left behind
+        self.assertEqual(sorted(os.listdir(os.path.dirname(target))), ['types.xml'])
+
+    def test_read_many_and_write_many(self):
+        results = self.fm.write_many({'db/types.xml': '<types>new</types>', 'NewMod/types.xml': '<types/>'})
+        self.assertTrue(all(success for success, _ in results.values()))
+
+        contents = self.fm.read_many(['DB/types.xml', 'NewMod/TYPES.xml', 'db/missing.xml'])
+        self.assertEqual(contents['DB/types.xml'], (True, '<types>new</types>'))
+        self.assertEqual(contents['NewMod/TYPES.xml'], (True, '<types/>'))
+        self.assertFalse(contents['db/missing.xml'][0])
+
+    def test_disconnected_returns_no_stats(self):
+        self.fm.disconnect()
+        self.assertEqual(self.fm.stat_many(['db/types.xml']), {'db/types.xml': None})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the parsed-model cache
+"""
+import tempfile
+import unittest
+from unittest import mock
+from config import model_cache
+from config.model_cache import ModelCache
+from core.limits_parser import LimitsParser
+from core.xml_parser import TypesParser
+from core.random_presets_parser import RandomPresetsParser
+
+TYPES_XML = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<types>
+    <!-- Fruit -->
+    <type name="Apple">
+        <nominal>10</nominal>
+        <user name="Farm"/>
+    </type>
+</types>'''
+
+USER_XML = '''<user_lists>
+    <user name="Farm"><usage name="Farm"/><value name="Tier1"/></user>
+</user_lists>'''
+
+PRESETS_XML = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<randompresets>
+    <cargo name="foodVillage" chance="0.5">
+        <item name="Apple" chance="0.2"/>
+    </cargo>
+</randompresets>'''
+
+
+class TestModelCache(unittest.TestCase):
+    """Test ModelCache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ModelCache(self.tmp.name)
+        self.limits = LimitsParser()
+        self.limits.parse_user_definitions(USER_XML)
+        self.parse_calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def parse_types(self, content, path):
+        self.parse_calls += 1
+        return TypesParser.parse(content, path, self.limits)
+
+    def load(self, content=TYPES_XML):
+        return self.cache.parse_cached('types', 'db/types.xml', content,
+                                       self.parse_types, self.limits.fingerprint())
+
+    def test_second_load_skips_parsing(self):
+        first = self.load()
+        second = self.load()
+
+        self.assertEqual(self.parse_calls, 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.items[0].name, "Apple")
+        self.assertEqual(second.items[0].usage, ["Farm"])
+        self.assertEqual(second.items[0].original_users, ["Farm"])
+        self.assertEqual(second.item_comments, {"Apple": ["<!--Fruit-->"]})
+        self.assertEqual(second.original_content, TYPES_XML)
+
+    def test_changed_content_reparses(self):
+        self.load()
+        changed = self.load(TYPES_XML.replace('<nominal>10', '<nominal>20'))
+        self.assertEqual(self.parse_calls, 2)
+        self.assertEqual(changed.items[0].nominal, 20)
+
+    def test_changed_user_definitions_reparse(self):
+        self.load()
+        self.limits.parse_user_definitions(USER_XML.replace('Tier1', 'Tier2'))
+        reloaded = self.load()
+        self.assertEqual(self.parse_calls, 2)
+        self.assertEqual(reloaded.items[0].value, ["Tier2"])
+
+    def test_schema_change_invalidates_entries(self):
+        self.load()
+        with mock.patch.object(model_cache, 'SCHEMA_FINGERPRINT', 'different'):
+            self.load()
+        self.assertEqual(self.parse_calls, 2)
+
+    def test_keeps_one_entry_per_path(self):
+        self.load()
+        self.load(TYPES_XML.replace('<nominal>10', '<nominal>20'))
+        self.assertEqual(len(list(self.cache.cache_dir.glob('*.pkl'))), 1)
+
+    def test_random_presets_roundtrip(self):
+        first = self.cache.parse_cached('randompresets', 'cfgrandompresets.xml',
+                                        PRESETS_XML, RandomPresetsParser.parse)
+        with mock.patch.object(RandomPresetsParser, 'parse', side_effect=AssertionError):
+            second = self.cache.parse_cached('randompresets', 'cfgrandompresets.xml',
+                                             PRESETS_XML, RandomPresetsParser.parse)
+        self.assertEqual(second.cargo_presets[0].name, first.cargo_presets[0].name)
+        self.assertEqual(second.original_content, PRESETS_XML)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the shared item name index
+"""
+import random
+import unittest
+from models.name_index import NameIndex
+
+NAMES = ['AKM', 'AK101', 'AK74', 'Apple', 'Bandage', 'BandageDressing', 'Mag_AKM_30Rnd',
+         'Mag_AKM_Drum75Rnd', 'Ammo_762x39', 'TacticalBaconCan', 'Canteen', 'akm']
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test NameIndex"""
+
+    def setUp(self):
+        self.index = NameIndex(NAMES)
+
+    def test_exact_and_contains(self):
+        self.assertIn('AKM', self.index)
+        self.assertNotIn('Akm', self.index)
+        self.assertEqual(sorted(self.index.exact('AKm')), ['AKM', 'akm'])
+        self.assertEqual(self.index.exact('Pear'), [])
+        self.assertEqual(len(self.index), len(NAMES))
+
+    def test_prefix(self):
+        self.assertEqual(self.index.prefix('band'), ['Bandage', 'BandageDressing'])
+        self.assertEqual(self.index.prefix_lower('ak'), ['ak101', 'ak74', 'akm'])
+        self.assertEqual(self.index.prefix('zz'), [])
+
+    def test_substring_matches_scan(self):
+        rng = random.Random(3)
+        names = [''.join(rng.choice('abcde_') for _ in range(rng.randint(1, 12)))
+                 for _ in range(500)]
+        index = NameIndex(names)
+        for text in ['a', 'ab', 'abc', 'e_d', 'cab_', 'zzz', '____', 'abcdeabcde']:
+            expected = sorted({name.lower() for name in names if text in name.lower()})
+            self.assertEqual(index.substring_lower(text), expected, text)
+
+    def test_substring_estimate_is_upper_bound(self):
+        for text in ['ak', 'akm', 'bandage', 'mag_akm', 'zzz']:
+            self.assertGreaterEqual(self.index.substring_estimate(text),
+                                    len(self.index.substring_lower(text)))
+        self.assertEqual(self.index.substring_estimate('zzz'), 0)
+
+    def test_fuzzy_tolerates_typos(self):
+        self.assertEqual(self.index.fuzzy('Bandgae', limit=1), ['Bandage'])
+        self.assertIn('Canteen', self.index.fuzzy('cantene'))
+        self.assertEqual(self.index.fuzzy('qqqqqq'), [])
+
+    def test_search_ranking(self):
+        results = self.index.search('akm')
+        self.assertEqual(results[:2], ['AKM', 'akm'])
+        self.assertEqual(results[2:], ['Mag_AKM_30Rnd', 'Mag_AKM_Drum75Rnd'])
+        self.assertEqual(self.index.search('bandage', limit=1), ['Bandage'])
+        self.assertEqual(self.index.search('TacticalBacn'), ['TacticalBaconCan'])
+        self.assertEqual(self.index.search(''), self.index.names[:50])
+
+    def test_add_and_remove_are_counted(self):
+        self.index.add('Apple')  # Same item in a second file
+        self.index.remove('Apple')
+        self.assertIn('Apple', self.index)
+        self.assertEqual(self.index.prefix('app'), ['Apple'])
+
+        self.index.remove('Apple')
+        self.assertNotIn('Apple', self.index)
+        self.assertEqual(self.index.prefix('app'), [])
+        self.assertEqual(self.index.substring('ppl'), [])
+        self.assertEqual(self.index.fuzzy('aple'), [])
+
+        self.index.remove('akm')
+        self.assertEqual(self.index.exact('akm'), ['AKM'])
+
+
+if __name__ == '__main__':
+    unittest.main()
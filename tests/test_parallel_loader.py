@@ -0,0 +1,169 @@
+"""
+Tests for the parallel file loader
+"""
+import io
+import threading
+import time
+import unittest
+from core.parallel_loader import ParallelLoader
+from core.xml_parser import TypesParser
+
+
+def make_types_xml(name):
+    return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<types>
+    <type name="{name}">
+        <nominal>5</nominal>
+    </type>
+</types>'''
+
+
+class FakeFileManager:
+    """In-memory stand-in for SFTPManager / LocalFileManager"""
+
+    def __init__(self, files, mtimes=None, delays=None):
+        self.files = files
+        self.mtimes = mtimes or {}
+        self.delays = delays or {}
+        self.reads = []
+        self.stats = []
+        self.lock = threading.Lock()
+
+    def read_file(self, path):
+        time.sleep(self.delays.get(path, 0))
+        with self.lock:
+            self.reads.append(path)
+        if path not in self.files:
+            raise IOError(f"Failed to read file {path}: not found")
+        return self.files[path]
+
+    def get_file_mtime(self, path):
+        with self.lock:
+            self.stats.append(path)
+        return self.mtimes.get(path)
+
+
+class BatchStatFileManager(FakeFileManager):
+    """Fake file manager that also supports the batched stat API"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    def stat_many(self, paths):
+        self.batches.append(list(paths))
+        return {path: {'mtime': self.mtimes[path], 'size': 0, 'path': path} if path in self.mtimes else None
+                for path in paths}
+
+
+class StreamingFileManager(FakeFileManager):
+    """Fake file manager that also supports opening files as byte streams"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened = []
+
+    def open_file(self, path):
+        with self.lock:
+            self.opened.append(path)
+        if path not in self.files:
+            raise IOError(f"Failed to read file {path}: not found")
+        return io.BytesIO(self.files[path].encode('utf-8'))
+
+
+class TestParallelLoader(unittest.TestCase):
+    """Test ParallelLoader"""
+
+    def setUp(self):
+        self.paths = [f"mod{i}/types.xml" for i in range(6)]
+        files = {path: make_types_xml(f"Item{i}") for i, path in enumerate(self.paths)}
+        # Earlier files are slowest so they complete out of order
+        delays = {path: 0.02 * (len(self.paths) - i) for i, path in enumerate(self.paths)}
+        self.fm = FakeFileManager(files, delays=delays)
+
+    def test_results_keep_request_order(self):
+        loader = ParallelLoader(self.fm, TypesParser.parse, max_workers=6)
+        completed = []
+        results = loader.load(self.paths, on_result=lambda r: completed.append(r.path))
+
+        self.assertEqual([r.path for r in results], self.paths)
+        self.assertEqual([r.parsed.items[0].name for r in results],
+                         [f"Item{i}" for i in range(6)])
+        # Streaming callbacks arrive as files finish, not in request order
+        self.assertNotEqual(completed, self.paths)
+        self.assertEqual(sorted(completed), sorted(self.paths))
+
+    def test_errors_are_reported_per_file(self):
+        self.fm.files[self.paths[2]] = "<types><type name="
+        del self.fm.files[self.paths[4]]
+
+        results = ParallelLoader(self.fm, TypesParser.parse).load(self.paths)
+
+        self.assertEqual(len(results), 6)
+        failed = [r.path for r in results if not r.success]
+        self.assertEqual(failed, [self.paths[2], self.paths[4]])
+
+    def test_uses_cache_when_mtime_matches(self):
+        self.fm.mtimes = {path: 100.0 for path in self.paths}
+        cache = {self.paths[0]: {'timestamp': 100.0, 'content': make_types_xml("Cached")},
+                 self.paths[1]: {'timestamp': 50.0, 'content': make_types_xml("Stale")}}
+
+        loader = ParallelLoader(self.fm, TypesParser.parse, cache_lookup=cache.get)
+        results = loader.load(self.paths)
+
+        self.assertTrue(results[0].from_cache)
+        self.assertEqual(results[0].parsed.items[0].name, "Cached")
+        self.assertFalse(results[1].from_cache)
+        self.assertEqual(results[1].parsed.items[0].name, "Item1")
+        self.assertEqual(results[1].mtime, 100.0)
+        self.assertNotIn(self.paths[0], self.fm.reads)
+
+    def test_use_cache_false_always_downloads(self):
+        self.fm.mtimes = {path: 100.0 for path in self.paths}
+        cache = {path: {'timestamp': 100.0, 'content': make_types_xml("Cached")} for path in self.paths}
+
+        loader = ParallelLoader(self.fm, TypesParser.parse, cache_lookup=cache.get, use_cache=False)
+        results = loader.load(self.paths)
+
+        self.assertTrue(all(not r.from_cache for r in results))
+        self.assertEqual(sorted(self.fm.reads), sorted(self.paths))
+
+    def test_batched_stat_replaces_per_file_stat(self):
+        fm = BatchStatFileManager(self.fm.files, mtimes={path: 100.0 for path in self.paths})
+        cache = {self.paths[0]: {'timestamp': 100.0, 'content': make_types_xml("Cached")}}
+
+        results = ParallelLoader(fm, TypesParser.parse, cache_lookup=cache.get).load(self.paths)
+
+        self.assertEqual(fm.batches, [self.paths])
+        self.assertEqual(fm.stats, [])
+        self.assertTrue(results[0].from_cache)
+        self.assertEqual([r.mtime for r in results], [100.0] * len(self.paths))
+
+    def test_stream_parse_for_downloads(self):
+        fm = StreamingFileManager(self.fm.files, mtimes={path: 100.0 for path in self.paths})
+        cache = {self.paths[0]: {'timestamp': 100.0, 'content': make_types_xml("Cached")}}
+        del fm.files[self.paths[3]]
+
+        loader = ParallelLoader(fm, TypesParser.parse, cache_lookup=cache.get,
+                                stream_parse_func=TypesParser.parse_stream)
+        results = loader.load(self.paths)
+
+        self.assertEqual(fm.reads, [])
+        self.assertEqual(sorted(fm.opened), sorted(self.paths[1:]))
+        self.assertEqual(results[0].parsed.items[0].name, "Cached")
+        self.assertEqual(results[1].parsed.items[0].name, "Item1")
+        self.assertEqual(results[1].content, self.fm.files[self.paths[1]])
+        self.assertEqual(results[1].mtime, 100.0)
+        self.assertFalse(results[3].success)
+
+    def test_cancel_skips_remaining_files(self):
+        loader = ParallelLoader(self.fm, TypesParser.parse, max_workers=1)
+        results = loader.load(self.paths, on_result=lambda r: loader.cancel())
+
+        self.assertEqual(len(results), 1)
+        # At most the file already in flight when cancelling is still read
+        self.assertLessEqual(len(self.fm.reads), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
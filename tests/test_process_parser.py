@@ -0,0 +1,86 @@
+"""
+Tests for the process pool parse stage
+"""
+import unittest
+from core.limits_parser import LimitsParser
+from core.process_parser import ProcessParser, parse_local
+
+TYPES_XML = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!-- header -->
+<types>
+''' + ''.join(f'''    <!-- item {i} -->
+    <type name="Item{i}">
+        <nominal>{i}</nominal>
+        <category name="tools"/>
+        <usage name="Town"/>
+        <user name="Shops"/>
+        <flags count_in_cargo="0" count_in_hoarder="0" count_in_map="1" count_in_player="0" crafted="1" deloot="0"/>
+    </type>
+''' for i in range(200)) + '''</types>
+'''
+
+SPAWNABLE_XML = '''<?xml version="1.0"?>
+<spawnabletypes>
+    <!-- rifle -->
+    <type name="AKM"><attachments chance="0.5"><item name="AK_Suppressor" chance="0.3"/></attachments></type>
+</spawnabletypes>'''
+
+PRESETS_XML = '''<?xml version="1.0"?>
+<randompresets>
+    <cargo chance="0.5" name="foodVillage"><item name="Apple" chance="0.2"/></cargo>
+</randompresets>'''
+
+
+def make_limits():
+    limits = LimitsParser()
+    limits.user_definitions = {'Shops': {'usage': ['Industrial'], 'value': [], 'tag': []}}
+    return limits
+
+
+class TestProcessParser(unittest.TestCase):
+    """Test ProcessParser"""
+
+    def setUp(self):
+        self.parser = ProcessParser(processes=2, min_bytes=0)
+
+    def tearDown(self):
+        self.parser.shutdown()
+
+    def test_types_from_worker_match_local_parse(self):
+        limits = make_limits()
+        expected = parse_local('types', TYPES_XML, 'db/types.xml', limits)
+        actual = self.parser.parse('types', TYPES_XML, 'db/types.xml', limits)
+
+        self.assertIsNotNone(self.parser._executor)
+        self.assertEqual(actual.items, expected.items)
+        self.assertEqual(actual.items[3].usage, ['Town', 'Industrial'])
+        self.assertEqual(actual.items[3].source_file, 'db/types.xml')
+        self.assertEqual(actual.header_comments, expected.header_comments)
+        self.assertEqual(actual.item_comments, expected.item_comments)
+        self.assertEqual(actual.original_content, TYPES_XML)
+
+    def test_other_kinds_from_worker(self):
+        spawnable = self.parser.parse('spawnabletypes', SPAWNABLE_XML, 'cfgspawnabletypes.xml')
+        self.assertEqual(spawnable, parse_local('spawnabletypes', SPAWNABLE_XML, 'cfgspawnabletypes.xml'))
+
+        presets = self.parser.parse('randompresets', PRESETS_XML, 'cfgrandompresets.xml')
+        self.assertEqual(presets.cargo_presets[0].name, 'foodVillage')
+        self.assertEqual(presets.original_content, PRESETS_XML)
+
+    def test_small_files_and_disabled_pool_stay_in_process(self):
+        parser = ProcessParser(processes=2)
+        parser.parse('randompresets', PRESETS_XML, 'cfgrandompresets.xml')
+        self.assertIsNone(parser._executor)
+
+        parser = ProcessParser(processes=0, min_bytes=0)
+        self.assertFalse(parser.enabled)
+        parser.parse('types', TYPES_XML, 'db/types.xml')
+        self.assertIsNone(parser._executor)
+
+    def test_worker_errors_are_raised(self):
+        with self.assertRaises(ValueError):
+            self.parser.parse('types', '<types><type name="x"></types>', 'bad.xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
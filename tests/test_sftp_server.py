@@ -0,0 +1,129 @@
+"""
+Tests for the local SFTP server fixture (and SFTPManager against it)
+"""
+import os
+import tempfile
+import time
+import unittest
+from benchmarks.sftp_io import run
+from benchmarks.sftp_server import LinkProfile, LocalSFTPServer
+from benchmarks.synthetic_mission import MissionSpec
+from config.sftp_manager import SFTPManager
+
+
+class TestLocalSFTPServer(unittest.TestCase):
+    """Test SFTPManager over the emulated link"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mission = os.path.join(self.tmp.name, 'mission')
+        os.makedirs(os.path.join(self.mission, 'DB'))
+        self.write('cfgeconomycore.xml', '<economycore/>')
+        self.write('DB/types.xml', '<types>' + ' ' * 200000 + '</types>')
+
+        self.server = LocalSFTPServer(self.tmp.name)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.manager = SFTPManager()
+        success, message = self.manager.connect(self.server.host, self.server.port, self.server.username,
+                                                self.server.password, '/mission')
+        self.assertTrue(success, message)
+        self.addCleanup(self.manager.disconnect)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, relative_path, content):
+        with open(os.path.join(self.mission, relative_path), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def read(self, relative_path):
+        with open(os.path.join(self.mission, relative_path), encoding='utf-8') as f:
+            return f.read()
+
+    def test_read_write_and_stat(self):
+        self.assertEqual(self.manager.read_file('cfgeconomycore.xml'), '<economycore/>')
+        self.assertEqual(len(self.manager.read_file('db/types.xml')), 200015)  # Case-insensitive
+
+        results = self.manager.write_many({'db/types.xml': '<types/>', 'custom/new.xml': '<types></types>'})
+        self.assertEqual(results['db/types.xml'], (True, 'Saved db/types.xml'))
+        self.assertEqual(results['custom/new.xml'], (True, 'Saved custom/new.xml'))
+        self.assertEqual(self.read('DB/types.xml'), '<types/>')
+        self.assertEqual(self.read('custom/new.xml'), '<types></types>')
+        self.assertEqual(sorted(os.listdir(os.path.join(self.mission, 'DB'))), ['types.xml'])  # No temp files
+
+        stats = self.manager.stat_many(['db/types.xml', 'db/missing.xml'])
+        self.assertEqual(stats['db/types.xml']['size'], len('<types/>'))
+        self.assertIsNone(stats['db/missing.xml'])
+        self.assertGreater(self.server.requests['rename'], 0)
+
+    def test_latency_and_bandwidth(self):
+        self.server.profile = LinkProfile(latency=0.1)
+        start = time.perf_counter()
+        self.assertTrue(self.manager.file_exists('cfgeconomycore.xml'))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+
+        self.server.profile = LinkProfile(bandwidth=1000000)
+        start = time.perf_counter()
+        self.manager.read_file('DB/types.xml')
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+
+    def test_failure_injection(self):
+        self.server.profile = LinkProfile(fail_paths=['*/types.xml'])
+        with self.assertRaises(IOError):
+            self.manager.read_file('DB/types.xml')
+        self.assertFalse(self.manager.write_many({'DB/types.xml': '<types/>'})['DB/types.xml'][0])
+        self.assertEqual(self.manager.read_file('cfgeconomycore.xml'), '<economycore/>')
+
+        self.server.profile = LinkProfile(failure_rate=1.0)
+        with self.assertRaises(IOError):
+            self.manager.file_exists('cfgeconomycore.xml')
+
+    def test_refused_rename_keeps_file(self):
+        self.server.profile = LinkProfile(deny_operations=['rename'])
+        with self.assertRaises(IOError):
+            self.manager.write_file('DB/types.xml', '<types/>')
+        self.assertEqual(len(self.read('DB/types.xml')), 200015)
+        self.assertEqual(os.listdir(os.path.join(self.mission, 'DB')), ['types.xml'])
+
+        # Without posix-rename the existing file is moved aside first
+        self.server.profile = LinkProfile(posix_rename=False, deny_operations=['rename'])
+        with self.assertRaises(IOError):
+            self.manager.write_file('DB/types.xml', '<types/>')
+        self.assertEqual(len(self.read('DB/types.xml')), 200015)
+        self.assertEqual(os.listdir(os.path.join(self.mission, 'DB')), ['types.xml'])
+
+    def test_rename_without_posix_rename(self):
+        self.server.profile = LinkProfile(posix_rename=False)
+        self.manager.write_file('DB/types.xml', '<types/>')
+        self.manager.write_file('DB/new.xml', '<types></types>')
+        self.assertEqual(self.read('DB/types.xml'), '<types/>')
+        self.assertEqual(self.read('DB/new.xml'), '<types></types>')
+        self.assertEqual(sorted(os.listdir(os.path.join(self.mission, 'DB'))), ['new.xml', 'types.xml'])
+
+    def test_dropped_connection(self):
+        self.server.drop_connections()
+        with self.assertRaises(IOError):
+            self.manager.read_file('cfgeconomycore.xml')
+        # New connections are still accepted
+        manager = SFTPManager()
+        self.assertTrue(manager.connect(self.server.host, self.server.port, 'dayz', 'dayz', '/mission')[0])
+        self.assertEqual(manager.read_file('cfgeconomycore.xml'), '<economycore/>')
+        manager.disconnect()
+
+
+class TestSFTPBenchmark(unittest.TestCase):
+    """Test the SFTP load/save benchmark on a small mission"""
+
+    def test_run(self):
+        spec = MissionSpec(types_files=2, items_per_file=50, user_groups=2, spawnable_types=10, presets=4)
+        result = run(spec, LinkProfile(latency=0.002), channels=2, repeat=1)
+        self.assertEqual(list(result['results']), ['sftp.connect', 'sftp.stat_many', 'sftp.load',
+                                                   'sftp.load_stream', 'sftp.save'])
+        self.assertEqual(result['meta']['channels'], 2)
+        save = result['results']['sftp.save']
+        self.assertEqual(save['by_operation']['rename'], 2)  # Both files written atomically
+
+
+if __name__ == '__main__':
+    unittest.main()
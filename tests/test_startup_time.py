@@ -0,0 +1,64 @@
+"""
+Tests for the startup benchmark helpers and the lazily imported modules
+"""
+import ast
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from benchmarks.startup_time import ROOT, DEFERRED_MODULES, parse_importtime, deferred_imports
+
+
+def module_level_imports(relative_path):
+    """Modules imported at module level (not inside functions) by a source file"""
+    with open(ROOT / relative_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.add(node.module)
+    return modules
+
+
+class TestStartupTime(unittest.TestCase):
+    """Test importtime parsing and the startup import graph"""
+
+    def test_parse_importtime(self):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import json'],
+                                capture_output=True, text=True, timeout=60)
+        records = parse_importtime(result.stderr)
+        json_record = next(record for record in records if record.module == 'json')
+        self.assertEqual(json_record.depth, 0)
+        self.assertGreaterEqual(json_record.cumulative_us, json_record.self_us)
+        self.assertTrue(any(record.module == 'json.decoder' and record.depth > 0 for record in records))
+
+        records = parse_importtime('import time: self [us] | cumulative | imported package\n'
+                                   'import time:       120 |        300 |   paramiko.client\n'
+                                   'import time:        50 |        400 | ui.batch_ops\n')
+        self.assertEqual([(record.module, record.depth) for record in records],
+                         [('paramiko.client', 1), ('ui.batch_ops', 0)])
+        self.assertEqual(deferred_imports(records), ['paramiko', 'ui.batch_ops'])
+
+    def test_startup_modules_defer_heavy_imports(self):
+        startup_imports = (module_level_imports('main.py') | module_level_imports('ui/main_window.py') |
+                           module_level_imports('config/app_config.py'))
+        self.assertFalse(startup_imports & (set(DEFERRED_MODULES) | {'config.sftp_manager',
+                                                                     'cryptography.fernet'}))
+
+    def test_app_config_without_cryptography_import(self):
+        with tempfile.TemporaryDirectory() as directory:
+            script = ("import sys; from config.app_config import AppConfig; "
+                      f"config = AppConfig({os.path.join(directory, 'config.json')!r}); "
+                      "config.set_undo_memory_mb(32); "
+                      "assert 'cryptography' not in sys.modules")
+            result = subprocess.run([sys.executable, '-c', script], cwd=str(ROOT),
+                                    capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertFalse(os.path.exists(os.path.join(directory, '.key')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for the tracing spans and Chrome trace export
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from core.tracing import Tracer, SpanRecord, tracer, traced
+
+
+class TestTracer(unittest.TestCase):
+    """Test span recording, summaries and export"""
+
+    def test_disabled_records_nothing(self):
+        trace = Tracer()
+        with trace.span('io.read', path='a.xml') as first, trace.span('parse.file') as second:
+            pass
+        self.assertIs(first, second)  # Shared no-op span
+        self.assertEqual(len(trace.records), 0)
+
+    def test_records_spans_per_thread(self):
+        trace = Tracer()
+        trace.enable()
+        with trace.span('io.read', path='a.xml'):
+            time.sleep(0.002)
+
+        def worker():
+            with trace.span('parse.file'):
+                pass
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        read, parse = trace.records
+        self.assertEqual(read.name, 'io.read')
+        self.assertEqual(read.args, {'path': 'a.xml'})
+        self.assertGreaterEqual(read.duration_ns, 1000000)
+        self.assertNotEqual(read.thread_id, parse.thread_id)
+        self.assertIsNone(parse.args)
+
+    def test_span_recorded_on_exception(self):
+        trace = Tracer()
+        trace.enable()
+        with self.assertRaises(ValueError):
+            with trace.span('parse.file'):
+                raise ValueError("bad xml")
+        self.assertEqual([record.name for record in trace.records], ['parse.file'])
+
+    def test_capacity_drops_oldest(self):
+        trace = Tracer(capacity=3)
+        trace.enable()
+        for index in range(5):
+            with trace.span(f'io.read{index}'):
+                pass
+        self.assertEqual([record.name for record in trace.records], ['io.read2', 'io.read3', 'io.read4'])
+
+    def test_summary_and_stages(self):
+        trace = Tracer()
+        ms = 1000000
+        trace.records.extend([
+            SpanRecord('parse.file', 0, 10 * ms, 1, None),
+            SpanRecord('parse.items', 2 * ms, 5 * ms, 1, None),  # Nested in parse.file
+            SpanRecord('parse.file', 0, 4 * ms, 2, None),  # Parallel thread
+            SpanRecord('io.read', 20 * ms, 3 * ms, 1, None),
+        ])
+        summary = trace.summary()
+        self.assertEqual([stage.name for stage in summary], ['parse.file', 'parse.items', 'io.read'])
+        self.assertEqual(summary[0].count, 2)
+        self.assertAlmostEqual(summary[0].total_seconds, 0.014)
+        self.assertAlmostEqual(summary[0].max_seconds, 0.010)
+
+        self.assertEqual(trace.stage_totals(), {'parse': 0.014, 'io': 0.003})
+        self.assertEqual(trace.format_stages(), 'parse 0.01s, io 0.00s')
+        self.assertEqual(trace.format_summary(limit=1), 'parse.file: 14.0 ms (2x, max 10.0 ms)')
+
+    def test_chrome_trace(self):
+        trace = Tracer()
+        trace.records.append(SpanRecord('save.write', 5000, 2500, 7, {'files': 2}))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            trace.write_chrome_trace(path)
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        self.assertEqual(data['traceEvents'], [{
+            'name': 'save.write', 'cat': 'save', 'ph': 'X', 'ts': 5.0, 'dur': 2.5,
+            'pid': os.getpid(), 'tid': 7, 'args': {'files': '2'}
+        }])
+
+    def test_traced_decorator(self):
+        @traced('filter.query')
+        def query(value):
+            return value * 2
+
+        tracer.clear()
+        self.assertEqual(query(2), 4)
+        self.assertEqual(len(tracer.records), 0)
+        tracer.enable()
+        try:
+            self.assertEqual(query(3), 6)
+        finally:
+            tracer.enable(False)
+        self.assertEqual([record.name for record in tracer.records], ['filter.query'])
+        tracer.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
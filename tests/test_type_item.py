@@ -0,0 +1,48 @@
+"""
+Tests for the compact TypeItem representation
+"""
+import copy
+import pickle
+import unittest
+from benchmarks.type_item_memory import run, synthetic_types_xml
+from core.xml_parser import TypesParser
+from models.type_item import TypeItem
+
+
+class TestTypeItem(unittest.TestCase):
+    """Test TypeItem"""
+
+    def test_slotted_without_instance_dict(self):
+        item = TypeItem(name='Apple', usage=['Town'])
+        self.assertFalse(hasattr(item, '__dict__'))
+        self.assertEqual(item.lifetime, 3600)
+        with self.assertRaises(AttributeError):
+            item.not_a_field = 1
+
+    def test_copies_and_pickle(self):
+        item = TypeItem(name='AKM', category='weapons', usage=['Military'], tag=['shelves'],
+                        original_users=['Army'], source_file='db/types.xml')
+        for other in (item.clone(), copy.copy(item), copy.deepcopy(item),
+                      pickle.loads(pickle.dumps(item))):
+            self.assertEqual(other, item)
+        clone = item.clone()
+        clone.usage.append('Police')
+        self.assertEqual(item.usage, ['Military'])
+
+    def test_parser_shares_vocabulary_strings(self):
+        items = TypesParser.parse('''<types>
+    <type name="A"><category name="tools"/><usage name="Town"/><tag name="floor"/></type>
+    <type name="B"><category name="tools"/><usage name="Town"/><tag name="floor"/></type>
+</types>''', 'types.xml').items
+        self.assertIs(items[0].category, items[1].category)
+        self.assertIs(items[0].usage[0], items[1].usage[0])
+        self.assertIs(items[0].tag[0], items[1].tag[0])
+
+    def test_memory_benchmark(self):
+        self.assertIn('<type name="Item_9_', synthetic_types_xml(10))
+        result = run(2000)
+        self.assertLess(result['compact_bytes'], result['legacy_bytes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for the types.xml parser
+"""
+import io
+import unittest
+from core.xml_parser import TypesParser
+
+SAMPLE = '''<!-- Header before declaration -->
+<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!-- Header after declaration -->
+<types>
+    <!-- Rifles -->
+    <!-- Second line -->
+    <type name="AKM">
+        <nominal>5</nominal>
+        <lifetime>7200</lifetime>
+        <min>2</min>
+        <flags count_in_cargo="0" count_in_hoarder="0" count_in_map="1" count_in_player="0" crafted="0" deloot="1"/>
+        <category name="weapons"/>
+        <usage name="Military"/>
+        <value name="Tier3"/>
+        <!-- Inside a type, not attached -->
+    </type>
+    <type name="Apple">
+        <nominal>20</nominal>
+        <tag name="shelves"/>
+    </type>
+    <!--Food-->
+    <type name="Bandage">
+        <nominal>10</nominal>
+        <usage name="Medic"/>
+    </type>
+</types>
+<!-- Footer äöü -->
+'''
+
+
+def item_fields(types_file):
+    return [(item.name, item.nominal, item.lifetime, item.min, item.category, item.usage,
+             item.value, item.tag, item.deloot, item.source_file) for item in types_file.items]
+
+
+class TestTypesParserStream(unittest.TestCase):
+    """Test TypesParser.parse_stream against TypesParser.parse"""
+
+    def assertSameResult(self, streamed, parsed):
+        self.assertEqual(item_fields(streamed), item_fields(parsed))
+        self.assertEqual(streamed.header_comments, parsed.header_comments)
+        self.assertEqual(streamed.footer_comments, parsed.footer_comments)
+        self.assertEqual(streamed.item_comments, parsed.item_comments)
+        self.assertEqual(streamed.original_content, parsed.original_content)
+
+    def test_matches_parse_for_any_chunk_size(self):
+        parsed = TypesParser.parse(SAMPLE, 'db/types.xml')
+        for chunk_size in (1, 7, 64, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                streamed = TypesParser.parse_stream(io.BytesIO(SAMPLE.encode('utf-8')), 'db/types.xml',
+                                                    chunk_size=chunk_size)
+                self.assertSameResult(streamed, parsed)
+                streamed = TypesParser.parse_stream(io.StringIO(SAMPLE), 'db/types.xml',
+                                                    chunk_size=chunk_size)
+                self.assertSameResult(streamed, parsed)
+
+    def test_comments_attach_to_following_type(self):
+        streamed = TypesParser.parse_stream(io.BytesIO(SAMPLE.encode('utf-8')), 'db/types.xml')
+        self.assertEqual(streamed.header_comments,
+                         ['<!--Header before declaration-->', '<!--Header after declaration-->'])
+        self.assertEqual(streamed.item_comments,
+                         {'AKM': ['<!--Rifles-->', '<!--Second line-->'], 'Bandage': ['<!--Food-->']})
+        self.assertEqual(streamed.footer_comments, ['<!--Footer äöü-->'])
+
+    def test_without_declaration_or_content(self):
+        content = '  <types><type name="Apple"><nominal>3</nominal></type></types>'
+        streamed = TypesParser.parse_stream(io.BytesIO(content.encode('utf-8')), 'a.xml',
+                                            keep_content=False)
+        self.assertEqual([item.name for item in streamed.items], ['Apple'])
+        self.assertIsNone(streamed.original_content)
+
+    def test_malformed_raises_value_error(self):
+        for content in (b'', b'<types><type name="x"></types>'):
+            with self.assertRaises(ValueError):
+                TypesParser.parse_stream(io.BytesIO(content), 'bad.xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
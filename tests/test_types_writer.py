@@ -0,0 +1,144 @@
+"""
+Tests for the incremental types.xml writer
+"""
+import io
+import time
+import unittest
+from core.types_writer import TypesWriter
+from core.xml_comments import scan_comments
+from core.xml_parser import TypesParser
+from models.type_item import TypeItem
+from benchmarks.type_item_memory import synthetic_types_xml
+
+# Hand-edited file: odd spacing, attribute order and a tab-indented element
+SAMPLE = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<!-- Header -->
+<types>
+    <!-- Rifles -->
+    <type name="AKM">
+        <nominal>5</nominal>
+        <min>2</min>
+        <flags deloot="1" count_in_map="1"/>
+        <category name="weapons"/>
+        <user name="Military"/>
+    </type>
+    <type name="Apple"><nominal>20</nominal><tag name="shelves"/></type>
+\t<type name="Bandage">
+\t\t<nominal>10</nominal>
+\t</type>
+</types>
+<!-- Footer -->
+'''
+
+
+class FakeLimits:
+    """Minimal LimitsParser stand-in with one user definition"""
+
+    def expand_user(self, user_name):
+        if user_name == 'Military':
+            return {'usage': ['Military'], 'category': [], 'value': ['Tier3', 'Tier4'], 'tag': []}
+        return {'usage': [], 'category': [], 'value': [], 'tag': []}
+
+
+class TestTypesWriter(unittest.TestCase):
+    """Test TypesWriter.write"""
+
+    def setUp(self):
+        self.limits = FakeLimits()
+        self.types_file = TypesParser.parse(SAMPLE, 'db/types.xml', self.limits)
+
+    def write(self):
+        xml_content = TypesWriter.write(self.types_file, self.limits)
+        # The layout kept for the next save matches a fresh scan of the output
+        content, layout = self.types_file.source_layout
+        if content is xml_content:
+            fresh = scan_comments(xml_content, ('type',))
+            self.assertEqual(layout.spans, fresh.spans)
+            self.assertEqual(layout.root_end, fresh.root_end)
+        return xml_content
+
+    def item(self, name):
+        return self.types_file.get_item_by_name(name)
+
+    def test_unchanged_file_is_identical(self):
+        self.assertEqual(self.write(), SAMPLE)
+
+    def test_only_modified_element_is_rendered(self):
+        apple = self.item('Apple')
+        apple.nominal = 25
+        apple.modified = True
+        xml_content = self.write()
+        self.assertIn('\t<type name="Bandage">\n\t\t<nominal>10</nominal>\n\t</type>', xml_content)
+        self.assertIn('        <user name="Military"/>\n    </type>', xml_content)
+        self.assertIn('    <type name="Apple">\n        <nominal>25</nominal>', xml_content)
+        self.assertEqual(TypesParser.parse(xml_content, 'db/types.xml').get_item_by_name('Apple').nominal, 25)
+
+    def test_cancelled_edit_keeps_original_bytes(self):
+        akm = self.item('AKM')
+        akm.nominal = 6
+        akm.modified = True
+        akm.nominal = 5
+        self.assertEqual(self.write(), SAMPLE)
+
+    def test_user_tags_preserved(self):
+        akm = self.item('AKM')
+        self.assertEqual(akm.value, ['Tier3', 'Tier4'])
+        akm.min = 1
+        akm.modified = True
+        self.assertIn('<user name="Military"/>', self.write())
+
+        akm.value.remove('Tier4')
+        xml_content = self.write()
+        self.assertNotIn('<user name="Military"/>', xml_content)
+        self.assertIn('<usage name="Military"/>', xml_content)
+        self.assertIn('<value name="Tier3"/>', xml_content)
+
+    def test_added_and_removed_items(self):
+        self.types_file.items.remove(self.item('AKM'))
+        self.types_file.add_item(TypeItem(name='Mosin', nominal=3, modified=True))
+        self.types_file.item_comments['Mosin'] = ['<!-- Bolt action -->']
+        xml_content = self.write()
+        self.assertNotIn('AKM', xml_content)
+        self.assertNotIn('Rifles', xml_content)  # Its comment goes with it
+        self.assertTrue(xml_content.startswith(SAMPLE[:SAMPLE.index('    <!-- Rifles')] + '    <type name="Apple">'))
+        self.assertIn('\t</type>\n    <!-- Bolt action -->\n    <type name="Mosin">', xml_content)
+        self.assertTrue(xml_content.endswith('    </type>\n</types>\n<!-- Footer -->\n'))
+
+        # Saving the written text again starts from the layout built by the writer
+        self.types_file.original_content = xml_content
+        self.item('Mosin').modified = False
+        self.assertEqual(self.write(), xml_content)
+        self.types_file.items.remove(self.item('Mosin'))
+        self.assertNotIn('Mosin', self.write())
+
+    def test_streamed_and_fallback(self):
+        streamed = TypesParser.parse_stream(io.StringIO(SAMPLE), 'db/types.xml', self.limits)
+        self.assertIsNone(streamed.source_layout)
+        self.assertEqual(TypesWriter.write(streamed, self.limits), SAMPLE)
+
+        # Items that can't be matched to the original are written in full
+        self.types_file.items.reverse()
+        self.assertEqual(self.write(), self.types_file.to_xml(self.limits))
+        self.types_file.original_content = None
+        self.assertEqual(TypesWriter.write(self.types_file), self.types_file.to_xml())
+
+    def test_single_edit_faster_than_full_render(self):
+        types_file = TypesParser.parse(synthetic_types_xml(5000, seed=3), 'db/types.xml')
+        types_file.items[2500].nominal += 1
+        types_file.items[2500].modified = True
+
+        start = time.perf_counter()
+        full = types_file.to_xml()
+        full_time = time.perf_counter() - start
+        start = time.perf_counter()
+        xml_content = TypesWriter.write(types_file)
+        incremental_time = time.perf_counter() - start
+
+        self.assertLess(incremental_time, full_time)
+        reparsed = TypesParser.parse(xml_content, 'db/types.xml')
+        self.assertEqual([item.nominal for item in reparsed.items], [item.nominal for item in types_file.items])
+        self.assertEqual(xml_content, full)  # Generated in the writer's own format
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Tests for the shared undo/redo history
+"""
+import unittest
+from core.undo_history import UndoHistory, ObjectState, estimate_bytes, TYPES, SPAWNABLE_TYPES, RANDOM_PRESETS
+from models.random_preset import RandomPresetsFile, RandomPreset, PresetItem, PresetType
+from models.spawnable_type import SpawnableTypesFile, SpawnableType, CargoBlock, SpawnableItem
+from models.type_item import TypeItem
+
+
+def make_spawnable_file():
+    spawnable_file = SpawnableTypesFile(source_file='cfgspawnabletypes.xml')
+    for name in ('AKM', 'M4A1', 'Mosin'):
+        spawnable_file.add_type(SpawnableType(
+            name=name, cargo_blocks=[CargoBlock(chance=0.5, items=[SpawnableItem(name='Ammo', chance=0.3)])]))
+    spawnable_file.type_comments['Mosin'] = ['rifle']
+    return spawnable_file
+
+
+class TestUndoHistory(unittest.TestCase):
+    """Test UndoHistory"""
+
+    def setUp(self):
+        self.history = UndoHistory(max_entries=3)
+
+    def test_types_undo_redo(self):
+        item = TypeItem(name='Apple', nominal=5, usage=['Town'])
+        self.history.record(TYPES, [item])
+        item.nominal = 50
+        item.usage.append('Farm')
+        item.modified = True
+
+        entry = self.history.undo()
+        self.assertEqual(entry.kind, TYPES)
+        self.assertEqual(entry.targets, [item])
+        self.assertEqual((item.nominal, item.usage, item.modified), (5, ['Town'], False))
+
+        self.history.redo()
+        self.assertEqual((item.nominal, item.usage, item.modified), (50, ['Town', 'Farm'], True))
+        self.assertIsNone(self.history.redo())
+
+    def test_spawnable_type_edit_restores_in_place(self):
+        spawnable_file = make_spawnable_file()
+        akm = spawnable_file.types[0]
+        self.history.record(SPAWNABLE_TYPES, [akm])
+        akm.cargo_blocks[0].items[0].chance = 0.9
+        akm.cargo_blocks.append(CargoBlock(preset='mixArmy'))
+        akm.hoarder = True
+
+        self.history.undo()
+        self.assertIs(spawnable_file.types[0], akm)  # Editors keep their references
+        self.assertEqual(len(akm.cargo_blocks), 1)
+        self.assertEqual(akm.cargo_blocks[0].items[0].chance, 0.3)
+        self.assertFalse(akm.hoarder)
+
+        self.history.redo()
+        self.assertEqual(len(akm.cargo_blocks), 2)
+        self.assertEqual(akm.cargo_blocks[0].items[0].chance, 0.9)
+
+    def test_container_edit_shares_children(self):
+        spawnable_file = make_spawnable_file()
+        types = list(spawnable_file.types)
+        entry = self.history.record(SPAWNABLE_TYPES, [spawnable_file], deep=False)
+        # Only the list is copied - the types themselves are shared
+        self.assertIs(entry.states[0].state['types'][0], types[0])
+
+        spawnable_file.remove_type(types[2])
+        spawnable_file.add_type(SpawnableType(name='SKS'))
+        self.history.undo()
+        self.assertEqual([t.name for t in spawnable_file.types], ['AKM', 'M4A1', 'Mosin'])
+        self.assertIs(spawnable_file.types[2], types[2])
+        self.assertEqual(spawnable_file.type_comments, {'Mosin': ['rifle']})
+
+        self.history.redo()
+        self.assertEqual([t.name for t in spawnable_file.types], ['AKM', 'M4A1', 'SKS'])
+
+    def test_presets_and_mixed_kinds(self):
+        presets_file = RandomPresetsFile(source_file='cfgrandompresets.xml')
+        preset = RandomPreset(PresetType.CARGO, 'foodVillage', 0.5, [PresetItem('Apple', 0.2)])
+        presets_file.add_preset(preset)
+        item = TypeItem(name='Apple', nominal=5)
+
+        self.history.record(RANDOM_PRESETS, [preset])
+        preset.items[0].chance = 0.8
+        self.history.record(TYPES, [item])
+        item.nominal = 7
+        self.history.record(RANDOM_PRESETS, [presets_file], deep=False)
+        presets_file.remove_preset(preset)
+
+        # One history, newest edit first whatever the editor
+        self.assertEqual([self.history.undo().kind for _ in range(3)], [RANDOM_PRESETS, TYPES, RANDOM_PRESETS])
+        self.assertEqual(presets_file.cargo_presets, [preset])
+        self.assertEqual(preset.items[0].chance, 0.2)
+        self.assertEqual(item.nominal, 5)
+        self.assertFalse(self.history.can_undo)
+
+    def test_limits_and_clear(self):
+        item = TypeItem(name='Apple')
+        for nominal in range(5):
+            self.history.record(TYPES, [item])
+            item.nominal = nominal + 1
+        self.assertEqual(len(self.history.undo_stack), 3)
+
+        self.history.undo()
+        self.assertTrue(self.history.can_redo)
+        self.history.record(TYPES, [item, item, None])  # Duplicates and None are skipped
+        self.assertEqual(len(self.history.undo_stack[-1].states), 1)
+        self.assertFalse(self.history.can_redo)
+        self.assertIsNone(self.history.record(TYPES, []))
+
+        self.history.clear()
+        self.assertFalse(self.history.can_undo or self.history.can_redo)
+
+    def test_state_is_independent_of_later_edits(self):
+        item = TypeItem(name='Apple', tag=['floor'])
+        state = ObjectState(item)
+        item.tag.append('shelves')
+        self.assertEqual(state.state['tag'], ['floor'])
+
+
+class TestUndoBudget(unittest.TestCase):
+    """Test byte accounting, memory budget and coalescing"""
+
+    def test_estimate_counts_copies_not_shared_values(self):
+        item = TypeItem(name='Apple', usage=['Town', 'Farm'])
+        self.assertEqual(estimate_bytes('Apple'), 0)
+        self.assertGreater(estimate_bytes(item.usage), 0)
+        # A one-level copy counts the container only
+        spawnable_file = make_spawnable_file()
+        self.assertLess(estimate_bytes(spawnable_file.types, deep=False), estimate_bytes(spawnable_file.types))
+
+    def test_memory_budget_drops_oldest(self):
+        items = [TypeItem(name=f'Item{i}', usage=['Town']) for i in range(10)]
+        entry_size = UndoHistory().record(TYPES, [items[0]]).size
+        history = UndoHistory(max_entries=100, max_bytes=entry_size * 3)
+        for item in items:
+            history.record(TYPES, [item])
+            item.nominal = 1
+        self.assertEqual([entry.targets[0] for entry in history.undo_stack], items[-3:])
+        self.assertLessEqual(history.total_bytes, history.max_bytes)
+
+        # The newest entry is kept even if it alone exceeds the budget
+        history.record(TYPES, items)
+        self.assertEqual(len(history.undo_stack), 1)
+
+        history.set_limits(max_bytes=10 ** 9)
+        history.undo()
+        self.assertEqual(history.total_bytes, history.redo_stack[0].size)
+        history.clear()
+        self.assertEqual(history.total_bytes, 0)
+
+    def test_byte_total_follows_undo_redo(self):
+        history = UndoHistory()
+        spawnable_file = make_spawnable_file()
+        history.record(SPAWNABLE_TYPES, [spawnable_file.types[0]])
+        spawnable_file.types[0].cargo_blocks.extend(CargoBlock(preset=f'p{i}') for i in range(20))
+        history.undo()
+        self.assertEqual(history.total_bytes, history.redo_stack[-1].size)
+        history.redo()
+        self.assertEqual(history.total_bytes, history.undo_stack[-1].size)
+
+    def test_coalescing(self):
+        history = UndoHistory(coalesce_seconds=60)
+        preset = RandomPreset(PresetType.CARGO, 'foodVillage', 0.5, [])
+        for chance in (0.6, 0.7, 0.8):
+            history.record(RANDOM_PRESETS, [preset], coalesce_key='chance')
+            preset.chance = chance
+        self.assertEqual(len(history.undo_stack), 1)
+
+        # A different field starts a new step
+        history.record(RANDOM_PRESETS, [preset], coalesce_key='name')
+        preset.name = 'foodCity'
+        self.assertEqual(len(history.undo_stack), 2)
+
+        history.undo()
+        history.undo()
+        self.assertEqual((preset.name, preset.chance), ('foodVillage', 0.5))
+
+        # Edits after an undo/redo are not folded into the re-applied step
+        history.redo()
+        history.record(RANDOM_PRESETS, [preset], coalesce_key='chance')
+        preset.chance = 0.9
+        self.assertEqual(len(history.undo_stack), 2)
+
+    def test_coalescing_window(self):
+        history = UndoHistory(coalesce_seconds=0)
+        item = TypeItem(name='Apple')
+        history.record(TYPES, [item], coalesce_key='nominal')
+        history.undo_stack[-1].timestamp -= 1
+        history.record(TYPES, [item], coalesce_key='nominal')
+        self.assertEqual(len(history.undo_stack), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
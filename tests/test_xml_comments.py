@@ -0,0 +1,106 @@
+"""
+Tests for the single-pass XML comment scanner
+"""
+import time
+import unittest
+from core.xml_comments import scan_comments
+from core.xml_parser import TypesParser
+from core.spawnabletypes_parser import SpawnableTypesParser
+from core.random_presets_parser import RandomPresetsParser
+
+
+def best_time(func, repeat=3):
+    """Fastest of several runs (least affected by scheduling noise)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class TestScanComments(unittest.TestCase):
+    """Test scan_comments"""
+
+    def test_header_footer_and_attached(self):
+        layout = scan_comments('''<!-- before declaration -->
+<?xml version="1.0"?>
+<!-- header -->
+<types>
+    <!-- one -->
+    <!-- two -->
+    <type name="A" note="a > b"><nominal>1</nominal><!-- inside --></type>
+    <!-- interrupted --> text <type name='B'/>
+    <!-- skipped element --><other/><type name="C"/>
+    <![CDATA[ <!-- not a comment --> ]]>
+    <!-- last --><type kind="x" name="D"></type>
+</types>
+<!-- footer -->''', ('type',))
+
+        self.assertEqual(layout.header, ['before declaration', 'header'])
+        self.assertEqual(layout.footer, ['footer'])
+        self.assertEqual(layout.attached, [('type', 'A', ['one', 'two']), ('type', 'D', ['last'])])
+
+    def test_only_direct_children_of_listed_tags(self):
+        layout = scan_comments('<root><!-- a --><cargo name="x"><!-- b --><item name="y"/></cargo>'
+                               '<!-- c --><attachments name="z"/><!-- d --><type name="t"/></root>',
+                               ('cargo', 'attachments'))
+        self.assertEqual(layout.attached, [('cargo', 'x', ['a']), ('attachments', 'z', ['c'])])
+
+    def test_linear_time_on_pathological_input(self):
+        # Long runs of comments not followed by a matching element made the old
+        # backtracking patterns quadratic
+        def document(count):
+            return ('<types>' + '<!-- commented out <type name="x"> -->\n' * count +
+                    '<other/></types><!--' + ' ' * count)
+
+        small, large = document(5000), document(40000)
+        small_time = best_time(lambda: scan_comments(small, ('type',)))
+        large_time = best_time(lambda: scan_comments(large, ('type',)))
+        # 8x the input: linear is ~8x the time, quadratic would be ~64x
+        self.assertLess(large_time, small_time * 20 + 0.01)
+
+
+class TestParsersShareScanner(unittest.TestCase):
+    """Comments end up in the parsed models of all three file kinds"""
+
+    def test_types(self):
+        types_file = TypesParser.parse('''<?xml version="1.0"?>
+<!-- header -->
+<types>
+    <!-- rifle -->
+    <type name="AKM"><nominal>1</nominal><!-- inside --></type>
+    <type name="Apple"><nominal>1</nominal></type>
+</types>
+<!-- footer -->''', 'types.xml')
+        self.assertEqual(types_file.header_comments, ['<!--header-->'])
+        self.assertEqual(types_file.item_comments, {'AKM': ['<!--rifle-->']})
+        self.assertEqual(types_file.footer_comments, ['<!--footer-->'])
+
+    def test_spawnabletypes(self):
+        spawnable_file = SpawnableTypesParser.parse('''<?xml version="1.0"?>
+<!-- header -->
+<spawnabletypes>
+    <!-- first -->
+    <!-- second -->
+    <type name="AKM"><cargo preset="mixArmy"/></type>
+</spawnabletypes>
+<!-- footer -->''', 'cfgspawnabletypes.xml')
+        self.assertEqual(spawnable_file.header_comments, ['header'])
+        self.assertEqual(spawnable_file.type_comments, {'AKM': ['first', 'second']})
+        self.assertEqual(spawnable_file.footer_comments, ['footer'])
+
+    def test_random_presets(self):
+        presets_file = RandomPresetsParser.parse('''<?xml version="1.0"?>
+<randompresets>
+    <!-- food -->
+    <cargo chance="0.5" name="foodVillage"><item name="Apple" chance="0.2"/></cargo>
+    <attachments chance="1" name="optics"><item name="ACOG" chance="0.1"/></attachments>
+</randompresets>''', 'cfgrandompresets.xml')
+        self.assertEqual(presets_file.header_comments, [])
+        self.assertEqual(presets_file.preset_comments, {'foodVillage': ['<!--food-->']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,15 @@ Batch Operations Dialog
 Allows batch modification of multiple items with preview
 """
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QDoubleSpinBox, QSpinBox, QTableWidget,
-                             QTableWidgetItem, QCheckBox, QGroupBox, QComboBox,
+                             QPushButton, QDoubleSpinBox, QSpinBox, QTableView,
+                             QAbstractItemView, QCheckBox, QGroupBox, QComboBox,
                              QScrollArea, QHeaderView, QFrame, QMessageBox, QGridLayout,
                              QWidget)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from core.batch_engine import BatchDiff, BatchPlan, MULTIPLY, SET
 from models.type_item import TypeItem
-from typing import List, Dict
+from typing import List
+from ui.batch_preview_model import BatchPreviewModel
 from ui.draggable_spinbox import EnhancedSpinBox, EnhancedDoubleSpinBox
 from ui.toggle_switch import ToggleSwitch
 
@@ -20,7 +21,7 @@ class BatchOperationsDialog(QDialog):
         self.parent = parent
         self.items = items
         self.filter_description = filter_description
-        self.preview_data: List[Dict] = []
+        self.diff = BatchDiff([], {})
         
         self.setWindowTitle("Batch Operations - Edit Multiple Items")
         self.setModal(True)
@@ -284,29 +285,34 @@ class BatchOperationsDialog(QDialog):
         layout.addWidget(fields_group)
         
         # Preview section
-        preview_label = QLabel("<b>Preview Changes</b> (showing first 100)")
+        preview_label = QLabel("<b>Preview Changes</b>")
         layout.addWidget(preview_label)
         
-        self.preview_table = QTableWidget()
-        self.preview_table.setColumnCount(14)
-        self.preview_table.setHorizontalHeaderLabels([
-            "Item", "Nominal", "Lifetime", "Min", "Restock", "Quantmin", "Quantmax", "Cost",
-            "Cargo", "Hoarder", "Map", "Player", "Crafted", "Deloot"
-        ])
+        # Statistics over the whole selection
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        self.stats_label.setStyleSheet("QLabel { font-size: 11px; }")
+        layout.addWidget(self.stats_label)
+        
+        # Model/view - rows are built only when they are painted
+        self.preview_model = BatchPreviewModel(self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
+        self.preview_table.verticalHeader().setDefaultSectionSize(24)
         
         # Configure table
-        self.preview_table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.preview_table.setSelectionMode(QTableWidget.NoSelection)
+        self.preview_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.preview_table.setSelectionMode(QAbstractItemView.NoSelection)
         self.preview_table.setAlternatingRowColors(True)
         
         # Style for better readability
         self.preview_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #1e1e1e;
                 alternate-background-color: #252526;
                 gridline-color: #333;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 4px;
             }
         """)
@@ -314,7 +320,7 @@ class BatchOperationsDialog(QDialog):
         # Header settings
         header = self.preview_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)  # Item name stretches
-        for i in range(1, 14):
+        for i in range(1, len(BatchPreviewModel.COLUMNS)):
             header.setSectionResizeMode(i, QHeaderView.ResizeToContents)
         
         layout.addWidget(self.preview_table)
@@ -375,155 +381,65 @@ class BatchOperationsDialog(QDialog):
         # Recalculate preview
         self.calculate_preview()
     
-    def calculate_preview(self):
-        """Calculate and display preview of changes - one row per item"""
-        self.preview_data = []
-        
-        # Calculate changes for each item
-        for item in self.items:
-            item_data = {
-                'item': item,
-                'name': item.name,
-                'changes': {}
-            }
+    def compile_plan(self) -> BatchPlan:
+        """Read the checked controls once into a batch plan"""
+        plan = BatchPlan()
+        for field_name, controls in self.field_controls.items():
+            if not controls['checkbox'].isChecked():
+                continue
             
-            # Check each field
-            for field_name, controls in self.field_controls.items():
-                if controls['checkbox'].isChecked():
-                    
-                    # Handle category
-                    if field_name == 'category':
-                        old_value = item.category
-                        combo_text = controls['value'].currentText()
-                        new_value = None if combo_text == "(Clear)" else combo_text
-                        item_data['changes'][field_name] = {
-                            'old': old_value,
-                            'new': new_value
-                        }
-                    
-                    # Handle multi-select fields (usage, value, tag)
-                    elif 'field_type' in controls:
-                        field_type = controls['field_type']  # 'usage', 'value', or 'tag'
-                        field_value = controls['field_value']  # e.g., 'Military'
-                        is_enabled = controls['value'].isChecked()  # ON or OFF
-                        
-                        # Get the item's original list for comparison
-                        old_list = list(getattr(item, field_type))
-
-                        # If this batch already staged a change for the same field,
-                        # continue building from that staged list instead of starting over.
-                        if field_type in item_data['changes']:
-                            new_list = list(item_data['changes'][field_type]['new'])
-                        else:
-                            new_list = list(old_list)
-                        
-                        # Add or remove based on toggle
-                        if is_enabled and field_value not in new_list:
-                            new_list.append(field_value)
-                        elif not is_enabled and field_value in new_list:
-                            new_list.remove(field_value)
-                        
-                        # Store if changed
-                        if sorted(old_list) != sorted(new_list):
-                            # Store in changes per field type (aggregate all usage/value/tag changes)
-                            if field_type not in item_data['changes']:
-                                item_data['changes'][field_type] = {
-                                    'old': old_list,
-                                    'new': []
-                                }
-                            item_data['changes'][field_type]['new'] = new_list
-                    
-                    # Handle regular numeric fields and flags
-                    else:
-                        old_value = getattr(item, field_name)
-                        
-                        # Flags don't have mode dropdown (use toggle switch)
-                        if controls['mode'] is None:
-                            # Flag field - get value from toggle switch (1 if checked, 0 if not)
-                            new_value = 1 if controls['value'].isChecked() else 0
-                        else:
-                            mode = controls['mode'].currentText()
-                            input_value = controls['value'].value()
-                            
-                            if mode == 'Multiply':
-                                new_value = int(old_value * input_value)
-                            else:  # Set Value
-                                new_value = int(input_value)
-                            
-                            # Validation: min shouldn't exceed nominal
-                            if field_name == 'min' and 'nominal' in self.field_controls:
-                                nominal_value = getattr(item, 'nominal')
-                                # If nominal is also being changed, use new nominal
-                                if self.field_controls['nominal']['checkbox'].isChecked():
-                                    nominal_controls = self.field_controls['nominal']
-                                    if nominal_controls['mode'].currentText() == 'Multiply':
-                                        nominal_value = int(nominal_value * nominal_controls['value'].value())
-                                    else:
-                                        nominal_value = int(nominal_controls['value'].value())
-                                new_value = min(new_value, nominal_value)
-                        
-                        item_data['changes'][field_name] = {
-                            'old': old_value,
-                            'new': new_value
-                        }
+            if field_name == 'category':
+                combo_text = controls['value'].currentText()
+                plan.set_category = True
+                plan.category = None if combo_text == "(Clear)" else combo_text
             
-            # Only add if there are changes
-            if item_data['changes']:
-                self.preview_data.append(item_data)
-        
+            elif 'field_type' in controls:
+                # Multi-select entry (usage, value, tag): toggle on adds, off removes
+                edits = plan.add if controls['value'].isChecked() else plan.remove
+                edits.setdefault(controls['field_type'], []).append(controls['field_value'])
+            
+            elif controls['mode'] is None:
+                # Flag field - toggle switch gives 1 or 0
+                plan.flags[field_name] = 1 if controls['value'].isChecked() else 0
+            
+            else:
+                mode = MULTIPLY if controls['mode'].currentText() == 'Multiply' else SET
+                plan.numeric[field_name] = (mode, controls['value'].value())
+        return plan
+    
+    def calculate_preview(self):
+        """Calculate and display preview of changes - one row per changed item"""
+        self.diff = self.compile_plan().diff(self.items)
         self.populate_preview_table()
     
     def populate_preview_table(self):
-        """Populate preview table - one row per item, all fields as columns"""
-        # Show first 100 items
-        display_items = self.preview_data[:100]
-        
-        self.preview_table.setRowCount(len(display_items))
-        
-        field_order = [
-            'nominal', 'lifetime', 'min', 'restock', 'quantmin', 'quantmax', 'cost',
-            'count_in_cargo', 'count_in_hoarder', 'count_in_map', 
-            'count_in_player', 'crafted', 'deloot'
-        ]
+        """Show the current diff - one row per changed item, all fields as columns"""
+        self.preview_model.set_diff(self.diff)
         
-        for row, item_data in enumerate(display_items):
-            # Item name
-            name_item = QTableWidgetItem(item_data['name'])
-            self.preview_table.setItem(row, 0, name_item)
-            
-            # Each field column
-            for col_idx, field_name in enumerate(field_order, start=1):
-                if field_name in item_data['changes']:
-                    # Field is being changed - show old → new
-                    change = item_data['changes'][field_name]
-                    text = f"{change['old']} → {change['new']}"
-                    cell_item = QTableWidgetItem(text)
-                    # Highlight changed fields
-                    cell_item.setForeground(QColor("#51cf66"))  # Green
-                else:
-                    # Field not being changed - show current value
-                    current_value = getattr(item_data['item'], field_name)
-                    cell_item = QTableWidgetItem(str(current_value))
-                    cell_item.setForeground(QColor("#999"))  # Gray
-                
-                self.preview_table.setItem(row, col_idx, cell_item)
+        stats = self.diff.statistics
         
         # Update summary
-        total_items = len(self.preview_data)
-        total_changes = sum(len(item['changes']) for item in self.preview_data)
+        self.summary_label.setText(
+            f"Total: {stats.changed_items} of {stats.items} items with {stats.change_count} changes"
+        )
         
-        if total_items > 100:
-            self.summary_label.setText(
-                f"Showing first 100 of {total_items} items with {total_changes} total changes"
-            )
-        else:
-            self.summary_label.setText(
-                f"Total: {total_items} items with {total_changes} changes"
-            )
+        lines = [
+            f"<b>Σ Nominal:</b> {stats.nominal_before:,} → {stats.nominal_after:,} "
+            f"({stats.nominal_after - stats.nominal_before:+,})"
+            f" &nbsp; <b>Σ Min:</b> {stats.min_before:,} → {stats.min_after:,} "
+            f"({stats.min_after - stats.min_before:+,})"
+        ]
+        if stats.clamped_min:
+            lines.append(f"<b>Min capped at nominal:</b> {stats.clamped_min:,} item(s)")
+        if stats.category_nominal_delta:
+            deltas = sorted(stats.category_nominal_delta.items(), key=lambda entry: entry[0] or "")
+            lines.append("<b>Nominal by category:</b> " + ", ".join(
+                f"{category or '(None)'} {delta:+,}" for category, delta in deltas))
+        self.stats_label.setText("<br>".join(lines))
     
     def apply_changes(self):
         """Apply all changes to items"""
-        if not self.preview_data:
+        if not len(self.diff):
             QMessageBox.warning(
                 self,
                 "No Changes",
@@ -531,8 +447,8 @@ class BatchOperationsDialog(QDialog):
             )
             return
         
-        total_items = len(self.preview_data)
-        total_changes = sum(len(item['changes']) for item in self.preview_data)
+        total_items = len(self.diff)
+        total_changes = self.diff.change_count
         
         # Confirm
         reply = QMessageBox.question(
@@ -547,27 +463,23 @@ class BatchOperationsDialog(QDialog):
             return
         
         # Push to undo stack before modification
-        items_to_modify = [item_data['item'] for item_data in self.preview_data]
-        self.parent.parent.push_undo_state(items_to_modify)
+        self.parent.parent.push_undo_state(self.diff.changed_items)
         
         # Apply changes
+        changed_items = self.diff.apply()
+        
+        # Mark parent files as modified (one registry lookup per file)
         modified_files = set()
+        item_registry = self.parent.parent.item_registry
+        for item in changed_items:
+            if item.source_file in modified_files:
+                continue
+            types_file = item_registry.get_file(item)
+            if types_file:
+                types_file.modified = True
+                modified_files.add(types_file.path)
         
-        for item_data in self.preview_data:
-            item = item_data['item']
-            
-            # Apply each field change
-            for field_name, change in item_data['changes'].items():
-                setattr(item, field_name, change['new'])
-            
-            item.modified = True
-            
-            # Mark parent file as modified
-            for types_file in self.parent.parent.types_files:
-                if item in types_file.items:
-                    types_file.modified = True
-                    modified_files.add(types_file.path)
-                    break
+        self.parent.filter_engine.update_items(changed_items)
         
         # Success message
         QMessageBox.information(
@@ -576,8 +488,8 @@ class BatchOperationsDialog(QDialog):
             f"Successfully applied {total_changes} changes to {total_items} items across {len(modified_files)} file(s)."
         )
         
-        # Refresh parent table
-        self.parent.populate_table()
+        # Repaint edited rows in the parent table
+        self.parent.refresh_items(changed_items)
         self.parent.parent.update_status_bar()
         
-        self.accept()
\ No newline at end of file
+        self.accept()
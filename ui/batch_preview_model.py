@@ -0,0 +1,72 @@
+"""
+Batch Preview Model
+Item model for the batch operations preview - rows come from the BatchDiff
+only when the view paints them, so any selection size can be scrolled
+"""
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor
+from core.batch_engine import BatchDiff
+from typing import Dict, Optional, Tuple
+
+CHANGED_COLOR = QColor("#51cf66")
+UNCHANGED_COLOR = QColor("#999")
+
+
+class BatchPreviewModel(QAbstractTableModel):
+    """Read-only table model with one row per changed item of a BatchDiff"""
+
+    COLUMNS = ["Item", "Nominal", "Lifetime", "Min", "Restock", "Quantmin", "Quantmax", "Cost",
+               "Cargo", "Hoarder", "Map", "Player", "Crafted", "Deloot"]
+    FIELDS = [None, 'nominal', 'lifetime', 'min', 'restock', 'quantmin', 'quantmax', 'cost',
+              'count_in_cargo', 'count_in_hoarder', 'count_in_map',
+              'count_in_player', 'crafted', 'deloot']
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._diff = BatchDiff([], {})
+        # The view asks for every column of a row in turn - keep the last row
+        self._cached_row: Optional[Tuple[int, object, Dict]] = None
+
+    def set_diff(self, diff: BatchDiff):
+        """Show a new preview"""
+        self.beginResetModel()
+        self._diff = diff
+        self._cached_row = None
+        self.endResetModel()
+
+    def _row(self, row: int):
+        """(item, changes) of a row, assembled on first request"""
+        if self._cached_row is None or self._cached_row[0] != row:
+            item, changes = self._diff.row(row)
+            self._cached_row = (row, item, changes)
+        return self._cached_row[1], self._cached_row[2]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._diff)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ForegroundRole):
+            return QVariant()
+        item, changes = self._row(index.row())
+        field_name = self.FIELDS[index.column()]
+
+        if field_name is None:
+            return item.name if role == Qt.DisplayRole else QVariant()
+        if field_name in changes:
+            # Field is being changed - show old → new
+            if role == Qt.ForegroundRole:
+                return CHANGED_COLOR
+            old_value, new_value = changes[field_name]
+            return f"{old_value} → {new_value}"
+        # Field not being changed - show current value
+        if role == Qt.ForegroundRole:
+            return UNCHANGED_COLOR
+        return str(getattr(item, field_name))
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
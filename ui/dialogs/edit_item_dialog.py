@@ -4,15 +4,18 @@ Edit Item Dialog - For editing items in cargo/attachments blocks
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QComboBox,
                              QDoubleSpinBox, QDialogButtonBox, QMessageBox, QLabel)
 from typing import List, Optional
+from ui.name_completer import setup_name_combo
+from models.name_index import NameIndex
 from models.types_file import TypesFile
 from models.spawnable_type import SpawnableItem
 
 class EditItemDialog(QDialog):
     def __init__(self, parent, item: SpawnableItem, types_files: List[TypesFile], 
-                 has_multiple_items: bool):
+                 has_multiple_items: bool, name_index: Optional[NameIndex] = None):
         super().__init__(parent)
         self.item = item
         self.types_files = types_files
+        self.name_index = name_index
         self.has_multiple_items = has_multiple_items
         
         self.setWindowTitle("Edit Item")
@@ -73,24 +76,14 @@ class EditItemDialog(QDialog):
         self.setLayout(layout)
     
     def populate_item_names(self):
-        """Populate item name dropdown from types files"""
+        """Populate item name dropdown and completer from the name index"""
         if not self.types_files:
             return
         
-        # Collect all item names
-        item_names = set()
-        for types_file in self.types_files:
-            for item in types_file.items:
-                item_names.add(item.name)
-        
-        # Add to combo
-        for name in sorted(item_names):
-            self.item_combo.addItem(name)
-        
-        # Set completer
-        self.item_combo.setInsertPolicy(QComboBox.NoInsert)
-        self.item_combo.completer().setCompletionMode(self.item_combo.completer().PopupCompletion)
-        self.item_combo.completer().setCaseSensitivity(0)  # Case insensitive
+        if self.name_index is None:
+            self.name_index = NameIndex(item.name for types_file in self.types_files
+                                        for item in types_file.items)
+        setup_name_combo(self.item_combo, self.name_index)
     
     def validate_and_accept(self):
         item_name = self.item_combo.currentText().strip()
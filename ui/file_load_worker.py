@@ -0,0 +1,28 @@
+"""
+File Load Worker
+Runs a ParallelLoader off the GUI thread and streams results back via signals
+"""
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.parallel_loader import ParallelLoader
+from typing import List
+
+
+class FileLoadWorker(QThread):
+    """Background thread that loads and parses files through a worker pool"""
+
+    # Emitted once per completed file with a LoadResult
+    file_loaded = pyqtSignal(object)
+
+    def __init__(self, loader: ParallelLoader, paths: List[str], parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self.paths = paths
+        self.results = []  # All LoadResults in request order, set when run() finishes
+
+    def run(self):
+        """Load all files (runs on the worker thread)"""
+        self.results = self.loader.load(self.paths, on_result=self.file_loaded.emit)
+
+    def cancel(self):
+        """Stop loading files that haven't started yet"""
+        self.loader.cancel()
@@ -72,9 +72,13 @@ class LoadingProgressDialog(QDialog):
     
     def cancel(self):
         """Cancel loading"""
-        self.cancelled = True
         self.reject()
     
+    def reject(self):
+        """Cancel loading - also reached by pressing Esc"""
+        self.cancelled = True
+        super().reject()
+    
     def is_cancelled(self) -> bool:
         """Check if loading was cancelled"""
         return self.cancelled
@@ -3,52 +3,61 @@ Main Application Window
 """
 from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QStatusBar, QMessageBox,
                              QWidget, QVBoxLayout, QAction, QMenuBar, QMenu,
-                             QProgressDialog)
-from PyQt5.QtCore import Qt, QTimer
+                             QProgressDialog, QApplication)
+from PyQt5.QtCore import Qt, QTimer, QEventLoop
 from PyQt5.QtGui import QCloseEvent
 from config.app_config import AppConfig
-from config.sftp_manager import SFTPManager
 from config.local_file_manager import LocalFileManager
 from core.backup_manager import BackupManager
 from core.limits_parser import LimitsParser
 from core.economy_parser import EconomyParser
 from core.xml_parser import TypesParser
-from core.random_presets_parser import RandomPresetsParser
-from core.spawnabletypes_parser import SpawnableTypesParser
+from core.types_writer import TypesWriter
+from core.parallel_loader import ParallelLoader, LoadResult
+from core.process_parser import ProcessParser
+from core.tracing import tracer
+from core.undo_history import UndoHistory, UndoEntry, TYPES, SPAWNABLE_TYPES, RANDOM_PRESETS
 from models.types_file import TypesFile
 from models.type_item import TypeItem
+from models.item_registry import ItemRegistry
 from models.spawnable_type import SpawnableTypesFile
 from ui.types_editor import TypesEditorTab
-from ui.settings_tab import SettingsTab
-from ui.random_presets_tab import RandomPresetsTab
-from ui.spawnable_types_tab import SpawnableTypesTab
-from ui.sftp_dialog import SFTPDialog
 from version import __version__
 from ui.startup_dialog import StartupDialog
-from ui.save_dialog import SaveDialog
 from typing import List, Dict
+import importlib
 import traceback
 
+# Tabs built when first shown: (attribute, tab title, module, class)
+DEFERRED_TABS = [
+    ('random_presets_tab', "Random Presets", 'ui.random_presets_tab', 'RandomPresetsTab'),
+    ('spawnable_types_tab', "Spawnable Types", 'ui.spawnable_types_tab', 'SpawnableTypesTab'),
+    ('settings_tab', "Settings", 'ui.settings_tab', 'SettingsTab'),
+]
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         
         # Core components
         self.config = AppConfig()
-        self.sftp = SFTPManager()  # Keep for backward compatibility
+        self._sftp = None  # SFTPManager, created on first use (imports paramiko)
         self.file_manager = None  # Will be set to SFTP or Local manager
         self.backup_manager = BackupManager(self.config.get_backup_location())
         self.limits_parser = LimitsParser()
+        # Large files parse on worker processes if enabled in settings
+        self.process_parser = ProcessParser(self.config.get_parse_processes())
+        tracer.enable(self.config.get_trace_enabled())
         
         # Data
         self.types_files: List[TypesFile] = []
+        self.item_registry = ItemRegistry()  # Name/owner index over types_files
         self.spawnabletypes_files: List[SpawnableTypesFile] = []
         self.random_presets_file = None  # RandomPresetsFile or None
         self.has_random_preset_changes = False  # Track if random presets modified
         self.has_spawnabletypes_changes = False  # Track if spawnable types modified
-        self.undo_stack = []
-        self.redo_stack = []
-        self.max_undo_stack = 50
+        # Shared by all editor tabs
+        self.history = UndoHistory(max_entries=50, max_bytes=self.config.get_undo_memory_mb() * 1024 * 1024)
         
         self.init_ui()
         self.restore_window_state()
@@ -56,11 +65,20 @@ class MainWindow(QMainWindow):
         # Show startup dialog instead of auto-connecting
         QTimer.singleShot(100, self.show_startup_dialog)
     
+    @property
+    def sftp(self):
+        """SFTP manager (paramiko is imported when it is first needed)"""
+        if self._sftp is None:
+            from config.sftp_manager import SFTPManager
+            self._sftp = SFTPManager()
+        return self._sftp
+    
     def show_startup_dialog(self):
         """Show startup dialog to choose connection mode"""
         startup = StartupDialog(self, self.config)
         if startup.exec_():
             if startup.mode == 'sftp':
+                from ui.sftp_dialog import SFTPDialog
                 self.file_manager = self.sftp
                 # Show SFTP connection dialog
                 sftp_dialog = SFTPDialog(self)
@@ -94,16 +112,14 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
         
-        # Create tabs
+        # Create tabs - only the first is built now, the others (and their
+        # modules) when first shown; until then their attribute is None
         self.types_editor_tab = TypesEditorTab(self)
-        self.random_presets_tab = RandomPresetsTab(self)
-        self.spawnable_types_tab = SpawnableTypesTab(self)
-        self.settings_tab = SettingsTab(self)
-        
         self.tabs.addTab(self.types_editor_tab, "Types Editor")
-        self.tabs.addTab(self.random_presets_tab, "Random Presets")
-        self.tabs.addTab(self.spawnable_types_tab, "Spawnable Types")
-        self.tabs.addTab(self.settings_tab, "Settings")
+        for attribute, title, _, _ in DEFERRED_TABS:
+            setattr(self, attribute, None)
+            self.tabs.addTab(QWidget(), title)  # Placeholder
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         # Initialize undo/redo button states
         self.update_undo_redo_buttons()
@@ -113,6 +129,44 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.update_status_bar()
     
+    def on_tab_changed(self, index: int):
+        """Build a deferred tab the first time it is shown"""
+        if index > 0 and index <= len(DEFERRED_TABS):
+            self.ensure_tab(DEFERRED_TABS[index - 1][0])
+    
+    def ensure_tab(self, attribute: str) -> QWidget:
+        """Return a tab, building it (and loading the current data into it) if needed"""
+        tab = getattr(self, attribute)
+        if tab is not None:
+            return tab
+        
+        index, (_, title, module_name, class_name) = next(
+            (i, entry) for i, entry in enumerate(DEFERRED_TABS, start=1) if entry[0] == attribute)
+        tab = getattr(importlib.import_module(module_name), class_name)(self)
+        setattr(self, attribute, tab)
+        
+        # Swap the placeholder for the real tab without re-entering this handler
+        self.tabs.blockSignals(True)
+        current = self.tabs.currentIndex()
+        placeholder = self.tabs.widget(index)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, tab, title)
+        self.tabs.setCurrentIndex(current)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        
+        # Data loaded before the tab existed
+        if attribute == 'random_presets_tab':
+            has_changes = self.has_random_preset_changes
+            tab.load_data(self.random_presets_file)
+            self.has_random_preset_changes = has_changes  # load_data resets the flag
+        elif attribute == 'spawnable_types_tab':
+            tab.load_data(self.spawnabletypes_files)
+        if hasattr(tab, 'undo_btn'):
+            tab.undo_btn.setEnabled(self.history.can_undo)
+            tab.redo_btn.setEnabled(self.history.can_redo)
+        return tab
+    
     def create_menu_bar(self):
         """Create menu bar"""
         menubar = self.menuBar()
@@ -440,6 +494,7 @@ th { background-color: #252526; }
     
     def show_sftp_dialog(self):
         """Show SFTP connection dialog"""
+        from ui.sftp_dialog import SFTPDialog
         dialog = SFTPDialog(self)
         if dialog.exec_():
             # Connection successful
@@ -464,19 +519,23 @@ th { background-color: #252526; }
             self.file_manager = None
         
         self.types_files = []
+        self.item_registry.clear()
         self.types_editor_tab.clear_data()
+        self.clear_undo_redo()  # Entries refer to the unloaded objects
         self.update_status_bar()
     
     def load_server_data(self):
         """Load all data from the server"""
         try:
             self.status_bar.showMessage("Loading data...")
+            tracer.clear()  # The trace covers the latest load onwards
             
             # Load limits definitions
             self.load_limits_definitions()
             
             # Load economy core to find types and spawnabletypes files
-            economy_xml = self.file_manager.read_file('cfgeconomycore.xml')
+            with tracer.span('io.read', path='cfgeconomycore.xml'):
+                economy_xml = self.file_manager.read_file('cfgeconomycore.xml')
             types_file_paths, spawnabletypes_file_paths = EconomyParser.parse_all(economy_xml)
             
             # Add vanilla db/types.xml if it exists (not always in cfgeconomycore but loaded by game)
@@ -502,6 +561,9 @@ th { background-color: #252526; }
             # Load random presets (optional file)
             self.load_random_presets()
             
+            if tracer.enabled:
+                self.status_bar.showMessage(f"Load trace: {tracer.format_stages()}", 15000)
+            
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -512,88 +574,67 @@ th { background-color: #252526; }
     
     def load_types_files_with_progress(self, types_file_paths: List[str], retry_files: List[str] = None):
         """Load types files with progress dialog and caching"""
-        from ui.loading_progress_dialog import LoadingProgressDialog
-        from PyQt5.QtWidgets import QApplication
-        
         # Determine which files to load
         files_to_load = retry_files if retry_files else types_file_paths
         
-        # Create progress dialog
-        progress = LoadingProgressDialog(self, len(files_to_load))
-        progress.show()
-        QApplication.processEvents()
+        # Track cache statistics
+        cache_stats = {'cached': 0, 'downloaded': 0}
         
-        # Track errors and cache statistics
-        loading_errors = []
-        cached_count = 0
-        downloaded_count = 0
+        def on_file_loaded(result):
+            if not result.success:
+                return
+            if result.from_cache:
+                cache_stats['cached'] += 1
+            else:
+                cache_stats['downloaded'] += 1
+                # Cache the file
+                if result.mtime:
+                    self.config.set_cached_file(result.path, result.mtime, result.content)
+        
+        loader = ParallelLoader(
+            self.file_manager,
+            self.parse_types_file,
+            cache_lookup=self.config.get_cached_file,
+            use_cache=not retry_files,  # Don't use cache when retrying
+            # Parsing while downloading is single-threaded - with worker processes
+            # enabled, downloaded files are parsed on those instead
+            stream_parse_func=None if self.process_parser.enabled else self.parse_types_stream
+        )
+        results = self.run_parallel_load(loader, files_to_load, "Loading Files", on_file_loaded)
+        self.config.flush_file_cache()
         
         # Load files (keep existing if retrying)
         if not retry_files:
             self.types_files = []
         
-        for i, file_path in enumerate(files_to_load, 1):
-            if progress.is_cancelled():
-                break
-            
-            try:
-                # Check if we can use cached version
-                use_cache = False
-                types_xml = None
-                
-                if not retry_files:  # Don't use cache when retrying
-                    # Get remote file modification time
-                    remote_mtime = self.file_manager.get_file_mtime(file_path)
-                    
-                    if remote_mtime:
-                        # Check cache
-                        cached = self.config.get_cached_file(file_path)
-                        if cached and cached.get('timestamp') == remote_mtime:
-                            # Cache is valid
-                            types_xml = cached.get('content')
-                            use_cache = True
-                            cached_count += 1
-                
-                # Download if not using cache
-                if not use_cache:
-                    types_xml = self.file_manager.read_file(file_path)
-                    downloaded_count += 1
-                    
-                    # Cache the file
-                    remote_mtime = self.file_manager.get_file_mtime(file_path)
-                    if remote_mtime:
-                        self.config.set_cached_file(file_path, remote_mtime, types_xml)
-                
-                # Parse the XML
-                types_file = TypesParser.parse(types_xml, file_path, self.limits_parser)
+        loading_errors = []
+        for result in results:
+            if result.success:
+                types_file = result.parsed
                 
                 # Store original content for comparison
-                types_file.original_content = types_xml
+                types_file.original_content = result.content
                 
                 # If retrying, remove old version first
                 if retry_files:
-                    self.types_files = [tf for tf in self.types_files if tf.path != file_path]
+                    self.types_files = [tf for tf in self.types_files if tf.path != result.path]
                 
                 self.types_files.append(types_file)
-                progress.update_progress(i, file_path, True)
-                
-            except Exception as e:
-                error_msg = str(e)
+            else:
                 loading_errors.append({
-                    'file': file_path,
-                    'error': error_msg
+                    'file': result.path,
+                    'error': result.error
                 })
-                progress.update_progress(i, file_path, False)
-            
-            QApplication.processEvents()
         
-        progress.close()
+        # Keep the order files are listed in cfgeconomycore.xml
+        self.types_files.sort(key=lambda tf: self._file_order(types_file_paths, tf.path))
+        self.item_registry.rebuild(self.types_files)
         
         # Update UI
         self.types_editor_tab.load_data(self.types_files, self.limits_parser)
         
         total_items = sum(len(tf.items) for tf in self.types_files)
-        cache_msg = f" ({cached_count} cached, {downloaded_count} downloaded)" if not retry_files else ""
+        cache_msg = f" ({cache_stats['cached']} cached, {cache_stats['downloaded']} downloaded)" if not retry_files else ""
         self.status_bar.showMessage(
             f"Loaded {len(self.types_files)} files with {total_items} items{cache_msg}", 
             5000
@@ -622,9 +663,6 @@ th { background-color: #252526; }
     
     def load_spawnabletypes_files_with_progress(self, spawnabletypes_file_paths: List[str], retry_files: List[str] = None):
         """Load spawnable types files with progress dialog"""
-        from ui.loading_progress_dialog import LoadingProgressDialog
-        from PyQt5.QtWidgets import QApplication
-        
         if not spawnabletypes_file_paths:
             print("No spawnable types files found in cfgeconomycore.xml")
             return
@@ -632,51 +670,33 @@ th { background-color: #252526; }
         # Determine which files to load
         files_to_load = retry_files if retry_files else spawnabletypes_file_paths
         
-        # Create progress dialog
-        progress = LoadingProgressDialog(self, len(files_to_load))
-        progress.setWindowTitle("Loading Spawnable Types")
-        progress.show()
-        QApplication.processEvents()
-        
-        # Track errors
-        loading_errors = []
+        loader = ParallelLoader(self.file_manager, self.parse_spawnabletypes_file)
+        results = self.run_parallel_load(loader, files_to_load, "Loading Spawnable Types")
         
         # Load files (keep existing if retrying)
         if not retry_files:
             self.spawnabletypes_files = []
         
-        for i, file_path in enumerate(files_to_load, 1):
-            if progress.is_cancelled():
-                break
-            
-            try:
-                # Read file
-                xml_content = self.file_manager.read_file(file_path)
-                
-                # Parse the XML
-                spawnable_types_file = SpawnableTypesParser.parse(xml_content, file_path)
-                
+        loading_errors = []
+        for result in results:
+            if result.success:
                 # If retrying, remove old version first
                 if retry_files:
-                    self.spawnabletypes_files = [stf for stf in self.spawnabletypes_files if stf.source_file != file_path]
-                
-                self.spawnabletypes_files.append(spawnable_types_file)
-                progress.update_progress(i, file_path, True)
+                    self.spawnabletypes_files = [stf for stf in self.spawnabletypes_files if stf.source_file != result.path]
                 
-            except Exception as e:
-                error_msg = str(e)
+                self.spawnabletypes_files.append(result.parsed)
+            else:
                 loading_errors.append({
-                    'file': file_path,
-                    'error': error_msg
+                    'file': result.path,
+                    'error': result.error
                 })
-                progress.update_progress(i, file_path, False)
-            
-            QApplication.processEvents()
         
-        progress.close()
+        # Keep the order files are listed in cfgeconomycore.xml
+        self.spawnabletypes_files.sort(key=lambda stf: self._file_order(spawnabletypes_file_paths, stf.source_file))
         
-        # Load data into tab
-        self.spawnable_types_tab.load_data(self.spawnabletypes_files)
+        # Load data into tab (if it has been built - otherwise it loads when first shown)
+        if self.spawnable_types_tab is not None:
+            self.spawnable_types_tab.load_data(self.spawnabletypes_files)
         
         # Update status
         total_types = sum(len(stf.types) for stf in self.spawnabletypes_files)
@@ -702,14 +722,91 @@ th { background-color: #252526; }
                 )
                 self.load_spawnabletypes_files_with_progress(spawnabletypes_file_paths, failed_files)
     
+    def run_parallel_load(self, loader: ParallelLoader, paths: List[str], title: str,
+                          on_file_loaded=None) -> List[LoadResult]:
+        """
+        Run a ParallelLoader on a background thread while showing progress.
+        Blocks (with a live event loop) until loading finishes or is cancelled.
+        Returns the completed results in the order of paths.
+        """
+        from ui.loading_progress_dialog import LoadingProgressDialog
+        from ui.file_load_worker import FileLoadWorker
+        
+        progress = LoadingProgressDialog(self, len(paths))
+        progress.setWindowTitle(title)
+        
+        completed = {'count': 0}
+        
+        def on_result(result: LoadResult):
+            completed['count'] += 1
+            if on_file_loaded:
+                on_file_loaded(result)
+            progress.update_progress(completed['count'], result.path, result.success)
+        
+        worker = FileLoadWorker(loader, paths, self)
+        worker.file_loaded.connect(on_result)
+        worker.finished.connect(progress.accept)
+        # Connected before start() so the end of the run can't be missed
+        finished_loop = QEventLoop()
+        worker.finished.connect(finished_loop.quit)
+        worker.start()
+        
+        # Modal event loop - returns when the worker finishes or the user cancels
+        progress.exec_()
+        
+        if not worker.isFinished():
+            # Closed before loading finished (Cancel, Esc) - files already being
+            # read still complete, so keep the GUI responsive until the worker's
+            # finished signal instead of blocking in wait()
+            worker.cancel()
+            finished_loop.exec_()
+        worker.file_loaded.disconnect(on_result)
+        progress.close()
+        
+        return worker.results
+    
+    def parse_types_file(self, xml_content: str, file_path: str) -> TypesFile:
+        """Parse a types file, reusing the cached model if the content is unchanged"""
+        return self.config.model_cache.parse_cached(
+            'types', file_path, xml_content,
+            lambda content, path: self.process_parser.parse('types', content, path, self.limits_parser),
+            self.limits_parser.fingerprint()
+        )
+    
+    def parse_types_stream(self, stream, file_path: str) -> TypesFile:
+        """Parse a types file while it is downloaded, then cache the model"""
+        types_file = TypesParser.parse_stream(stream, file_path, self.limits_parser)
+        self.config.model_cache.put_content(
+            'types', file_path, types_file.original_content, types_file,
+            self.limits_parser.fingerprint()
+        )
+        return types_file
+    
+    def parse_spawnabletypes_file(self, xml_content: str, file_path: str) -> SpawnableTypesFile:
+        """Parse a spawnable types file, reusing the cached model if unchanged"""
+        return self.config.model_cache.parse_cached(
+            'spawnabletypes', file_path, xml_content,
+            lambda content, path: self.process_parser.parse('spawnabletypes', content, path)
+        )
+    
+    @staticmethod
+    def _file_order(file_paths: List[str], path: str) -> int:
+        """Position of a path in the economy file list (unknown paths sort last)"""
+        try:
+            return file_paths.index(path)
+        except ValueError:
+            return len(file_paths)
+    
     def load_limits_definitions(self):
         """Load limits definition files"""
         self.limits_parser = LimitsParser()
         
         # Load main limits file
         try:
-            limits_xml = self.file_manager.read_file('cfglimitsdefinition.xml')
-            self.limits_parser.parse(limits_xml)
+            with tracer.span('io.read', path='cfglimitsdefinition.xml'):
+                limits_xml = self.file_manager.read_file('cfglimitsdefinition.xml')
+            with tracer.span('parse.limits', path='cfglimitsdefinition.xml'):
+                self.limits_parser.parse(limits_xml)
             print(f"Loaded limits: {len(self.limits_parser.get_categories())} categories, "
                   f"{len(self.limits_parser.get_usages())} usages, "
                   f"{len(self.limits_parser.get_values())} values, "
@@ -721,8 +818,10 @@ th { background-color: #252526; }
         
         # Load user limits file (contains user group definitions)
         try:
-            user_limits_xml = self.file_manager.read_file('cfglimitsdefinitionuser.xml')
-            self.limits_parser.parse_user_definitions(user_limits_xml)
+            with tracer.span('io.read', path='cfglimitsdefinitionuser.xml'):
+                user_limits_xml = self.file_manager.read_file('cfglimitsdefinitionuser.xml')
+            with tracer.span('parse.limits', path='cfglimitsdefinitionuser.xml'):
+                self.limits_parser.parse_user_definitions(user_limits_xml)
             print(f"Loaded {len(self.limits_parser.get_user_names())} user definitions")
         except Exception as e:
             print(f"Error loading cfglimitsdefinitionuser.xml: {e}")
@@ -733,10 +832,13 @@ th { background-color: #252526; }
         """Load random presets file (optional)"""
         try:
             presets_xml = self.file_manager.read_file('cfgrandompresets.xml')
-            self.random_presets_file = RandomPresetsParser.parse(presets_xml, 'cfgrandompresets.xml')
+            self.random_presets_file = self.config.model_cache.parse_cached(
+                'randompresets', 'cfgrandompresets.xml', presets_xml,
+                lambda content, path: self.process_parser.parse('randompresets', content, path)
+            )
             
-            # Load into tab
-            self.random_presets_tab.load_data(self.random_presets_file)
+            # Load into tab (if built)
+            self._load_random_presets_tab()
             
             total_presets = self.random_presets_file.get_total_preset_count()
             print(f"Loaded cfgrandompresets.xml: {total_presets} presets "
@@ -746,7 +848,7 @@ th { background-color: #252526; }
         except FileNotFoundError:
             # File doesn't exist - this is okay, user can create it later
             self.random_presets_file = None
-            self.random_presets_tab.load_data(None)
+            self._load_random_presets_tab()
             print("cfgrandompresets.xml not found - file is optional and can be created later")
             
             # Show info message to user
@@ -761,7 +863,7 @@ th { background-color: #252526; }
         except Exception as e:
             # Parse error or other issue
             self.random_presets_file = None
-            self.random_presets_tab.load_data(None)
+            self._load_random_presets_tab()
             print(f"Error loading cfgrandompresets.xml: {e}")
             
             # Show warning with option to continue
@@ -774,6 +876,13 @@ th { background-color: #252526; }
                 QMessageBox.Ok
             )
     
+    def _load_random_presets_tab(self):
+        """Show the loaded presets file in its tab (a tab built later loads it itself)"""
+        if self.random_presets_tab is not None:
+            self.random_presets_tab.load_data(self.random_presets_file)
+        else:
+            self.has_random_preset_changes = False
+    
     def has_unsaved_changes(self) -> bool:
         """Check if there are any unsaved changes"""
         types_modified = any(tf.has_modifications() for tf in self.types_files)
@@ -785,7 +894,7 @@ th { background-color: #252526; }
             connection_info = self.file_manager.get_connection_info()
             files_count = len(self.types_files)
             total_items = sum(len(tf.items) for tf in self.types_files)
-            modified_count = sum(len(tf.get_modified_items()) for tf in self.types_files)
+            modified_count = self.types_editor_tab.filter_engine.store.modified_count
             
             status = f"Connected: {connection_info} | {files_count} files | {total_items} items"
             if modified_count > 0:
@@ -804,164 +913,48 @@ th { background-color: #252526; }
             self.status_bar.showMessage("Not connected")
     
     def undo(self):
-        """Undo last operation"""
-        if not self.undo_stack:
-            return
-        
-        # Pop last change from undo stack
-        change = self.undo_stack.pop()
-        
-        # Check if this is a random_presets change or types change
-        if isinstance(change, tuple) and change[0] == 'random_presets':
-            # Random presets undo
-            _, old_state = change
-            
-            # Save current state for redo
-            if self.random_presets_file:
-                import copy
-                self.redo_stack.append(('random_presets', copy.deepcopy(self.random_presets_file)))
-            else:
-                self.redo_stack.append(('random_presets', None))
-            
-            # Restore old state
-            self.random_presets_file = old_state
-            self.random_presets_tab.load_data(old_state)
-            
-        else:
-            # Types items undo (existing behavior)
-            # Store current state for redo
-            redo_snapshots = []
-            for item_name, old_snapshot in change:
-                # Find the current item
-                current_item = None
-                for types_file in self.types_files:
-                    current_item = types_file.get_item_by_name(item_name)
-                    if current_item:
-                        break
-                
-                if current_item:
-                    # Save current state for redo
-                    redo_snapshots.append((item_name, current_item.clone()))
-                    
-                    # Restore old state
-                    self._apply_snapshot(current_item, old_snapshot)
-            
-            # Push to redo stack
-            self.redo_stack.append(redo_snapshots)
-            
-            # Update types editor UI
-            self.types_editor_tab.refresh_display()
-        
-        # Update UI
-        self.update_undo_redo_buttons()
-        self.update_status_bar()
+        """Undo last operation (any editor)"""
+        entry = self.history.undo()
+        if entry:
+            self._refresh_after_history(entry)
     
     def redo(self):
-        """Redo last undone operation"""
-        if not self.redo_stack:
-            return
-        
-        # Pop last undone change from redo stack
-        change = self.redo_stack.pop()
-        
-        # Check if this is a random_presets change or types change
-        if isinstance(change, tuple) and change[0] == 'random_presets':
-            # Random presets redo
-            _, new_state = change
-            
-            # Save current state for undo
-            if self.random_presets_file:
-                import copy
-                self.undo_stack.append(('random_presets', copy.deepcopy(self.random_presets_file)))
-            else:
-                self.undo_stack.append(('random_presets', None))
-            
-            # Restore new state
-            self.random_presets_file = new_state
-            self.random_presets_tab.load_data(new_state)
-            
-        else:
-            # Types items redo (existing behavior)
-            # Store current state for undo
-            undo_snapshots = []
-            for item_name, new_snapshot in change:
-                # Find the current item
-                current_item = None
-                for types_file in self.types_files:
-                    current_item = types_file.get_item_by_name(item_name)
-                    if current_item:
-                        break
-                
-                if current_item:
-                    # Save current state for undo
-                    undo_snapshots.append((item_name, current_item.clone()))
-                    
-                    # Restore new state
-                    self._apply_snapshot(current_item, new_snapshot)
-            
-            # Push to undo stack
-            self.undo_stack.append(undo_snapshots)
-            
-            # Update types editor UI
+        """Redo last undone operation (any editor)"""
+        entry = self.history.redo()
+        if entry:
+            self._refresh_after_history(entry)
+    
+    def _refresh_after_history(self, entry: UndoEntry):
+        """Show the state an undo/redo restored in the editor it belongs to"""
+        if entry.kind == TYPES:
+            self.types_editor_tab.filter_engine.update_items(entry.targets)
             self.types_editor_tab.refresh_display()
+        elif entry.kind == SPAWNABLE_TYPES:
+            self.spawnable_types_tab.refresh_after_history()
+        elif entry.kind == RANDOM_PRESETS:
+            self.random_presets_tab.refresh_after_history()
         
         # Update UI
         self.update_undo_redo_buttons()
         self.update_status_bar()
     
-    def _apply_snapshot(self, target_item: TypeItem, snapshot: TypeItem):
-        """Apply a snapshot to an item"""
-        target_item.nominal = snapshot.nominal
-        target_item.lifetime = snapshot.lifetime
-        target_item.restock = snapshot.restock
-        target_item.min = snapshot.min
-        target_item.quantmin = snapshot.quantmin
-        target_item.quantmax = snapshot.quantmax
-        target_item.cost = snapshot.cost
-        target_item.category = snapshot.category
-        target_item.usage = snapshot.usage.copy()
-        target_item.value = snapshot.value.copy()
-        target_item.tag = snapshot.tag.copy()
-        target_item.count_in_cargo = snapshot.count_in_cargo
-        target_item.count_in_hoarder = snapshot.count_in_hoarder
-        target_item.count_in_map = snapshot.count_in_map
-        target_item.count_in_player = snapshot.count_in_player
-        target_item.crafted = snapshot.crafted
-        target_item.deloot = snapshot.deloot
-        target_item.modified = snapshot.modified
-    
     def push_undo_state(self, items: List[TypeItem]):
-        """Push current state of items to undo stack before modification"""
-        if not items:
-            return
-        
-        # Create snapshots of items before modification
-        snapshots = [(item.name, item.clone()) for item in items]
-        
-        # Add to undo stack
-        self.undo_stack.append(snapshots)
-        
-        # Limit stack size
-        if len(self.undo_stack) > self.max_undo_stack:
-            self.undo_stack.pop(0)
-        
-        # Clear redo stack (new changes invalidate redo history)
-        self.redo_stack.clear()
-        
-        # Update button states
+        """Record the current state of items before modification"""
+        self.history.record(TYPES, items)
         self.update_undo_redo_buttons()
     
     def clear_undo_redo(self):
-        """Clear undo/redo stacks (called after save)"""
-        self.undo_stack.clear()
-        self.redo_stack.clear()
+        """Clear undo/redo history (called after save)"""
+        self.history.clear()
         self.update_undo_redo_buttons()
     
     def update_undo_redo_buttons(self):
-        """Update undo/redo button enabled state"""
-        if hasattr(self, 'types_editor_tab'):
-            self.types_editor_tab.undo_btn.setEnabled(len(self.undo_stack) > 0)
-            self.types_editor_tab.redo_btn.setEnabled(len(self.redo_stack) > 0)
+        """Update undo/redo button enabled state in every tab"""
+        for tab_name in ('types_editor_tab', 'spawnable_types_tab', 'random_presets_tab'):
+            tab = getattr(self, tab_name, None)
+            if tab is not None:
+                tab.undo_btn.setEnabled(self.history.can_undo)
+                tab.redo_btn.setEnabled(self.history.can_redo)
     
     def save_changes(self):
         """Save modified files"""
@@ -987,6 +980,7 @@ th { background-color: #252526; }
             return
         
         # Show file selection dialog with all modified files
+        from ui.save_dialog import SaveDialog
         dialog = SaveDialog(self, modified_files, modified_spawnabletypes, self.has_random_preset_changes)
         if not dialog.exec_():
             return
@@ -1024,54 +1018,86 @@ th { background-color: #252526; }
         
         errors = []
         saved_count = 0
+        unchanged_count = 0
+        pending = {}  # path -> (types_file, xml_content)
         
+        # Generate XML and back up originals of files that actually change
         for i, types_file in enumerate(files_to_save):
             progress.setValue(i)
-            progress.setLabelText(f"Saving {types_file.path}...")
+            progress.setLabelText(f"Preparing {types_file.path}...")
             
             if progress.wasCanceled():
                 break
             
             try:
-                # Generate XML with user tag preservation
-                xml_content = types_file.to_xml(self.limits_parser)
+                # Splice re-rendered items into the original XML (user tags preserved)
+                xml_content = TypesWriter.write(types_file, self.limits_parser)
+                
+                # Edits that cancel out produce identical output - nothing to write
+                if xml_content == types_file.original_content:
+                    for item in types_file.items:
+                        item.modified = False
+                    self.types_editor_tab.filter_engine.update_items(types_file.items)
+                    unchanged_count += 1
+                    continue
                 
                 # Create backup if we have original content
                 if types_file.original_content:
-                    self.backup_manager.create_backup(
-                        types_file.path, 
-                        types_file.original_content
-                    )
+                    with tracer.span('save.backup', path=types_file.path):
+                        self.backup_manager.create_backup(
+                            types_file.path, 
+                            types_file.original_content
+                        )
                 
-                # Write file using file manager (works for both SFTP and Local)
-                self.file_manager.write_file(types_file.path, xml_content)
+                pending[types_file.path] = (types_file, xml_content)
+            
+            except Exception as e:
+                errors.append({
+                    'file': types_file.path,
+                    'error': str(e),
+                    'traceback': traceback.format_exc()
+                })
+        
+        if pending and not progress.wasCanceled():
+            progress.setLabelText(f"Uploading {len(pending)} file(s)...")
+            QApplication.processEvents()
+            
+            # Write all files concurrently (works for both SFTP and Local)
+            with tracer.span('save.write', files=len(pending)):
+                write_results = self.file_manager.write_many(
+                    {path: xml_content for path, (_, xml_content) in pending.items()}
+                )
+            written = [path for path, (success, _) in write_results.items() if success]
+            
+            # Update cache with new timestamps (one batched stat)
+            with tracer.span('io.stat_many', files=len(written)):
+                file_stats = self.file_manager.stat_many(written) if written else {}
+            
+            for path, (success, message) in write_results.items():
+                types_file, xml_content = pending[path]
+                if not success:
+                    errors.append({'file': path, 'error': message, 'traceback': ''})
+                    continue
                 
-                # Update cache with new timestamp
-                new_mtime = self.file_manager.get_file_mtime(types_file.path)
-                if new_mtime:
-                    self.config.set_cached_file(types_file.path, new_mtime, xml_content)
+                stat = file_stats.get(path)
+                if stat:
+                    self.config.set_cached_file(path, stat['mtime'], xml_content)
                 
                 # Update original content and clear modified flags
                 types_file.original_content = xml_content
                 for item in types_file.items:
                     item.modified = False
+                self.types_editor_tab.filter_engine.update_items(types_file.items)
                 
                 saved_count += 1
-            
-            except Exception as e:
-                errors.append({
-                    'file': types_file.path,
-                    'error': str(e),
-                    'traceback': traceback.format_exc()
-                })
         
         progress.setValue(len(files_to_save))
         
         # Show results
-        self.show_save_results(saved_count, errors)
+        self.show_save_results(saved_count, errors, unchanged_count)
         
         # Clear undo/redo stacks after successful save
-        if saved_count > 0:
+        if saved_count > 0 or unchanged_count > 0:
             self.clear_undo_redo()
         
         # Refresh UI
@@ -1085,18 +1111,20 @@ th { background-color: #252526; }
             # Write to XML
             xml_content = RandomPresetsWriter.write(self.random_presets_file)
             
-            # Save via file manager
-            self.file_manager.write_file('cfgrandompresets.xml', xml_content)
+            # Save via file manager (skip the upload if nothing actually changed)
+            if xml_content != self.random_presets_file.original_content:
+                self.file_manager.write_file('cfgrandompresets.xml', xml_content)
+                self.random_presets_file.original_content = xml_content
             
-            # Clear undo/redo stacks on save
-            self.undo_stack.clear()
-            self.redo_stack.clear()
+            # Clear undo/redo history on save
+            self.clear_undo_redo()
             
             # Clear modified flag
             self.has_random_preset_changes = False
             
             # Update UI
-            self.random_presets_tab.update_button_states()
+            if self.random_presets_tab is not None:
+                self.random_presets_tab.update_button_states()
             self.update_status_bar()
             
             print(f"Saved cfgrandompresets.xml ({self.random_presets_file.get_total_preset_count()} presets)")
@@ -1115,16 +1143,14 @@ th { background-color: #252526; }
         errors = []
         saved_count = 0
         
+        pending = {}  # source_file -> SpawnableTypesFile
+        contents = {}
+        
         for spawnable_types_file in files_to_save:
             try:
                 # Write to XML
-                xml_content = SpawnableTypesWriter.write(spawnable_types_file)
-                
-                # Save via file manager
-                self.file_manager.write_file(spawnable_types_file.source_file, xml_content)
-                
-                saved_count += 1
-                print(f"Saved {spawnable_types_file.source_file} ({len(spawnable_types_file.types)} types)")
+                contents[spawnable_types_file.source_file] = SpawnableTypesWriter.write(spawnable_types_file)
+                pending[spawnable_types_file.source_file] = spawnable_types_file
                 
             except Exception as e:
                 errors.append({
@@ -1133,13 +1159,20 @@ th { background-color: #252526; }
                     'traceback': traceback.format_exc()
                 })
         
+        # Save via file manager (concurrently over SFTP)
+        for path, (success, message) in self.file_manager.write_many(contents).items():
+            if success:
+                saved_count += 1
+                print(f"Saved {path} ({len(pending[path].types)} types)")
+            else:
+                errors.append({'file': path, 'error': message, 'traceback': ''})
+        
         # Clear modified flag if all saved successfully
         if saved_count > 0 and not errors:
             self.has_spawnabletypes_changes = False
             
-            # Clear undo/redo stacks
-            self.undo_stack.clear()
-            self.redo_stack.clear()
+            # Clear undo/redo history
+            self.clear_undo_redo()
         
         # Update UI
         self.update_status_bar()
@@ -1157,17 +1190,19 @@ th { background-color: #252526; }
                 f"Successfully saved {saved_count} spawnable types file(s)."
             )
     
-    def show_save_results(self, success_count: int, errors: List[Dict]):
+    def show_save_results(self, success_count: int, errors: List[Dict], unchanged_count: int = 0):
         """Show save results with error details if any"""
+        unchanged_msg = f" ({unchanged_count} unchanged file(s) skipped)" if unchanged_count else ""
+        
         if not errors:
             QMessageBox.information(
                 self,
                 "Save Successful",
-                f"Successfully saved {success_count} file(s)."
+                f"Successfully saved {success_count} file(s).{unchanged_msg}"
             )
         else:
             # Build error message
-            msg = f"Saved {success_count} file(s) successfully.\n\n"
+            msg = f"Saved {success_count} file(s) successfully.{unchanged_msg}\n\n"
             msg += f"Failed to save {len(errors)} file(s):\n\n"
             
             for error in errors:
@@ -1216,6 +1251,7 @@ th { background-color: #252526; }
         # Disconnect from file source
         if self.file_manager:
             self.file_manager.disconnect()
+        self.process_parser.shutdown()
         
         event.accept()
     
@@ -0,0 +1,37 @@
+"""
+Name Completer
+Item name completion ranked by the shared name index (exact, prefix,
+substring, then typo-tolerant matches) instead of QCompleter's own filtering
+"""
+from PyQt5.QtWidgets import QComboBox, QCompleter
+from PyQt5.QtCore import Qt, QStringListModel
+from models.name_index import NameIndex
+
+
+class NameCompleter(QCompleter):
+    """QCompleter whose suggestions come from NameIndex.search"""
+
+    def __init__(self, name_index: NameIndex, parent=None, limit: int = 50):
+        super().__init__(parent)
+        self.name_index = name_index
+        self.limit = limit
+        self.suggestions = QStringListModel(self)
+        self.setModel(self.suggestions)
+        # The index already filtered and ranked - show its results as they are
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+
+    def splitPath(self, path: str):
+        """Called with the typed text - refill the suggestions from the index"""
+        self.suggestions.setStringList(self.name_index.search(path, self.limit))
+        return [""]
+
+    def pathFromIndex(self, index) -> str:
+        return index.data()
+
+
+def setup_name_combo(combo: QComboBox, name_index: NameIndex):
+    """Fill an editable combo with all item names and attach a NameCompleter"""
+    combo.setModel(QStringListModel(name_index.names, combo))
+    combo.setInsertPolicy(QComboBox.NoInsert)
+    combo.setCompleter(NameCompleter(name_index, combo))
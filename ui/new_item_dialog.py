@@ -8,14 +8,16 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QWidget, QScrollArea)
 from PyQt5.QtCore import Qt
 from models.type_item import TypeItem
+from models.item_registry import ItemRegistry
 from typing import List
 from ui.draggable_spinbox import EnhancedSpinBox
 
 class NewItemDialog(QDialog):
-    def __init__(self, parent, types_files, limits_parser):
+    def __init__(self, parent, types_files, limits_parser, item_registry=None):
         super().__init__(parent)
         self.parent = parent
         self.types_files = types_files
+        self.item_registry = item_registry or ItemRegistry(types_files)
         self.limits_parser = limits_parser
         self.created_item = None
         self.target_file = None
@@ -242,13 +244,10 @@ class NewItemDialog(QDialog):
         """Check if item name already exists, return list of files containing it"""
         duplicate_files = []
         
-        for types_file in self.types_files:
-            for item in types_file.items:
-                if item.name.lower() == name.lower():
-                    # Get display name
-                    display_name = types_file.path.split('/')[-1] if '/' in types_file.path else types_file.path
-                    duplicate_files.append(display_name)
-                    break  # Only add file once even if multiple matches
+        for types_file in self.item_registry.files_containing(name):
+            # Get display name
+            display_name = types_file.path.split('/')[-1] if '/' in types_file.path else types_file.path
+            duplicate_files.append(display_name)
         
         return duplicate_files
     
@@ -13,8 +13,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor
 from models.random_preset import RandomPresetsFile, RandomPreset, PresetItem, PresetType
+from core.undo_history import RANDOM_PRESETS
 from typing import Optional
-import copy
 
 class RandomPresetsTab(QWidget):
     def __init__(self, parent):
@@ -352,7 +352,7 @@ class RandomPresetsTab(QWidget):
             return
         
         if new_name != self.selected_preset.name:
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset)
             old_name = self.selected_preset.name
             self.selected_preset.name = new_name
             self.refresh_preset_list()
@@ -365,7 +365,7 @@ class RandomPresetsTab(QWidget):
             return
         
         if value != self.selected_preset.chance:
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset, coalesce_key='chance')  # One step per spin
             preset_name = self.selected_preset.name
             self.selected_preset.chance = value
             self.refresh_preset_list()
@@ -494,27 +494,31 @@ class RandomPresetsTab(QWidget):
         self.delete_item_btn.setEnabled(has_item_selected)
         
         # Undo/Redo
-        self.undo_btn.setEnabled(len(self.parent.undo_stack) > 0)
-        self.redo_btn.setEnabled(len(self.parent.redo_stack) > 0)
-    
-    def save_state_for_undo(self):
-        """Save current state to undo stack"""
+        self.undo_btn.setEnabled(self.parent.history.can_undo)
+        self.redo_btn.setEnabled(self.parent.history.can_redo)
+    
+    def save_state_for_undo(self, target, deep: bool = True, coalesce_key=None):
+        """
+        Record the state of the object about to be edited - a preset (deep:
+        with its items) or the presets file when presets are added or removed
+        (deep=False: the presets themselves are shared, not copied).
+        Quick repeated edits with the same coalesce_key become one undo step.
+        """
         if self.presets_file:
-            # Deep copy the presets file
-            state = copy.deepcopy(self.presets_file)
-            self.parent.undo_stack.append(('random_presets', state))
-            
-            # Limit stack size
-            if len(self.parent.undo_stack) > self.parent.max_undo_stack:
-                self.parent.undo_stack.pop(0)
-            
-            # Clear redo stack on new action
-            self.parent.redo_stack.clear()
+            self.parent.history.record(RANDOM_PRESETS, [target], deep, coalesce_key=coalesce_key)
             
             # Mark as modified
             self.parent.has_random_preset_changes = True
             
-            self.update_button_states()
+            self.parent.update_undo_redo_buttons()
+    
+    def refresh_after_history(self):
+        """Redisplay after an undo/redo restored presets in place"""
+        self.selected_preset = None
+        self.refresh_preset_list()
+        self.clear_detail_panel()
+        self.update_stats()
+        self.update_button_states()
     
     def show_new_preset_dialog(self):
         """Show dialog to create new preset"""
@@ -525,7 +529,7 @@ class RandomPresetsTab(QWidget):
         
         dialog = PresetDialog(self, None)
         if dialog.exec_():
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.presets_file, deep=False)
             
             preset = dialog.get_preset()
             self.presets_file.add_preset(preset)
@@ -558,7 +562,7 @@ class RandomPresetsTab(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.presets_file, deep=False)
             
             self.presets_file.remove_preset(self.selected_preset)
             self.selected_preset = None
@@ -576,7 +580,7 @@ class RandomPresetsTab(QWidget):
         
         dialog = ItemDialog(self, None)
         if dialog.exec_():
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset)
             
             item = dialog.get_item()
             preset_name = self.selected_preset.name  # Save for reselection
@@ -604,7 +608,7 @@ class RandomPresetsTab(QWidget):
         item = self.selected_preset.items[row]
         dialog = ItemDialog(self, item)
         if dialog.exec_():
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset)
             
             # Update item with new values
             updated = dialog.get_item()
@@ -650,7 +654,7 @@ class RandomPresetsTab(QWidget):
             )
         
         if reply == QMessageBox.Yes:
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset)
             
             preset_name = self.selected_preset.name
             
@@ -688,7 +692,7 @@ class RandomPresetsTab(QWidget):
         )
         
         if ok:
-            self.save_state_for_undo()
+            self.save_state_for_undo(self.selected_preset)
             
             # Update chance for all selected items
             for row in selected_rows:
@@ -827,16 +831,7 @@ class ItemDialog(QDialog):
         self.name_input.setInsertPolicy(QComboBox.NoInsert)
         self.name_input.lineEdit().setPlaceholderText("e.g., Apple, M4_T3NRDSOptic, etc.")
         
-        # Enable autocomplete
-        self.name_input.setCompleter(None)  # Remove default completer
-        from PyQt5.QtWidgets import QCompleter
-        from PyQt5.QtCore import Qt
-        completer = QCompleter()
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchContains)
-        self.name_input.setCompleter(completer)
-        
-        # Populate with items from types files
+        # Populate with items from types files (ranked autocomplete)
         self.populate_item_names()
         
         form.addRow("Item Name:", self.name_input)
@@ -860,23 +855,10 @@ class ItemDialog(QDialog):
         self.setLayout(layout)
     
     def populate_item_names(self):
-        """Populate combobox with item names from types files"""
-        # Get all item names from parent's types files
-        if hasattr(self.parent_tab, 'parent') and hasattr(self.parent_tab.parent, 'types_files'):
-            item_names = set()
-            for types_file in self.parent_tab.parent.types_files:
-                for item in types_file.items:
-                    item_names.add(item.name)
-            
-            # Sort alphabetically and add to combobox
-            sorted_names = sorted(item_names)
-            self.name_input.addItems(sorted_names)
-            
-            # Update completer model
-            if self.name_input.completer():
-                from PyQt5.QtCore import QStringListModel
-                model = QStringListModel(sorted_names)
-                self.name_input.completer().setModel(model)
+        """Populate combobox and completer from the shared item name index"""
+        if hasattr(self.parent_tab, 'parent') and hasattr(self.parent_tab.parent, 'item_registry'):
+            from ui.name_completer import setup_name_combo
+            setup_name_combo(self.name_input, self.parent_tab.parent.item_registry.name_index)
     
     def load_item_data(self):
         """Load existing item data"""
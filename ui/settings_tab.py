@@ -8,6 +8,8 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QComboBox, QCheckBox)
 from PyQt5.QtCore import Qt
 from core.backup_manager import BackupManager
+from core.process_parser import ProcessParser, DEFAULT_PROCESSES, PROCESS_PARSE_MIN_BYTES
+from core.tracing import tracer
 
 class SettingsTab(QWidget):
     def __init__(self, parent):
@@ -39,6 +41,14 @@ class SettingsTab(QWidget):
         backup_group = self.create_backup_group()
         layout.addWidget(backup_group)
         
+        # Performance Settings
+        performance_group = self.create_performance_group()
+        layout.addWidget(performance_group)
+        
+        # Diagnostics
+        diagnostics_group = self.create_diagnostics_group()
+        layout.addWidget(diagnostics_group)
+        
         layout.addStretch()
         
         scroll.setWidget(content_widget)
@@ -170,6 +180,122 @@ class SettingsTab(QWidget):
         group.setLayout(layout)
         return group
     
+    def create_performance_group(self):
+        """Create performance settings group"""
+        group = QGroupBox("Performance")
+        layout = QFormLayout()
+        
+        self.parse_processes_spin = QSpinBox()
+        self.parse_processes_spin.setRange(0, max(DEFAULT_PROCESSES, 8))
+        self.parse_processes_spin.setValue(self.parent.config.get_parse_processes())
+        self.parse_processes_spin.setSpecialValueText("Off")
+        self.parse_processes_spin.valueChanged.connect(self.set_parse_processes)
+        layout.addRow("Parser processes:", self.parse_processes_spin)
+        
+        info_label = QLabel(f"Parse files larger than {PROCESS_PARSE_MIN_BYTES // 1024} KB on separate "
+                            f"processes (recommended: {DEFAULT_PROCESSES}). Applies to the next load.")
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addRow(info_label)
+        
+        self.undo_memory_spin = QSpinBox()
+        self.undo_memory_spin.setRange(8, 4096)
+        self.undo_memory_spin.setSuffix(" MB")
+        self.undo_memory_spin.setValue(self.parent.config.get_undo_memory_mb())
+        self.undo_memory_spin.valueChanged.connect(self.set_undo_memory)
+        layout.addRow("Undo memory:", self.undo_memory_spin)
+        
+        group.setLayout(layout)
+        return group
+    
+    def create_diagnostics_group(self):
+        """Create timing trace group"""
+        group = QGroupBox("Diagnostics")
+        layout = QVBoxLayout()
+        
+        self.trace_enabled_cb = QCheckBox("Record timing trace (load, parse, filter, render, save)")
+        self.trace_enabled_cb.setChecked(tracer.enabled)
+        self.trace_enabled_cb.toggled.connect(self.set_trace_enabled)
+        layout.addWidget(self.trace_enabled_cb)
+        
+        info_label = QLabel("Each load starts a new trace. Export it to open in chrome://tracing or Perfetto.")
+        info_label.setWordWrap(True)
+        info_label.setStyleSheet("color: #888; font-size: 10px;")
+        layout.addWidget(info_label)
+        
+        self.trace_summary_label = QLabel()
+        self.trace_summary_label.setStyleSheet("font-family: monospace;")
+        self.trace_summary_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.trace_summary_label)
+        
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.update_trace_summary)
+        button_layout.addWidget(refresh_btn)
+        
+        export_btn = QPushButton("Export Chrome Trace...")
+        export_btn.clicked.connect(self.export_trace)
+        button_layout.addWidget(export_btn)
+        
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear_trace)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+        
+        group.setLayout(layout)
+        return group
+    
+    def showEvent(self, event):
+        """Refresh the trace summary whenever the tab is shown"""
+        super().showEvent(event)
+        self.update_trace_summary()
+    
+    def set_trace_enabled(self, enabled: bool):
+        """Save the tracing setting and start/stop recording"""
+        self.parent.config.set_trace_enabled(enabled)
+        tracer.enable(enabled)
+        self.update_trace_summary()
+    
+    def update_trace_summary(self):
+        """Show the per-stage and slowest per-span totals of the trace"""
+        if not tracer.records:
+            self.trace_summary_label.setText("No spans recorded" if tracer.enabled else "Tracing is off")
+            return
+        self.trace_summary_label.setText(f"{tracer.format_stages()}\n\n{tracer.format_summary(limit=12)}")
+    
+    def export_trace(self):
+        """Write the trace as Chrome trace-event JSON"""
+        if not tracer.records:
+            QMessageBox.information(self, "Export Trace", "No spans recorded yet.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chrome Trace", "dayz-editor-trace.json",
+                                              "Trace files (*.json)")
+        if not path:
+            return
+        try:
+            tracer.write_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Failed", f"Failed to write trace:\n{str(e)}")
+            return
+        QMessageBox.information(self, "Export Trace", f"Exported {len(tracer.records)} spans to:\n{path}")
+    
+    def clear_trace(self):
+        """Drop all recorded spans"""
+        tracer.clear()
+        self.update_trace_summary()
+    
+    def set_undo_memory(self, megabytes: int):
+        """Save the undo memory budget and apply it to the history"""
+        self.parent.config.set_undo_memory_mb(megabytes)
+        self.parent.history.set_limits(max_bytes=megabytes * 1024 * 1024)
+    
+    def set_parse_processes(self, processes: int):
+        """Save the parser process count and replace the parser pool"""
+        self.parent.config.set_parse_processes(processes)
+        self.parent.process_parser.shutdown()
+        self.parent.process_parser = ProcessParser(processes)
+    
     def load_settings(self):
         """Load and display settings"""
         # Map profiles removed - nothing to load currently
@@ -14,8 +14,8 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor
 from models.spawnable_type import (SpawnableTypesFile, SpawnableType, 
                                    CargoBlock, AttachmentsBlock, SpawnableItem)
+from core.undo_history import SPAWNABLE_TYPES
 from typing import Optional, List
-import copy
 
 class SpawnableTypesTab(QWidget):
     def __init__(self, parent):
@@ -722,7 +722,7 @@ class SpawnableTypesTab(QWidget):
         
         new_name = self.name_edit.text().strip()
         if new_name and new_name != self.selected_type.name:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type, coalesce_key='name')  # One step per typed name
             self.selected_type.name = new_name
             self.mark_modified()
             self.refresh_types_list()
@@ -734,7 +734,7 @@ class SpawnableTypesTab(QWidget):
         
         new_value = self.hoarder_checkbox.isChecked()
         if new_value != self.selected_type.hoarder:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             self.selected_type.hoarder = new_value
             self.mark_modified()
     
@@ -751,7 +751,7 @@ class SpawnableTypesTab(QWidget):
         new_max = max_val if max_val > 0 else None
         
         if new_min != self.selected_type.damage_min or new_max != self.selected_type.damage_max:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type, coalesce_key='damage')
             self.selected_type.damage_min = new_min
             self.selected_type.damage_max = new_max
             self.mark_modified()
@@ -771,7 +771,7 @@ class SpawnableTypesTab(QWidget):
             type_name = dialog.get_type_name()
             target_file = dialog.get_selected_file()
             
-            self.save_undo_state()
+            self.save_undo_state(target_file, deep=False)
             new_type = SpawnableType(name=type_name)
             target_file.add_type(new_type)
             
@@ -793,7 +793,7 @@ class SpawnableTypesTab(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_file, deep=False)
             self.selected_file.remove_type(self.selected_type)
             self.selected_type = None
             
@@ -818,7 +818,7 @@ class SpawnableTypesTab(QWidget):
             
             if block_type == "preset":
                 # Preset-based - create immediately
-                self.save_undo_state()
+                self.save_undo_state(self.selected_type)
                 preset_name = dialog.get_preset_name()
                 cargo_block = CargoBlock(preset=preset_name)
                 self.selected_type.cargo_blocks.append(cargo_block)
@@ -830,11 +830,12 @@ class SpawnableTypesTab(QWidget):
                 
                 # Prompt for first item
                 from ui.dialogs.add_item_dialog import AddItemDialog
-                item_dialog = AddItemDialog(self, self.parent.types_files, False)
+                item_dialog = AddItemDialog(self, self.parent.types_files, False,
+                                            self.parent.item_registry.name_index)
                 
                 if item_dialog.exec_():
                     # User added item - create block
-                    self.save_undo_state()
+                    self.save_undo_state(self.selected_type)
                     
                     item_name = item_dialog.get_item_name()
                     item_chance = item_dialog.get_item_chance()
@@ -913,7 +914,7 @@ class SpawnableTypesTab(QWidget):
         if dialog.exec_():
             block_type = dialog.get_block_type()
             
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             
             if block_type == "preset":
                 preset_name = dialog.get_preset_name()
@@ -944,7 +945,7 @@ class SpawnableTypesTab(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             del self.selected_type.cargo_blocks[block_index]
             self.mark_modified()
             self.display_cargo_blocks()
@@ -958,13 +959,14 @@ class SpawnableTypesTab(QWidget):
             return
         
         from ui.dialogs.add_item_dialog import AddItemDialog
-        dialog = AddItemDialog(self, self.parent.types_files, len(cargo_block.items) > 0)
+        dialog = AddItemDialog(self, self.parent.types_files, len(cargo_block.items) > 0,
+                               self.parent.item_registry.name_index)
         
         if dialog.exec_():
             item_name = dialog.get_item_name()
             item_chance = dialog.get_item_chance()
             
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             new_item = SpawnableItem(name=item_name, chance=item_chance)
             cargo_block.items.append(new_item)
             self.mark_modified()
@@ -980,10 +982,11 @@ class SpawnableTypesTab(QWidget):
         item_index = cargo_block.items.index(item)
         
         from ui.dialogs.edit_item_dialog import EditItemDialog
-        dialog = EditItemDialog(self, item, self.parent.types_files, len(cargo_block.items) > 1)
+        dialog = EditItemDialog(self, item, self.parent.types_files, len(cargo_block.items) > 1,
+                                self.parent.item_registry.name_index)
         
         if dialog.exec_():
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             item.name = dialog.get_item_name()
             item.chance = dialog.get_item_chance()
             self.mark_modified()
@@ -997,7 +1000,7 @@ class SpawnableTypesTab(QWidget):
         
         item_index = cargo_block.items.index(item)
         if item_index > 0:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             cargo_block.items[item_index], cargo_block.items[item_index - 1] = \
                 cargo_block.items[item_index - 1], cargo_block.items[item_index]
             self.mark_modified()
@@ -1011,7 +1014,7 @@ class SpawnableTypesTab(QWidget):
         
         item_index = cargo_block.items.index(item)
         if item_index < len(cargo_block.items) - 1:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             cargo_block.items[item_index], cargo_block.items[item_index + 1] = \
                 cargo_block.items[item_index + 1], cargo_block.items[item_index]
             self.mark_modified()
@@ -1024,7 +1027,7 @@ class SpawnableTypesTab(QWidget):
         item = item_node.data(0, Qt.UserRole)
         
         if item in cargo_block.items:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             cargo_block.items.remove(item)
             self.mark_modified()
             self.display_cargo_blocks()
@@ -1045,7 +1048,7 @@ class SpawnableTypesTab(QWidget):
             
             if block_type == "preset":
                 # Preset-based - create immediately
-                self.save_undo_state()
+                self.save_undo_state(self.selected_type)
                 preset_name = dialog.get_preset_name()
                 attachments_block = AttachmentsBlock(preset=preset_name)
                 self.selected_type.attachments_blocks.append(attachments_block)
@@ -1057,11 +1060,12 @@ class SpawnableTypesTab(QWidget):
                 
                 # Prompt for first item
                 from ui.dialogs.add_item_dialog import AddItemDialog
-                item_dialog = AddItemDialog(self, self.parent.types_files, False)
+                item_dialog = AddItemDialog(self, self.parent.types_files, False,
+                                            self.parent.item_registry.name_index)
                 
                 if item_dialog.exec_():
                     # User added item - create block
-                    self.save_undo_state()
+                    self.save_undo_state(self.selected_type)
                     
                     item_name = item_dialog.get_item_name()
                     item_chance = item_dialog.get_item_chance()
@@ -1140,7 +1144,7 @@ class SpawnableTypesTab(QWidget):
         if dialog.exec_():
             block_type = dialog.get_block_type()
             
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             
             if block_type == "preset":
                 preset_name = dialog.get_preset_name()
@@ -1171,7 +1175,7 @@ class SpawnableTypesTab(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             del self.selected_type.attachments_blocks[block_index]
             self.mark_modified()
             self.display_attachments_blocks()
@@ -1185,13 +1189,14 @@ class SpawnableTypesTab(QWidget):
             return
         
         from ui.dialogs.add_item_dialog import AddItemDialog
-        dialog = AddItemDialog(self, self.parent.types_files, len(attachments_block.items) > 0)
+        dialog = AddItemDialog(self, self.parent.types_files, len(attachments_block.items) > 0,
+                               self.parent.item_registry.name_index)
         
         if dialog.exec_():
             item_name = dialog.get_item_name()
             item_chance = dialog.get_item_chance()
             
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             new_item = SpawnableItem(name=item_name, chance=item_chance)
             attachments_block.items.append(new_item)
             self.mark_modified()
@@ -1207,10 +1212,11 @@ class SpawnableTypesTab(QWidget):
         item_index = attachments_block.items.index(item)
         
         from ui.dialogs.edit_item_dialog import EditItemDialog
-        dialog = EditItemDialog(self, item, self.parent.types_files, len(attachments_block.items) > 1)
+        dialog = EditItemDialog(self, item, self.parent.types_files, len(attachments_block.items) > 1,
+                                self.parent.item_registry.name_index)
         
         if dialog.exec_():
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             item.name = dialog.get_item_name()
             item.chance = dialog.get_item_chance()
             self.mark_modified()
@@ -1224,7 +1230,7 @@ class SpawnableTypesTab(QWidget):
         
         item_index = attachments_block.items.index(item)
         if item_index > 0:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             attachments_block.items[item_index], attachments_block.items[item_index - 1] = \
                 attachments_block.items[item_index - 1], attachments_block.items[item_index]
             self.mark_modified()
@@ -1238,7 +1244,7 @@ class SpawnableTypesTab(QWidget):
         
         item_index = attachments_block.items.index(item)
         if item_index < len(attachments_block.items) - 1:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             attachments_block.items[item_index], attachments_block.items[item_index + 1] = \
                 attachments_block.items[item_index + 1], attachments_block.items[item_index]
             self.mark_modified()
@@ -1251,7 +1257,7 @@ class SpawnableTypesTab(QWidget):
         item = item_node.data(0, Qt.UserRole)
         
         if item in attachments_block.items:
-            self.save_undo_state()
+            self.save_undo_state(self.selected_type)
             attachments_block.items.remove(item)
             self.mark_modified()
             self.display_attachments_blocks()
@@ -1284,59 +1290,27 @@ class SpawnableTypesTab(QWidget):
         self.parent.update_status_bar()
         self.update_button_states()
     
-    def save_undo_state(self):
-        """Save current state to undo stack"""
-        state = []
-        for f in self.spawnabletypes_files:
-            state.append(copy.deepcopy(f))
-        
-        self.parent.undo_stack.append(('spawnable_types', state))
-        
-        if len(self.parent.undo_stack) > self.parent.max_undo_stack:
-            self.parent.undo_stack.pop(0)
-        
-        self.parent.redo_stack.clear()
-        self.update_button_states()
+    def save_undo_state(self, target, deep: bool = True, coalesce_key=None):
+        """
+        Record the state of the object about to be edited - a spawnable type
+        (deep: its blocks and items) or a file whose type list changes
+        (deep=False: the types themselves are shared, not copied).
+        Quick repeated edits with the same coalesce_key become one undo step.
+        """
+        self.parent.history.record(SPAWNABLE_TYPES, [target], deep, coalesce_key=coalesce_key)
+        self.parent.update_undo_redo_buttons()
     
     def undo(self):
-        """Undo last change"""
-        if not self.parent.undo_stack:
-            return
-        
-        if self.parent.undo_stack[-1][0] != 'spawnable_types':
-            return
-        
-        current_state = []
-        for f in self.spawnabletypes_files:
-            current_state.append(copy.deepcopy(f))
-        self.parent.redo_stack.append(('spawnable_types', current_state))
-        
-        _, previous_state = self.parent.undo_stack.pop()
-        self.spawnabletypes_files = previous_state
-        self.parent.spawnabletypes_files = self.spawnabletypes_files
-        
-        self.refresh_types_list()
-        self.clear_details()
-        self.update_stats()
-        self.update_button_states()
+        """Undo last change (shared history with the other tabs)"""
+        self.parent.undo()
     
     def redo(self):
         """Redo last undone change"""
-        if not self.parent.redo_stack:
-            return
-        
-        if self.parent.redo_stack[-1][0] != 'spawnable_types':
-            return
-        
-        current_state = []
-        for f in self.spawnabletypes_files:
-            current_state.append(copy.deepcopy(f))
-        self.parent.undo_stack.append(('spawnable_types', current_state))
-        
-        _, redo_state = self.parent.redo_stack.pop()
-        self.spawnabletypes_files = redo_state
-        self.parent.spawnabletypes_files = self.spawnabletypes_files
-        
+        self.parent.redo()
+    
+    def refresh_after_history(self):
+        """Redisplay after an undo/redo restored spawnable types in place"""
+        self.selected_type = None
         self.refresh_types_list()
         self.clear_details()
         self.update_stats()
@@ -1344,10 +1318,5 @@ class SpawnableTypesTab(QWidget):
     
     def update_button_states(self):
         """Update undo/redo button states"""
-        has_undo = bool(self.parent.undo_stack and 
-                       self.parent.undo_stack[-1][0] == 'spawnable_types')
-        has_redo = bool(self.parent.redo_stack and 
-                       self.parent.redo_stack[-1][0] == 'spawnable_types')
-        
-        self.undo_btn.setEnabled(has_undo)
-        self.redo_btn.setEnabled(has_redo)
+        self.undo_btn.setEnabled(self.parent.history.can_undo)
+        self.redo_btn.setEnabled(self.parent.history.can_redo)
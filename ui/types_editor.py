@@ -3,15 +3,17 @@ Types Editor Tab
 Main editing interface for types.xml files
 """
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, 
-                             QPushButton, QLineEdit, QSpinBox, QTableWidget,
-                             QTableWidgetItem, QScrollArea, QFrame, QGroupBox,
+                             QPushButton, QLineEdit, QSpinBox, QTableView,
+                             QScrollArea, QFrame, QGroupBox,
                              QFormLayout, QComboBox, QCheckBox, QSplitter,
                              QHeaderView, QAbstractItemView, QMessageBox, QDialog)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QTimer, QSortFilterProxyModel
 from models.type_item import TypeItem
 from models.types_file import TypesFile
 from core.limits_parser import LimitsParser
+from core.filter_engine import FilterEngine, FilterQuery
+from core.tracing import traced
+from ui.types_table_model import TypesTableModel
 from typing import List, Optional
 from ui.draggable_spinbox import EnhancedSpinBox
 
@@ -22,7 +24,9 @@ class TypesEditorTab(QWidget):
         self.types_files: List[TypesFile] = []
         self.limits_parser: Optional[LimitsParser] = None
         self.filtered_items: List[TypeItem] = []
+        self.filtered_mask = 0  # filter_engine bitset of filtered_items
         self.selected_items: List[TypeItem] = []
+        self.filter_engine = FilterEngine()  # Inverted indexes over all items
         
         # Debounce timer for search
         self.search_timer = QTimer()
@@ -331,10 +335,17 @@ class TypesEditorTab(QWidget):
         return sidebar
     
     def create_item_table(self):
-        """Create item table widget"""
-        table = QTableWidget()
-        table.setColumnCount(2)
-        table.setHorizontalHeaderLabels(["Name", "Path"])
+        """Create item table view (model/view - only visible rows are rendered)"""
+        self.table_model = TypesTableModel(self)
+        
+        # Proxy sorts by clicked column without touching filtered_items
+        self.table_proxy = QSortFilterProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table_proxy.setSortCaseSensitivity(Qt.CaseInsensitive)
+        
+        table = QTableView()
+        table.setModel(self.table_proxy)
+        table.verticalHeader().setDefaultSectionSize(24)
         
         # Configure table
         table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -344,15 +355,15 @@ class TypesEditorTab(QWidget):
         
         # Style for better readability
         table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #1e1e1e;
                 alternate-background-color: #252526;
                 gridline-color: #333;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 4px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #264f78;
             }
         """)
@@ -362,8 +373,13 @@ class TypesEditorTab(QWidget):
         header.setStretchLastSection(True)
         header.setSectionResizeMode(0, QHeaderView.Stretch)
         
+        # Click headers to sort; start in file order
+        table.setSortingEnabled(True)
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        self.table_proxy.sort(-1)
+        
         # Connect selection changed
-        table.itemSelectionChanged.connect(self.on_selection_changed)
+        table.selectionModel().selectionChanged.connect(lambda *_: self.on_selection_changed())
         
         return table
     
@@ -542,6 +558,7 @@ class TypesEditorTab(QWidget):
         """Load types files and limits data"""
         self.types_files = types_files
         self.limits_parser = limits_parser
+        self.filter_engine.rebuild(types_files, self.parent.item_registry.name_index)
         
         # Populate filter options
         self.populate_filter_options()
@@ -557,12 +574,11 @@ class TypesEditorTab(QWidget):
         # If an item is currently selected in detail panel, refresh its display
         if hasattr(self, 'current_item') and self.current_item:
             # Find the item again (it may have been modified)
-            for types_file in self.types_files:
-                found = types_file.get_item_by_name(self.current_item.name)
-                if found:
-                    self.load_item_details(found)
-                    break
+            found = self.parent.item_registry.get(self.current_item.name)
+            if found:
+                self.load_item_details(found)
     
+    @traced('render.filter_options')
     def populate_filter_options(self):
         """Populate filter dropdowns and checkboxes"""
         if not self.limits_parser:
@@ -696,8 +712,6 @@ class TypesEditorTab(QWidget):
     
     def apply_filters(self):
         """Apply current filters to items"""
-        self.filtered_items = []
-        
         # Gather filter values
         search_text = self.search_input.text().strip()
         category = self.category_combo.currentText()
@@ -730,86 +744,46 @@ class TypesEditorTab(QWidget):
         if self.filter_deloot_cb.isChecked():
             filter_flags['deloot'] = 1
         
-        use_or_logic = self.or_radio.isChecked()
+        query = FilterQuery(
+            search_text=search_text,
+            category=category,
+            tags=selected_tags,
+            usage=selected_usage,
+            value=selected_value,
+            source_file=source_file,
+            nominal_min=nominal_min,
+            nominal_max=nominal_max,
+            flags=filter_flags,
+            use_or_logic=self.or_radio.isChecked()
+        )
         
         # Filter items
-        for types_file in self.types_files:
-            for item in types_file.items:
-                # Check flag filters first (simple equality check)
-                flags_match = True
-                for flag_name, flag_value in filter_flags.items():
-                    if getattr(item, flag_name) != flag_value:
-                        flags_match = False
-                        break
-                
-                if not flags_match:
-                    continue
-                
-                if item.matches_filter(
-                    search_text=search_text,
-                    category=category,
-                    tags=selected_tags,
-                    usage=selected_usage,
-                    value=selected_value,
-                    source_file=source_file,
-                    nominal_min=nominal_min,
-                    nominal_max=nominal_max,
-                    use_or_logic=use_or_logic
-                ):
-                    self.filtered_items.append(item)
+        self.filtered_mask = self.filter_engine.query_mask(query)
+        self.filtered_items = self.filter_engine.items_for_mask(self.filtered_mask)
         
         # Update table
         self.populate_table()
         
         # Update active filters count
-        filter_count = 0
-        if search_text:
-            filter_count += 1
-        if category:
-            filter_count += 1
-        if selected_tags:
-            filter_count += 1
-        if selected_usage:
-            filter_count += 1
-        if selected_value:
-            filter_count += 1
-        if source_file:
-            filter_count += 1
-        if nominal_min is not None or nominal_max is not None:
-            filter_count += 1
-        if filter_flags:
-            filter_count += len(filter_flags)
-        
+        filter_count = query.active_filter_count()
         self.active_filters_label.setText(f"{filter_count} Active Filter{'s' if filter_count != 1 else ''}")
     
+    @traced('render.table')
     def populate_table(self):
-        """Populate table with filtered items"""
-        self.item_table.setRowCount(len(self.filtered_items))
-        
-        # Calculate sums for nominal and min
-        total_nominal = 0
-        total_min = 0
-        
-        for row, item in enumerate(self.filtered_items):
-            # Add to sums
-            total_nominal += item.nominal
-            total_min += item.min
-            
-            # Name
-            name_item = QTableWidgetItem(item.name)
-            if item.modified:
-                name_item.setForeground(QColor("#51cf66"))
-            self.item_table.setItem(row, 0, name_item)
-            
-            # Path
-            path_item = QTableWidgetItem(item.source_file)
-            if item.modified:
-                path_item.setForeground(QColor("#51cf66"))
-            self.item_table.setItem(row, 1, path_item)
-        
-        # Update sum labels
-        self.nominal_sum_label.setText(f"Σ Nominal: {total_nominal:,}")
-        self.min_sum_label.setText(f"Σ Min: {total_min:,}")
+        """Show filtered items in the table"""
+        self.table_model.set_items(self.filtered_items)
+        self.update_sum_labels()
+    
+    def refresh_items(self, items: List[TypeItem]):
+        """Repaint the rows of edited items without rebuilding the table"""
+        self.table_model.refresh_items(items)
+        self.update_sum_labels()
+    
+    def update_sum_labels(self):
+        """Update nominal/min sums for filtered items"""
+        totals = self.filter_engine.store.totals(('nominal', 'min'), self.filtered_mask)
+        self.nominal_sum_label.setText(f"Σ Nominal: {totals['nominal']:,}")
+        self.min_sum_label.setText(f"Σ Min: {totals['min']:,}")
     
     def clear_filters(self):
         """Clear all filters"""
@@ -838,7 +812,8 @@ class TypesEditorTab(QWidget):
     
     def on_selection_changed(self):
         """Handle item selection changed"""
-        selected_rows = set(item.row() for item in self.item_table.selectedItems())
+        selected_rows = sorted(self.table_proxy.mapToSource(index).row()
+                               for index in self.item_table.selectionModel().selectedRows())
         self.selected_items = [self.filtered_items[row] for row in selected_rows if row < len(self.filtered_items)]
         
         if len(self.selected_items) == 1:
@@ -1022,13 +997,14 @@ class TypesEditorTab(QWidget):
         item.modified = True
         
         # Mark parent file as modified
-        for tf in self.types_files:
-            if item in tf.items:
-                tf.modified = True
-                break
+        owner = self.parent.item_registry.get_file(item)
+        if owner:
+            owner.modified = True
         
-        # Refresh table to show modified state
-        self.populate_table()
+        self.filter_engine.update_item(item)
+        
+        # Repaint just this row to show modified state
+        self.refresh_items([item])
         
         # Update parent status bar
         self.parent.update_status_bar()
@@ -1054,12 +1030,14 @@ class TypesEditorTab(QWidget):
             return
         
         from ui.new_item_dialog import NewItemDialog
-        dialog = NewItemDialog(self, self.types_files, self.limits_parser)
+        dialog = NewItemDialog(self, self.types_files, self.limits_parser, self.parent.item_registry)
         
         if dialog.exec_() == QDialog.Accepted and dialog.created_item and dialog.target_file:
             # Add item to target file
-            dialog.target_file.items.append(dialog.created_item)
+            dialog.target_file.add_item(dialog.created_item)
             dialog.target_file.modified = True
+            self.parent.item_registry.register(dialog.created_item, dialog.target_file)
+            self.filter_engine.rebuild(self.types_files, self.parent.item_registry.name_index)
             
             # Push to undo stack
             self.parent.push_undo_state([dialog.created_item])
@@ -1087,13 +1065,11 @@ class TypesEditorTab(QWidget):
         # Search for the item
         for row, item in enumerate(self.filtered_items):
             if item.name.lower() == item_name.lower():
-                # Select the row
-                self.item_table.selectRow(row)
+                # Select the row (view rows may be sorted differently)
+                view_index = self.table_proxy.mapFromSource(self.table_model.index(row, 0))
+                self.item_table.selectRow(view_index.row())
                 # Scroll to it
-                self.item_table.scrollToItem(
-                    self.item_table.item(row, 0),
-                    QTableWidget.PositionAtCenter
-                )
+                self.item_table.scrollTo(view_index, QAbstractItemView.PositionAtCenter)
                 # Load into detail panel
                 self.selected_items = [item]
                 self.load_item_to_detail(item)
@@ -1161,8 +1137,10 @@ class TypesEditorTab(QWidget):
     def clear_data(self):
         """Clear all loaded data"""
         self.types_files = []
+        self.filter_engine.rebuild([])
         self.filtered_items = []
+        self.filtered_mask = 0
         self.selected_items = []
-        self.item_table.setRowCount(0)
+        self.table_model.set_items([])
         self.detail_title.setText("Select an item to edit")
         self.set_detail_panel_enabled(False)
@@ -0,0 +1,86 @@
+"""
+Types Table Model
+Item model for the types list - the view only asks for the rows it paints
+"""
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor
+from models.type_item import TypeItem
+from typing import Dict, Iterable, List, Optional
+
+MODIFIED_COLOR = QColor("#51cf66")
+
+
+class TypesTableModel(QAbstractTableModel):
+    """Read-only table model over the filtered TypeItem list"""
+
+    COLUMNS = ["Name", "Path"]
+    ItemRole = Qt.UserRole + 1  # Returns the TypeItem of a row
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[TypeItem] = []
+        self._rows: Dict[int, int] = {}  # id(item) -> row
+
+    def set_items(self, items: List[TypeItem]):
+        """Replace the displayed items"""
+        self.beginResetModel()
+        self._items = items
+        self._rows = {id(item): row for row, item in enumerate(items)}
+        self.endResetModel()
+
+    def item_at(self, row: int) -> Optional[TypeItem]:
+        """Get the item shown in a (source) row"""
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def row_of(self, item: TypeItem) -> int:
+        """Get the (source) row of an item, or -1 if it isn't displayed"""
+        return self._rows.get(id(item), -1)
+
+    def refresh_item(self, item: TypeItem):
+        """Repaint the row of an edited item"""
+        row = self.row_of(item)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def refresh_items(self, items: Iterable[TypeItem]):
+        """Repaint the rows of several edited items (one signal per contiguous run)"""
+        rows = sorted(row for row in (self.row_of(item) for item in items) if row >= 0)
+        last_column = len(self.COLUMNS) - 1
+        start = None
+        previous = None
+        for row in rows:
+            if start is None:
+                start = previous = row
+            elif row == previous + 1:
+                previous = row
+            else:
+                self.dataChanged.emit(self.index(start, 0), self.index(previous, last_column))
+                start = previous = row
+        if start is not None:
+            self.dataChanged.emit(self.index(start, 0), self.index(previous, last_column))
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        item = self._items[index.row()]
+
+        if role == Qt.DisplayRole:
+            return item.name if index.column() == 0 else item.source_file
+        if role == Qt.ForegroundRole and item.modified:
+            return MODIFIED_COLOR
+        if role == self.ItemRole:
+            return item
+        return QVariant()
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)